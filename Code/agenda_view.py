@@ -0,0 +1,246 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHeaderView, QTableView, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex, QTimer
+from datetime import datetime
+
+
+class AgendaModel(QAbstractTableModel):
+    """
+    every block in start order, past and future, read from Schedule.iter_range
+    a page at a time in whichever direction the list is scrolled
+
+    at most max_pages pages are held; reading a page drops the page at the
+    other end, which is read again if it is scrolled back to
+    """
+
+    BLOCK_ROLE = Qt.UserRole
+
+    def __init__(self, schedule, page_size: int = 100, max_pages: int = 6, parent=None) -> None:
+        super().__init__(parent)
+        self.schedule = schedule
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.blocks = []
+        self.earlier = None  # iter_range walks away from the first and last rows, None once exhausted
+        self.later = None
+
+    def reset_to(self, anchor: datetime) -> None:
+        """reload around anchor: one page before it and one from it onwards"""
+        self.beginResetModel()
+        self.earlier = self.schedule.iter_range(anchor, forward=False, page_size=self.page_size)
+        self.later = self.schedule.iter_range(anchor, forward=True, page_size=self.page_size)
+        self.blocks = next(self.earlier, []) + next(self.later, [])
+        self.endResetModel()
+
+    def row_of_time(self, moment: datetime) -> int:
+        """first row starting at or after moment (or the row count)"""
+        for row, b in enumerate(self.blocks):
+            if b.start >= moment:
+                return row
+        return len(self.blocks)
+
+    # paging
+    def can_fetch_earlier(self) -> bool:
+        return self.earlier is not None
+
+    def fetch_earlier(self) -> int:
+        """prepend the page before the first row; returns how many rows were added"""
+        page = next(self.earlier, None) if self.earlier is not None else None
+        if not page:
+            self.earlier = None
+            return 0
+        self.beginInsertRows(QModelIndex(), 0, len(page) - 1)
+        self.blocks[:0] = page
+        self.endInsertRows()
+        self._trim(from_front=False)
+        return len(page)
+
+    def fetch_later(self) -> int:
+        """append the page after the last row; returns how many rows were added"""
+        page = next(self.later, None) if self.later is not None else None
+        if not page:
+            self.later = None
+            return 0
+        row = len(self.blocks)
+        self.beginInsertRows(QModelIndex(), row, row + len(page) - 1)
+        self.blocks.extend(page)
+        self.endInsertRows()
+        self._trim(from_front=True)
+        return len(page)
+
+    def _trim(self, from_front: bool) -> None:
+        """drop pages from one end until the model is back within max_pages"""
+        excess = len(self.blocks) - self.page_size * self.max_pages
+        if excess <= 0:
+            return
+        if from_front:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            del self.blocks[:excess]
+            self.endRemoveRows()
+            first = self.blocks[0]
+            self.earlier = self.schedule.iter_range(first.start, forward=False, page_size=self.page_size,
+                                                    after_id=first.id or "")
+        else:
+            row = len(self.blocks) - excess
+            self.beginRemoveRows(QModelIndex(), row, len(self.blocks) - 1)
+            del self.blocks[row:]
+            self.endRemoveRows()
+            last = self.blocks[-1]
+            self.later = self.schedule.iter_range(last.start, forward=True, page_size=self.page_size,
+                                                  after_id=last.id or "")
+
+    # model interface; the view asks for later pages itself when scrolled to the bottom
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.later is not None
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if not parent.isValid():
+            self.fetch_later()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.blocks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 5
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return ["date", "time", "name", "type", "location"][section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        b = self.blocks[index.row()]
+        if role == self.BLOCK_ROLE:
+            return b
+        if role != Qt.DisplayRole:
+            return None
+
+        col = index.column()
+        if col == 0:
+            return b.start.strftime("%a %d %b %Y")
+        if col == 1:
+            return f"{b.start.strftime('%H:%M')} - {(b.start + b.duration).strftime('%H:%M')}"
+        if col == 2:
+            return b.name
+        if col == 3:
+            if b.type == "task":
+                return "task (done)" if b.is_completed else "task"
+            return b.type
+        return b.location or ""
+
+
+class AgendaView(QWidget):
+    """
+    one continuous list of blocks, past and future, opening at the current time
+
+    rows have a fixed height so the table lays out only the rows on screen;
+    scrolling to either end reads the next page through the model, and pages
+    far from the viewport are dropped. months not in memory and the archive are
+    read from disk a month at a time and never added to the schedule, so the
+    list holds at most max_pages pages plus the month being read
+    """
+
+    open_settings = pyqtSignal()
+    open_todo = pyqtSignal()
+    open_day = pyqtSignal(object)  # emits a date object
+    back = pyqtSignal()
+
+    def __init__(self, schedule, util, parent=None) -> None:
+        super().__init__(parent)
+        self.schedule = schedule
+        self.util = util
+        layout = QVBoxLayout(self)
+
+        # top bar
+        top_bar, buttons = self.util.create_top_bar(show_back=True, show_todo=True, show_settings=True)
+        buttons["back"].clicked.connect(self.back.emit)
+        buttons["todo"].clicked.connect(self.open_todo.emit)
+        buttons["settings"].clicked.connect(self.open_settings.emit)
+        layout.addWidget(top_bar)
+
+        # table
+        self.model = AgendaModel(self.schedule, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self.on_row_double_clicked)
+        layout.addWidget(self.table)
+
+        # rows added or dropped above the viewport would otherwise shift what is on screen
+        self.repositioning = False
+        scroll_bar = self.table.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.on_scrolled)
+        self.model.rowsInserted.connect(self.on_rows_inserted)
+        self.model.rowsRemoved.connect(self.on_rows_removed)
+
+        # a burst of schedule changes reloads the list once
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(100)
+        self.reload_timer.timeout.connect(self.reload)
+        self.util.listen_while_alive(self, self.schedule, self._on_schedule_change)
+
+        self.util.apply_theme()
+
+    def refresh(self) -> None:
+        """reopen the list at the current time"""
+        self.show_from(datetime.now())
+
+    def reload(self) -> None:
+        """re-read the list, keeping the block at the top of the viewport where it is"""
+        top = self.table.rowAt(0)
+        if 0 <= top < self.model.rowCount():
+            self.show_from(self.model.blocks[top].start)
+        else:
+            self.refresh()
+
+    def show_from(self, moment: datetime) -> None:
+        """reload around moment and scroll so the first block from moment is at the top"""
+        self.repositioning = True  # the reset scrolls to the top, which should not read a page
+        self.model.reset_to(moment)
+        self.table.doItemsLayout()  # lay out now so the scroll range is right before scrolling
+        row = self.model.row_of_time(moment)
+        if row < self.model.rowCount():
+            self.table.scrollTo(self.model.index(row, 0), QAbstractItemView.PositionAtTop)
+        self.repositioning = False
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        if self.isVisible():
+            self.reload_timer.start()
+
+    # paging
+    def on_scrolled(self, value: int) -> None:
+        """read the page before the first row once the top is reached"""
+        if self.repositioning:
+            return
+        if value == self.table.verticalScrollBar().minimum() and self.model.can_fetch_earlier():
+            self.model.fetch_earlier()
+
+    def on_rows_inserted(self, parent, first: int, last: int) -> None:
+        """rows added at or above the top row push it down by as many rows"""
+        if first <= self.table.verticalScrollBar().value():
+            self._shift_rows(last - first + 1)
+
+    def on_rows_removed(self, parent, first: int, last: int) -> None:
+        if first < self.table.verticalScrollBar().value():
+            self._shift_rows(-(last - first + 1))
+
+    def _shift_rows(self, count: int) -> None:
+        """scroll by count rows without reading another page"""
+        scroll_bar = self.table.verticalScrollBar()
+        self.repositioning = True
+        scroll_bar.setMaximum(max(scroll_bar.maximum(), scroll_bar.value() + count))
+        scroll_bar.setValue(max(0, scroll_bar.value() + count))
+        self.repositioning = False
+
+    def on_row_double_clicked(self, index) -> None:
+        """open the day the block is on"""
+        block = self.model.data(index, AgendaModel.BLOCK_ROLE)
+        if block is not None:
+            self.open_day.emit(block.start.date())
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class AutosaveService(QObject):
+    """
+    saves schedule, settings and templates shortly after they change
+
+    edits restart a short single-shot timer, so a burst of changes is written
+    once; a longer limit makes sure constant editing still gets saved.
+    the objects are captured as plain data on the GUI thread, then encrypted
+    and written on a single worker thread so the interface never waits on disk
+    """
+
+    save_failed = pyqtSignal(object)
+    _write_failed = pyqtSignal(object)  # emitted on the worker, delivered queued on the GUI thread
+
+    def __init__(self, persistence, schedule, settings, customs,
+                 delay_ms: int = 3000, max_delay_ms: int = 15000, parent=None) -> None:
+        super().__init__(parent)
+        self.persistence = persistence
+        self.schedule = schedule
+        self.settings = settings
+        self.customs = customs
+        self.delay_ms = delay_ms
+        self.max_delay_ms = max_delay_ms
+
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None  # future of the write in progress, if any
+        self.dirty = False
+        self.stopped = False
+
+        # restarted on every change
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self._flush)
+
+        # started by the first change, never restarted, caps how long a save can wait
+        self.max_timer = QTimer(self)
+        self.max_timer.setSingleShot(True)
+        self.max_timer.timeout.connect(self._flush)
+
+        self.save_failed.connect(lambda e: print(f"autosave failed: {e}"))
+        self._write_failed.connect(self._retry)
+
+        if hasattr(self.schedule, "add_listener"):
+            self.schedule.add_listener(self._on_schedule_change)
+        for source in (self.settings, self.customs):
+            if hasattr(source, "add_listener"):
+                source.add_listener(self.mark_dirty)
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        self.mark_dirty()
+
+    def mark_dirty(self, *_) -> None:
+        """note that something changed and (re)start the save countdown"""
+        if self.stopped:
+            return
+        self.dirty = True
+        self.debounce_timer.start(self.delay_ms)
+        if not self.max_timer.isActive():
+            self.max_timer.start(self.max_delay_ms)
+
+    def _flush(self) -> None:
+        """snapshot on this thread and hand the write to the worker"""
+        self.debounce_timer.stop()
+        self.max_timer.stop()
+        if not self.dirty:
+            return
+
+        # one write at a time; try again once the current one has finished
+        if self.pending is not None and not self.pending.done():
+            self.debounce_timer.start(self.delay_ms)
+            return
+
+        self.dirty = False
+        try:
+            snapshot = self.persistence.snapshot_all(self.schedule, self.settings, self.customs)
+        except Exception as e:
+            self.dirty = True
+            self.save_failed.emit(e)
+            return
+
+        self.pending = self.executor.submit(self.persistence.write_snapshot, snapshot)
+        self.pending.add_done_callback(self._write_done)
+
+    def _write_done(self, future) -> None:
+        """runs on the worker thread; touches no state, the signal is queued back to the GUI thread"""
+        error = future.exception()
+        if error is not None:
+            self._write_failed.emit(error)
+
+    def _retry(self, error) -> None:
+        """a background write failed: report it and schedule another attempt"""
+        self.save_failed.emit(error)
+        self.mark_dirty()
+
+    def flush_now(self) -> None:
+        """write any pending changes and wait until they are on disk"""
+        self._wait()
+        self._flush()
+        self._wait()
+
+    def stop(self) -> None:
+        """stop saving in the background, waiting for a write in progress to finish"""
+        self.stopped = True
+        self.debounce_timer.stop()
+        self.max_timer.stop()
+        if hasattr(self.schedule, "remove_listener"):
+            self.schedule.remove_listener(self._on_schedule_change)
+        for source in (self.settings, self.customs):
+            if hasattr(source, "remove_listener"):
+                source.remove_listener(self.mark_dirty)
+        self._wait()
+        self.executor.shutdown(wait=True)
+
+    def _wait(self) -> None:
+        if self.pending is not None:
+            try:
+                self.pending.result()
+            except Exception:
+                pass  # already reported through save_failed
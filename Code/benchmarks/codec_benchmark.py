@@ -0,0 +1,74 @@
+"""
+compare the JSON and binary schedule codecs on a large generated schedule
+
+run from the Code directory:  python benchmarks/codec_benchmark.py [blocks]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import codec
+from cryptography.fernet import Fernet
+from blocks import Task, EventBlock
+from schedule import Schedule
+from PyQt5.QtGui import QColor
+
+
+def make_schedule_data(count: int) -> dict:
+    """block dictionaries shaped like data.json, with realistic repetition of names"""
+    rng = random.Random(1)
+    names = ["Maths", "Physics", "Chemistry", "Essay", "Revision", "Gym", "Club", "Lecture"]
+    colours = [QColor(c) for c in ("#e57373", "#64b5f6", "#81c784", "#ffb74d")]
+    start = datetime(2024, 1, 1, 8, 0)
+
+    blocks = []
+    for i in range(count):
+        at = start + timedelta(minutes=30 * i)
+        if rng.random() < 0.3:
+            b = EventBlock(rng.choice(names), at, timedelta(minutes=60), location="Room 4",
+                           colour=rng.choice(colours), priority=rng.randint(0, 3),
+                           repeatable=rng.random() < 0.1, interval=7)
+        else:
+            b = Task(rng.choice(names), at, timedelta(minutes=rng.choice([15, 30, 45, 60])),
+                     deadline=at + timedelta(days=rng.randint(1, 14)), colour=rng.choice(colours))
+            if rng.random() < 0.7:
+                b.mark_complete()
+        blocks.append(Schedule.block_to_dict(b))
+    return {"schedule": {"name": "Schedule", "blocks": blocks}, "journal_seq": 0}
+
+
+def best_of(runs: int, fn) -> float:
+    """fastest of several runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(count: int) -> None:
+    data = make_schedule_data(count)
+    schedule = Schedule(None)
+    fernet = Fernet(Fernet.generate_key())
+
+    # save = encode + encrypt, load = decrypt + decode + Schedule.from_dict
+    print(f"{count} blocks")
+    print(f"{'codec':<8}{'size KB':>10}{'encode ms':>11}{'decode ms':>11}{'save ms':>10}{'load ms':>10}")
+    for chosen in (codec.JSONCodec(), codec.BinaryCodec()):
+        payload = chosen.encode(data)
+        encrypted = fernet.encrypt(payload)
+        encode_ms = best_of(5, lambda: chosen.encode(data))
+        decode_ms = best_of(5, lambda: codec.decode(payload))
+        save_ms = best_of(3, lambda: fernet.encrypt(chosen.encode(data)))
+        load_ms = best_of(3, lambda: schedule.from_dict(codec.decode(fernet.decrypt(encrypted))["schedule"]))
+        name = type(chosen).__name__.replace("Codec", "")
+        print(f"{name:<8}{len(encrypted) / 1024:>10.0f}{encode_ms:>11.1f}{decode_ms:>11.1f}{save_ms:>10.1f}{load_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
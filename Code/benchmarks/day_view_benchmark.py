@@ -0,0 +1,75 @@
+"""
+time DayView paints: a full repaint with the grid drawn from scratch (what
+every paint used to do), a full repaint from the cached grid, and the strip
+repainted when the current time line moves on a minute tick
+
+run from the Code directory:  python benchmarks/day_view_benchmark.py [blocks]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QRegion
+from PyQt5.QtCore import QPoint
+from blocks import EventBlock
+from day_view import DayView
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+def best_of(runs: int, fn) -> float:
+    """fastest of several runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(count: int) -> None:
+    app = QApplication.instance() or QApplication(sys.argv)
+    settings = Settings()
+    util = GUIUtils(ThemeManager(), settings)
+    schedule = Schedule(settings)
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    step = timedelta(minutes=24 * 60 // max(1, count))
+    schedule.blocks = [
+        EventBlock(f"Block {i}", today + i * step, max(step, timedelta(minutes=15)))
+        for i in range(count)
+    ]
+    schedule.layout_revision += 1
+
+    view = DayView(schedule, util, custom_blocks=None)
+    view.resize(600, view.minimumHeight())
+    image = QImage(view.size(), QImage.Format_ARGB32_Premultiplied)
+
+    def paint(region: QRegion) -> None:
+        view.render(image, QPoint(), region)
+
+    def uncached() -> None:
+        view._grid_cache = None
+        paint(QRegion(view.rect()))
+
+    paint(QRegion(view.rect()))
+    strip = view.time_line_rect(datetime.now())
+    tick = QRegion(strip).united(QRegion(view.time_line_rect(datetime.now() - timedelta(minutes=1))))
+
+    print(f"{count} blocks on a {view.width()}x{view.height()} day view")
+    print(f"{'full repaint, grid redrawn':<32}{best_of(20, uncached):>8.2f} ms")
+    print(f"{'full repaint, cached grid':<32}{best_of(20, lambda: paint(QRegion(view.rect()))):>8.2f} ms")
+    print(f"{'minute tick strips':<32}{best_of(20, lambda: paint(tick)):>8.2f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
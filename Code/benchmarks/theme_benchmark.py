@@ -0,0 +1,87 @@
+"""
+time theme switches on the full set of views: switching with the stylesheet
+compiled from scratch, switching with the compiled stylesheet cached, and
+re-applying the theme already in use (skipped)
+
+run from the Code directory:  python benchmarks/theme_benchmark.py [blocks]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QStackedWidget, QWidget
+from blocks import Task, CustomBlocks
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+from other_views import ToDoListView, MonthView
+from day_view_container import DayViewContainer
+from week_view import WeekViewContainer
+from agenda_view import AgendaView
+
+THEMES_FILE = Path(__file__).resolve().parents[2] / "themes.json"
+
+
+def best_of(runs: int, fn) -> float:
+    """fastest of several runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(count: int) -> None:
+    app = QApplication.instance() or QApplication(sys.argv)
+    settings = Settings()
+    tm = ThemeManager(str(THEMES_FILE))
+    util = GUIUtils(tm, settings)
+    schedule = Schedule(settings)
+
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    schedule.blocks = [
+        Task(f"Task {i}", start + timedelta(hours=3 * i), timedelta(minutes=45),
+             deadline=start + timedelta(days=30))
+        for i in range(count)
+    ]
+    schedule.layout_revision += 1
+
+    # every screen the main window stacks, so restyling polishes a realistic widget tree
+    stack = QStackedWidget()
+    for view in (ToDoListView(schedule, util), MonthView(schedule, util),
+                 DayViewContainer(schedule, util, CustomBlocks()),
+                 WeekViewContainer(schedule, util), AgendaView(schedule, util)):
+        stack.addWidget(view)
+    stack.resize(1200, 700)
+    stack.show()
+    app.processEvents()
+
+    themes = iter(["light", "dark"] * 100)
+
+    def switch() -> None:
+        util.apply_theme(next(themes))
+        app.processEvents()
+
+    def switch_uncached() -> None:
+        tm.clear_cache()
+        switch()
+
+    switch()
+    print(f"{count} tasks, {len(stack.findChildren(QWidget))} widgets restyled per switch")
+    print(f"{'switch, stylesheet compiled':<32}{best_of(10, switch_uncached):>8.2f} ms")
+    print(f"{'switch, stylesheet cached':<32}{best_of(10, switch):>8.2f} ms")
+    current = settings.theme
+    util.apply_theme(current)
+    print(f"{'same theme again (skipped)':<32}{best_of(10, lambda: util.apply_theme(current)):>8.2f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
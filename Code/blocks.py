@@ -2,6 +2,7 @@ from  abc import ABC
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from PyQt5.QtGui import QColor
+import uuid
 
 
 class Block(ABC):
@@ -24,6 +25,7 @@ class Block(ABC):
         self.notes = notes
         self.is_fixed = is_fixed
         self.colour = colour
+        self.id = uuid.uuid4().hex  # stable identity across saves, journals and notifications
 
     @property
     def end(self) -> datetime:
@@ -92,14 +94,33 @@ class CustomBlocks:
 
     def __init__(self, templates=None) -> None:
         self.templates = templates or []
+        self.revision = 0  # bumped by every change, compared by persistence to skip clean saves
+        self._listeners = []
+
+    def add_listener(self, callback) -> None:
+        """register callback() to be called after each change"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        """unregister a callback added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _changed(self) -> None:
+        """bump the revision and tell listeners"""
+        self.revision += 1
+        for callback in list(self._listeners):
+            callback()
 
     def add_template(self, template) -> None:
         """add a template to memory"""
         self.templates.append(template)
+        self._changed()
 
     def delete_template(self, name) -> None:
         """remove a template by name"""
         self.templates = [t for t in self.templates if t["name"] != name]
+        self._changed()
 
     def instantiate(self, template_name, **overrides) -> Union[Task, EventBlock]:
         """
@@ -147,5 +168,5 @@ class CustomBlocks:
         return {"templates": self.templates}
 
     def from_dict(self, data: dict) -> None:
-        """load templates from dictionary"""
-        self.templates = data["templates"]
\ No newline at end of file
+        """load templates from dictionary (a missing templates file loads as an empty list)"""
+        self.templates = data.get("templates", []) if isinstance(data, dict) else []
\ No newline at end of file
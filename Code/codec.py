@@ -0,0 +1,261 @@
+import json
+import re
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# every encoded payload starts with MAGIC, a codec id and a format version.
+# payloads without the header are plain JSON written before codecs existed
+MAGIC = b"NEA\x00"
+HEADER = struct.Struct("<4sBB")
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+COLOUR_PATTERN = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+class JSONCodec:
+    """the original format: the data dictionary as UTF-8 JSON"""
+
+    codec_id = 1
+    version = 1
+
+    def encode(self, data: dict) -> bytes:
+        return HEADER.pack(MAGIC, self.codec_id, self.version) + json.dumps(data).encode("utf-8")
+
+    def decode_body(self, body: bytes, version: int) -> dict:
+        return json.loads(body.decode("utf-8"))
+
+
+class BinaryCodec:
+    """
+    compact encoding for schedule data: blocks are packed into fixed-size
+    records with timestamps as epoch minutes, colours as 24-bit integers and
+    every string stored once in a shared table
+
+    everything around the block list (e.g. journal_seq) is kept as a small JSON
+    envelope. anything the packed form cannot hold exactly, such as timezone-aware
+    timestamps or dates past year 6000, makes encode fall back to JSONCodec
+    """
+
+    codec_id = 2
+    version = 1
+
+    # flags, id, name, location, notes, colour, start, duration, priority, interval, deadline, completed_at
+    RECORD = struct.Struct("<BIIIIIiIiIii")
+
+    EVENT, FIXED, REPEATABLE, COMPLETED = 1, 2, 4, 8
+    HAS_DEADLINE, HAS_COMPLETED_AT, PACKED_COLOUR, STRING_COLOUR = 16, 32, 64, 128
+
+    # (block index, field number, microseconds past the stored minute)
+    EXACT = struct.Struct("<IBI")
+
+    BLOCK_KEYS = {
+        "event": {"id", "type", "name", "start", "duration", "location", "notes",
+                  "is_fixed", "colour", "priority", "repeatable", "interval"},
+        "task": {"id", "type", "name", "start", "duration", "location", "notes",
+                 "is_fixed", "colour", "deadline", "is_completed", "completed_at"}
+    }
+
+    def encode(self, data: dict) -> bytes:
+        try:
+            body = self._encode_body(data)
+        except (ValueError, KeyError, TypeError, struct.error):
+            return JSONCodec().encode(data)
+        return HEADER.pack(MAGIC, self.codec_id, self.version) + body
+
+    # encoding
+    @staticmethod
+    def _find_blocks(data: dict) -> Tuple[Optional[str], List[dict]]:
+        """locate the block list: {"schedule": {"blocks": ...}} or {"blocks": ...}"""
+        if isinstance(data.get("schedule"), dict) and isinstance(data["schedule"].get("blocks"), list):
+            return "schedule", data["schedule"]["blocks"]
+        if isinstance(data.get("blocks"), list):
+            return "", data["blocks"]
+        return None, []
+
+    def _encode_body(self, data: dict) -> bytes:
+        path, blocks = self._find_blocks(data)
+        if path == "schedule":
+            envelope = {**data, "schedule": {k: v for k, v in data["schedule"].items() if k != "blocks"}}
+        elif path == "":
+            envelope = {k: v for k, v in data.items() if k != "blocks"}
+        else:
+            envelope = data
+
+        strings: Dict[str, int] = {}
+
+        def ref(value: Optional[str]) -> int:
+            """1-based index into the string table, 0 for None"""
+            if value is None:
+                return 0
+            if value not in strings:
+                strings[value] = len(strings) + 1
+            return strings[value]
+
+        records, exact, extras = [], [], {}
+        for i, bd in enumerate(blocks):
+            kind = bd["type"]
+            if kind not in self.BLOCK_KEYS:
+                raise ValueError(f"cannot pack block type {kind!r}")
+            if set(bd) != self.BLOCK_KEYS[kind]:
+                extras[i] = {k: v for k, v in bd.items() if k not in self.BLOCK_KEYS[kind]}
+                if not self.BLOCK_KEYS[kind] <= set(bd):
+                    raise KeyError("block is missing fields")
+
+            flags = self.EVENT if kind == "event" else 0
+            if bd["is_fixed"]:
+                flags |= self.FIXED
+
+            colour = 0
+            if bd["colour"] is not None:
+                if COLOUR_PATTERN.match(bd["colour"]):
+                    flags |= self.PACKED_COLOUR
+                    colour = int(bd["colour"][1:], 16)
+                else:
+                    flags |= self.STRING_COLOUR
+                    colour = ref(bd["colour"])
+
+            times = [bd["start"], None, None]
+            priority = interval = 0
+            if kind == "event":
+                if bd["repeatable"]:
+                    flags |= self.REPEATABLE
+                priority, interval = bd["priority"], bd["interval"]
+            else:
+                if bd["is_completed"]:
+                    flags |= self.COMPLETED
+                if bd["deadline"] is not None:
+                    flags |= self.HAS_DEADLINE
+                    times[1] = bd["deadline"]
+                if bd["completed_at"] is not None:
+                    flags |= self.HAS_COMPLETED_AT
+                    times[2] = bd["completed_at"]
+
+            minutes = [0, 0, 0]
+            for field, iso in enumerate(times):
+                if iso is None:
+                    continue
+                dt = datetime.fromisoformat(iso)
+                if dt.tzinfo is not None or dt.isoformat() != iso:
+                    raise ValueError("timestamp cannot be stored as epoch minutes")
+                whole, rest = divmod(dt - EPOCH, MINUTE)
+                minutes[field] = whole
+                if rest:
+                    exact.append(self.EXACT.pack(i, field, rest // timedelta(microseconds=1)))
+
+            duration = bd["duration"]
+            if duration != int(duration):
+                raise ValueError("duration is not a whole number of minutes")
+
+            records.append(self.RECORD.pack(
+                flags, ref(bd["id"]), ref(bd["name"]), ref(bd["location"]), ref(bd["notes"]),
+                colour, minutes[0], int(duration), priority, interval, minutes[1], minutes[2]
+            ))
+
+        encoded = [s.encode("utf-8") for s in strings]
+        meta = json.dumps({
+            "envelope": envelope,
+            "path": path,
+            "extras": extras
+        }).encode("utf-8")
+
+        return b"".join([
+            struct.pack("<I", len(meta)), meta,
+            struct.pack("<I", len(encoded)), struct.pack(f"<{len(encoded)}I", *map(len, encoded)), *encoded,
+            struct.pack("<I", len(records)), *records,
+            struct.pack("<I", len(exact)), *exact
+        ])
+
+    # decoding
+    def decode_body(self, body: bytes, version: int) -> dict:
+        offset = 0
+
+        def take(size: int) -> bytes:
+            nonlocal offset
+            chunk = body[offset:offset + size]
+            offset += size
+            return chunk
+
+        def count() -> int:
+            return struct.unpack("<I", take(4))[0]
+
+        meta = json.loads(take(count()).decode("utf-8"))
+
+        n_strings = count()
+        lengths = struct.unpack(f"<{n_strings}I", take(4 * n_strings))
+        strings: List[Optional[str]] = [None]
+        for length in lengths:
+            strings.append(take(length).decode("utf-8"))
+
+        n_blocks = count()
+        rows = self.RECORD.iter_unpack(take(n_blocks * self.RECORD.size))
+
+        exact = {}
+        for _ in range(count()):
+            i, field, micros = self.EXACT.unpack(take(self.EXACT.size))
+            exact[(i, field)] = timedelta(microseconds=micros)
+
+        def iso(i: int, field: int, minutes: int) -> str:
+            dt = EPOCH + timedelta(minutes=minutes)
+            if exact:
+                dt += exact.get((i, field), timedelta(0))
+            return dt.isoformat()
+
+        blocks = []
+        for i, (flags, id_ref, name_ref, location_ref, notes_ref, colour,
+                start, duration, priority, interval, deadline, completed_at) in enumerate(rows):
+            if flags & self.PACKED_COLOUR:
+                colour_value = f"#{colour:06x}"
+            elif flags & self.STRING_COLOUR:
+                colour_value = strings[colour]
+            else:
+                colour_value = None
+
+            bd: Dict[str, Any] = {
+                "id": strings[id_ref],
+                "type": "event" if flags & self.EVENT else "task",
+                "name": strings[name_ref],
+                "start": iso(i, 0, start),
+                "duration": float(duration),  # block_to_dict stores minutes as a float
+                "location": strings[location_ref],
+                "notes": strings[notes_ref],
+                "is_fixed": bool(flags & self.FIXED),
+                "colour": colour_value
+            }
+            if flags & self.EVENT:
+                bd.update({
+                    "priority": priority,
+                    "repeatable": bool(flags & self.REPEATABLE),
+                    "interval": interval
+                })
+            else:
+                bd.update({
+                    "deadline": iso(i, 1, deadline) if flags & self.HAS_DEADLINE else None,
+                    "is_completed": bool(flags & self.COMPLETED),
+                    "completed_at": iso(i, 2, completed_at) if flags & self.HAS_COMPLETED_AT else None
+                })
+            bd.update(meta["extras"].get(str(i), {}))
+            blocks.append(bd)
+
+        data = meta["envelope"]
+        if meta["path"] == "schedule":
+            data["schedule"]["blocks"] = blocks
+        elif meta["path"] == "":
+            data["blocks"] = blocks
+        return data
+
+
+CODECS = {codec.codec_id: codec for codec in (JSONCodec(), BinaryCodec())}
+
+
+def decode(payload: bytes) -> Any:
+    """decode any supported payload, detecting the codec from its header"""
+    if payload[:len(MAGIC)] != MAGIC:
+        return json.loads(payload.decode("utf-8"))
+
+    _, codec_id, version = HEADER.unpack_from(payload)
+    codec = CODECS.get(codec_id)
+    if codec is None or version > codec.version:
+        raise ValueError(f"unsupported data format (codec {codec_id}, version {version})")
+    return codec.decode_body(payload[HEADER.size:], version)
@@ -1,12 +1,17 @@
 from PyQt5.QtWidgets import QWidget, QScrollArea, QSizePolicy
-from PyQt5.QtGui import QFont, QPainter, QColor, QPen
-from PyQt5.QtCore import Qt, QRect, QPoint, QTimer
+from PyQt5.QtGui import QFont, QFontMetrics, QPainter, QPen, QRegion
+from PyQt5.QtCore import Qt, QRect, QTimer
 from datetime import datetime, timedelta, date, time
+from functools import partial
 from day_view_mouse_mixin import DayViewMouseMixin
 from day_view_menu_mixin import DayViewMenuMixin
+from day_view_paint_mixin import DayViewPaintMixin
+from layout_index import LayoutIndex
+from period_cache import PeriodCache
+from reschedule_preview import ReschedulePreview
 
 
-class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
+class DayView(DayViewMouseMixin, DayViewMenuMixin, DayViewPaintMixin, QWidget):
     """widget showing a single day with tasks/events and current time pointer"""
 
     def __init__(self, schedule, util, custom_blocks, parent=None) -> None:
@@ -17,7 +22,15 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
         self.update_theme_colours()
         self.block_rects = []  # store rects and associated items
         self.ghost_rects = []
+        self.layout_index = LayoutIndex([])  # block_rects sorted for hit tests, see index_layout()
+        self._layout_key = None
         self.custom_blocks = custom_blocks
+        self.items = []
+        self._items_key = None  # (day, schedule.day_revision(day)) self.items was read at
+        self._grid_cache = None  # pre-rendered hour grid, see grid_pixmap()
+        self._grid_key = None
+        self._time_line_at = None  # time the current time line was last painted at
+        self.day_cache = PeriodCache(capacity=5)  # day -> (items, layout key, layout index)
 
         # constants -----
         self.hour_height = 120
@@ -38,6 +51,21 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
         self.resizing_block = None  # block being resized
         self.incoming_block = None  # new block being added
 
+        # drag/resize pointer moves are applied at most once per display frame
+        self.pending_pointer_y = None
+        self.last_pointer_slot = None
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(self.frame_interval_ms())
+        self.frame_timer.timeout.connect(self.on_frame)
+
+        # what the dragged block's drop would move, worked out off the GUI thread
+        self.preview = ReschedulePreview(schedule, self)
+        self.preview.ready.connect(self.show_preview)
+        # a partial, not a slot on self, so the worker thread is let go while self is destroyed
+        self.destroyed.connect(partial(ReschedulePreview.stop, self.preview))
+        self.preview_ghosts_shown = []  # ghosts on screen, so a new result can clear them
+
         self.setMinimumHeight(24 * self.hour_height)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.set_current_day(date.today())
@@ -52,20 +80,12 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
         self.timer.start(1000)  # check every second
 
     # helpers 
-    def time_to_y(self, dt=datetime) -> int:
-        """convert a datetime to a vertical pixel position"""
-        minutes = dt.hour * 60 + dt.minute
-        return int((minutes / (24 * 60)) * (24 * self.hour_height))
-
-    def snap_y(self, y=int) -> int:
-        """snap a y-coordinate to the nearest 15-minute interval"""
-        snap_height = self.hour_height / 4
-        return round(y / snap_height) * snap_height
-
     def set_current_day(self, date=datetime) -> None:
-        """set the current day and reload blocks for it"""
+        """set the current day, taking its blocks and layout from the cache if they are still current"""
+        self.remember_day()
         self.current_day = date
-        self.load_blocks_for_day()
+        if not self.restore_day(date):
+            self.load_blocks_for_day()
         self.update()
         QTimer.singleShot(0, self.scroll_to_current_time)
 
@@ -73,142 +93,83 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
         """load blocks from schedule for the current day"""
         self.block_rects.clear()
         self.items = self.schedule.day(self.current_day)
-
-    def draw_block(self, item, rect, painter, alpha=200) -> None:
-        """draw a block (task/event or incoming ghost) with optional transparency"""
-        # vertical triple-dot
-        dot_x = rect.right() - 12
-        dot_y = rect.top() + 8
-        dot_radius = 2
-        dot_spacing = 6
-
-        # prepare text info
-        if isinstance(item, dict):
-            color = self.col_block_default
-
-            # adjust dot brightness
-            h, s, v, _ = color.getHsvF()
-            if v > 0.5:  # light block
-                v = max(0, v - 0.4)
-            else:  # dark block
-                v = min(1, v + 0.4)
-
-            dot_color = QColor()
-            dot_color.setHsvF(h, s, v, 1.0)
-            painter.setBrush(dot_color)
-            for i in range(3):
-                painter.drawEllipse(QPoint(dot_x, dot_y + i * dot_spacing), dot_radius, dot_radius)
-
-            color.setAlpha(alpha)
-            painter.setBrush(color)
-            painter.setPen(Qt.NoPen)
-            painter.drawRoundedRect(rect, 6, 6)
-
-            # block text lines
-            name = item.get("name", "Block")
-            start = item.get("ghost_start") or datetime.combine(date.today(), time(0, 0))
-            duration = item.get("ghost_duration", timedelta(minutes=60))
-            lines = [
-                f"{name}",
-                f"{start.strftime('%H:%M')} - {(start + duration).strftime('%H:%M')}",
-                f"duration: {int(duration.total_seconds() // 3600)}h {(int(duration.total_seconds() % 3600) // 60)}m"
-            ]
-        else:
-            color = QColor(item.colour) if getattr(item, "colour", None) else self.col_block_default
-
-            # adjust dot brightness
-            h, s, v, a = color.getHsvF()
-            if v > 0.5:
-                v = max(0, v - 0.4)
-            else:
-                v = min(1, v + 0.4)
-
-            dot_color = QColor()
-            dot_color.setHsvF(h, s, v, 1.0)
-            painter.setBrush(dot_color)
-            for i in range(3):
-                painter.drawEllipse(QPoint(dot_x, dot_y + i * dot_spacing), dot_radius, dot_radius)
-
-            color.setAlpha(alpha)
-            painter.setBrush(color)
-            painter.setPen(Qt.NoPen)
-            painter.drawRoundedRect(rect, 6, 6)
-
-            # block text lines
-            lines = [
-                f"{item.name}",
-                f"{item.start.strftime('%H:%M')} - {(item.start + item.duration).strftime('%H:%M')}",
-                f"duration: {int(item.duration.total_seconds() // 3600)}h {(int(item.duration.total_seconds() % 3600) // 60)}m"
-            ]
-            if getattr(item, "type", None) == "task":
-                if getattr(item, "deadline", None):
-                    lines.append(f"deadline: {item.deadline.strftime('%d/%m/%Y %H:%M')}")
-            elif getattr(item, "type", None) == "event":
-                lines.append(f"priority: {getattr(item,'priority','-')}")  # 0 = low, 2 = high
-                lines.append(f"repeat: {getattr(item,'repeat_count',0)} days")
-                interval = getattr(item,'interval', None)
-                if interval:
-                    lines.append(f"interval: {interval} min")
-
-            if getattr(item, "location", None):
-                lines.append(f"loc: {item.location}")
-            if getattr(item, "notes", None):
-                lines.append(f"notes: {item.notes}")
-
-        # clip lines to fit rect
-        text_height = rect.height() - 8
-        line_height = painter.fontMetrics().height()
-        max_lines = max(1, text_height // line_height)
-        lines_to_draw = lines[:max_lines]
-
-        painter.setPen(Qt.white)
-        painter.drawText(
-            QRect(rect.left() + 5, rect.top() + 4, rect.width() - 20, rect.height() - 4),
-            Qt.TextWordWrap,
-            "\n".join(lines_to_draw)
-        )
-
-    def update_theme_colours(self) -> None:
-        """update colours from theme manager"""
-        tm = self.util.tm
-        theme = self.util.settings.theme
-        self.col_block_default = tm.get_colour(theme, "default_block")
-        self.col_pointer = tm.get_colour(theme, "current_time_pointer")
-        self.col_grid_light = tm.get_colour(theme, "calendar_grid_light")
-        self.col_grid_dark = tm.get_colour(theme, "calendar_grid_dark")
-        self.col_text = tm.get_colour(theme, "label_color")
+        self._items_key = (self.current_day, self.schedule.day_revision(self.current_day))
+
+    def remember_day(self) -> None:
+        """keep the shown day's blocks and layout so coming back to it needs no work"""
+        if self._items_key is not None:
+            self.day_cache.put(self._items_key[0], self._items_key,
+                               (self.items, self._layout_key, self.layout_index))
+
+    def restore_day(self, day) -> bool:
+        """show day from the cache; False if it is not cached or has changed since"""
+        key = (day, self.schedule.day_revision(day))
+        cached = self.day_cache.get(day, key)
+        if cached is None:
+            return False
+        self.block_rects.clear()
+        self.items, self._layout_key, self.layout_index = cached
+        self._items_key = key
+        return True
+
+    def prefetch(self, day) -> None:
+        """read day's blocks and lay them out ahead of time, unless the cache already has them"""
+        key = (day, self.schedule.day_revision(day))
+        if day == self.current_day or self.day_cache.get(day, key) is not None:
+            return
+        items = self.schedule.day(day)
+        key = (day, self.schedule.day_revision(day))  # reading may have loaded stored blocks
+        rects = [
+            (self.block_rect(b.start, b.duration), b) for b in items
+            if not getattr(b, "is_completed", False)
+        ]
+        layout_key = (key, self.width(), self.hour_height, len(rects))
+        self.day_cache.put(day, key, (items, layout_key, LayoutIndex(rects)))
+
+    def day_items(self) -> list:
+        """the current day's blocks, re-read only if that day changed since the last read"""
+        if self._items_key != (self.current_day, self.schedule.day_revision(self.current_day)):
+            self.load_blocks_for_day()
+        return self.items
 
     # painting
+    def slot_rect(self, start: datetime, duration: timedelta) -> QRect:
+        """full-width strip covering a block (or ghost) painted at start, with a small margin"""
+        y_start = self.time_to_y(start)
+        y_end = self.time_to_y(start + duration)
+        if y_end < y_start:  # runs past midnight
+            y_end = self.height()
+        return QRect(0, y_start - 4, self.width(), max(4, y_end - y_start) + 8)
+
+    def block_rect(self, start: datetime, duration: timedelta) -> QRect:
+        """where a block starting at start is drawn"""
+        y_start = self.time_to_y(start)
+        y_end = self.time_to_y(start + duration)
+        height = max(4, y_end - y_start)
+        return QRect(60, int(y_start + 2), int(self.width() - 80), int(height - 4))
+
+    def time_line_rect(self, moment: datetime) -> QRect:
+        """the strip covered by the current time line and its time label at `moment`"""
+        text_height = QFontMetrics(QFont("Arial", 12)).height()
+        y = self.time_to_y(moment)
+        return QRect(0, y - text_height // 2 - 2, self.width(), text_height + 4)
+
     def paintEvent(self, event) -> None:
-        """draw grid, blocks, current time line, and ghost blocks"""
+        """draw grid, blocks, current time line, and ghost blocks inside the dirty rect"""
         self.block_rects.clear()
         self.ghost_rects.clear()
+        dirty = event.rect()
 
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self.grid_pixmap())  # clipped to the dirty region by Qt
         painter.setFont(QFont("Arial", 12))
 
-        # grid
-        for hour in range(24):
-            y_start = int(hour * self.hour_height)
-            # main line
-            painter.fillRect(50, y_start, self.width() - 50, self.main_line_height, self.col_grid_dark)
-
-            current_y = y_start + self.main_line_height
-            for _ in range(self.num_faint_lines):
-                current_y += self.segment_spacing
-                painter.fillRect(50, int(current_y), self.width() - 50, self.faint_line_height, self.col_grid_light)
-                current_y += self.faint_line_height
-
-            # hour label
-            painter.setPen(Qt.black)
-            line_center = y_start + self.main_line_height / 2
-            text_y = int(line_center + painter.fontMetrics().ascent() / 2)
-            painter.drawText(5, text_y, f"{hour:02d}:00")
-
         # current time line
         now = datetime.now()
+        self._time_line_at = None
         if now.date() == self.current_day:
+            self._time_line_at = now
             y_now = self.time_to_y(now)
             line_color = self.col_pointer
             line_color.setAlpha(200)  # semi-transparent
@@ -237,24 +198,24 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
             painter.setPen(Qt.white)
             painter.drawText(stadium_rect, Qt.AlignCenter, time_text)
 
-        self.items = self.schedule.day(datetime.now())
-
         # blocks
-        for item in self.items:
+        for item in self.day_items():
             if item is self.dragging_block:
                 continue  # ghost handled separately
             if getattr(item, "is_completed", False):
                 continue
 
-            start = item.start
-            end = start + item.duration
-            y_start = self.time_to_y(start)
-            y_end = self.time_to_y(end)
-            height = max(4, y_end - y_start)
-            rect = QRect(60, int(y_start + 2), int(self.width() - 80), int(height - 4))
-
-            self.draw_block(item, rect, painter)
+            rect = self.block_rect(item.start, item.duration)
+            if rect.intersects(dirty):
+                self.draw_block(item, rect, painter)
             self.block_rects.append((rect, item))
+        self.index_layout()
+
+        # where the blocks the drag displaces would end up
+        for start, duration, item in self.preview_ghosts():
+            rect = self.block_rect(start, duration)
+            if rect.intersects(dirty):
+                self.draw_block(item, rect, painter, alpha=70)
 
         # ghost blocks
         ghost = self.dragging_block or self.incoming_block
@@ -276,23 +237,59 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
                 self.draw_block(ghost, rect, painter, alpha=120)
                 self.ghost_rects.append((rect, ghost))
 
+                result = self.preview.result
+                if result is not None and result.infeasible and result.start == start:
+                    self.draw_infeasible(rect, result.infeasible, painter)
+
+    def preview_ghosts(self) -> list:
+        """(start, duration, block) for displaced blocks that would land on this day"""
+        result = self.preview.result
+        if result is None or not self.dragging_block:
+            return []
+        return [(b.start, b.duration, b) for b in result.displaced if b.start.date() == self.current_day]
+
+    def show_preview(self, result) -> None:
+        """repaint the strips the old and new displaced ghosts cover, and the dragged ghost"""
+        dirty = QRegion()
+        for start, duration, _ in self.preview_ghosts_shown:
+            dirty = dirty.united(self.slot_rect(start, duration))
+        self.preview_ghosts_shown = self.preview_ghosts()
+        for start, duration, _ in self.preview_ghosts_shown:
+            dirty = dirty.united(self.slot_rect(start, duration))
+        block = self.dragging_block
+        if block is not None and getattr(block, "ghost_start", None):
+            dirty = dirty.united(self.slot_rect(block.ghost_start, block.duration))
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def end_preview(self) -> None:
+        """stop previewing and clear any displaced ghosts still on screen"""
+        for start, duration, _ in self.preview_ghosts_shown:
+            self.update(self.slot_rect(start, duration))
+        self.preview_ghosts_shown = []
+        self.preview.cancel()
+
+    def index_layout(self) -> None:
+        """rebuild layout_index from block_rects if the painted layout changed"""
+        key = (self._items_key, self.width(), self.hour_height, len(self.block_rects))
+        if key != self._layout_key:
+            self.layout_index = LayoutIndex(self.block_rects)
+            self._layout_key = key
+
     def find_nearest_non_colliding(self, start_time: datetime, duration: timedelta) -> datetime:
         """return nearest start_time avoiding fixed blocks within day"""
-        fixed_blocks = sorted(
-            [b for _, b in self.block_rects if getattr(b, "is_fixed", False)],
-            key=lambda b: b.start
-        )
-
         candidate_start = start_time
         candidate_end = candidate_start + duration
         day_start = datetime.combine(candidate_start.date(), time(0, 0))
         day_end = datetime.combine(candidate_start.date(), time(23, 59))
 
         # push forward if overlapping
-        for fb in fixed_blocks:
+        for fb in self.layout_index.fixed_from(candidate_start):
             fb_start = fb.start
             fb_end = fb.start + fb.duration
-            if candidate_start < fb_end and candidate_end > fb_start:
+            if fb_start >= candidate_end:
+                break
+            if candidate_start < fb_end:
                 candidate_start = fb_end
                 candidate_end = candidate_start + duration
 
@@ -343,6 +340,9 @@ class DayView(QWidget, DayViewMouseMixin, DayViewMenuMixin):
             self.update_current_time()
 
     def update_current_time(self) -> None:
-        """update the current time and trigger repaint"""
+        """move the current time line, repainting only the strips it leaves and enters"""
         self.current_time = datetime.now()
-        self.update()
+        if self._time_line_at is not None:
+            self.update(self.time_line_rect(self._time_line_at))
+        if self.current_time.date() == self.current_day and getattr(self, "show_current_time", True):
+            self.update(self.time_line_rect(self.current_time))
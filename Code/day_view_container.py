@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QScrollArea, QHBoxLayout,
     QPushButton, QLabel, QDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from datetime import timedelta
 from day_view import DayView
 from block_pool import BlockPool
@@ -69,6 +69,7 @@ class DayViewContainer(QWidget):
     back = pyqtSignal()
     open_month = pyqtSignal(object, object)
     open_week = pyqtSignal(object)
+    open_agenda = pyqtSignal()
 
     def __init__(self, schedule, utils, customs) -> None:
         super().__init__()
@@ -85,7 +86,7 @@ class DayViewContainer(QWidget):
         # header
         header_bar, buttons = utils.create_top_bar(
             show_back=True, show_settings=True, show_todo=True,
-            show_month=True, show_week=True
+            show_month=True, show_week=True, show_agenda=True
         )
         main_layout.addWidget(header_bar)
 
@@ -100,6 +101,8 @@ class DayViewContainer(QWidget):
             buttons["month"].clicked.connect(self.open_month_view)
         if "week" in buttons:
             buttons["week"].clicked.connect(self.open_week_view)
+        if "agenda" in buttons:
+            buttons["agenda"].clicked.connect(self.open_agenda.emit)
 
         
 
@@ -147,6 +150,15 @@ class DayViewContainer(QWidget):
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
+        # the days either side are read and laid out once navigation settles,
+        # and again after the schedule changes
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(150)
+        self.prefetch_timer.timeout.connect(self.prefetch_neighbours)
+        self.utils.listen_while_alive(self, self.schedule, self._on_schedule_change)
+        self.prefetch_timer.start()
+
         self.utils.apply_theme()
 
     # day navigation methods 
@@ -154,6 +166,7 @@ class DayViewContainer(QWidget):
         """set the currently displayed day and update the label"""
         self.day_view.set_current_day(day_date)
         self.update_day_label()
+        self.prefetch_timer.start()
 
     def update_day_label(self) -> None:
         """update the day label to show the current day"""
@@ -164,12 +177,23 @@ class DayViewContainer(QWidget):
         if self.day_view.current_day:
             self.day_view.set_current_day(self.day_view.current_day - timedelta(days=1))
             self.update_day_label()
+            self.prefetch_timer.start()
 
     def go_to_next_day(self) -> None:
         """move to the next day"""
         if self.day_view.current_day:
             self.day_view.set_current_day(self.day_view.current_day + timedelta(days=1))
             self.update_day_label()
+            self.prefetch_timer.start()
+
+    def prefetch_neighbours(self) -> None:
+        """warm the day view's cache with the days before and after the one shown"""
+        current_day = self.day_view.current_day
+        for offset in (1, -1):
+            self.day_view.prefetch(current_day + timedelta(days=offset))
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        self.prefetch_timer.start()
 
     def open_month_view(self) -> None:
         """emit signal to open the month view"""
@@ -78,7 +78,7 @@ class DayViewMenuMixin:
                 real_block.interval = data.get("interval", 1)
 
                 print(f"[DEBUG] Edited event: {real_block.name}, {real_block.start}, {real_block.duration}")
-                self.schedule.global_edf_scheduler()
+                self.schedule.update_block(real_block)
                 self.update()
 
     def delete_block(self, block) -> None:
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QDialog
 from PyQt5.QtCore import QRect
+from PyQt5.QtGui import QGuiApplication
 from datetime import datetime, timedelta, date, time
 from dialogs import AddTaskDialog, AddEventDialog
 from blocks import Task, EventBlock
@@ -43,6 +44,10 @@ class DayViewMouseMixin:
         total_minutes = int((snapped_y / self.hour_height) * 60)
 
         if self.incoming_block:
+            if total_minutes == self.incoming_block.get("ghost_slot"):
+                return  # same snapped slot as the last event: nothing to redo
+            self.incoming_block["ghost_slot"] = total_minutes
+
             duration = timedelta(minutes=self.incoming_block.get("duration", 60))
             ghost_start = datetime.combine(date.today(), datetime.min.time()) + timedelta(minutes=total_minutes)
 
@@ -52,11 +57,12 @@ class DayViewMouseMixin:
                 ghost_start = now
 
             ghost_start = self.find_nearest_non_colliding(ghost_start, duration)
+            old_rect = self.slot_rect(self.incoming_block['ghost_start'], self.incoming_block['ghost_duration'])
             self.incoming_block['ghost_start'] = ghost_start
             self.incoming_block['ghost_duration'] = duration
             if 'name' not in self.incoming_block:
                 self.incoming_block['name'] = "New Block"
-            self.update()
+            self.update(old_rect.united(self.slot_rect(ghost_start, duration)))
 
     def dropEvent(self, event) -> None:
         """handle dropping of blocks from pool or other DayViews"""
@@ -135,7 +141,7 @@ class DayViewMouseMixin:
 
         if block:
             self.schedule.add_block(block)
-            self.items = self.schedule.day(date.today())
+            self.load_blocks_for_day()
             self.incoming_block = None
             self.update()
 
@@ -149,7 +155,7 @@ class DayViewMouseMixin:
         """detect clicks on blocks for dragging, resizing, or opening the block menu"""
         click_x, click_y = event.x(), event.y()
 
-        for rect, item in reversed(self.block_rects):  # topmost first
+        for rect, item in self.layout_index.near(click_y, margin=6):  # topmost first
             dot_size = 20
             menu_rect = QRect(rect.right() - dot_size, rect.top(), dot_size, dot_size)
             if menu_rect.contains(click_x, click_y):
@@ -174,79 +180,142 @@ class DayViewMouseMixin:
                 return
 
     def mouseMoveEvent(self, event) -> None:
-        """update positions of dragged or resizing blocks, and ghost previews"""
-        if self.dragging_block and not getattr(self.dragging_block, "is_fixed", False):
-            y = event.y() - self.drag_offset
-            snapped_y = self.snap_y(y)
-            total_minutes = int((snapped_y / self.hour_height) * 60)
+        """queue drag/resize moves; they are applied at most once per display frame"""
+        dragging = self.dragging_block and not getattr(self.dragging_block, "is_fixed", False)
+        if dragging or self.resizing_block:
+            self.queue_pointer_move(event.y())
+
+    # pointer throttling
+    @staticmethod
+    def frame_interval_ms() -> int:
+        """milliseconds per frame of the primary display (60Hz if unknown)"""
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        return max(1, int(1000 / (rate or 60)))
+
+    def queue_pointer_move(self, y: int) -> None:
+        """apply the first move straight away, then only the latest one each frame"""
+        self.pending_pointer_y = y
+        if not self.frame_timer.isActive():
+            self.apply_pointer_move()
+            self.frame_timer.start()
+
+    def on_frame(self) -> None:
+        """frame tick: apply the move that arrived during the last frame, if any"""
+        if self.pending_pointer_y is not None:
+            self.apply_pointer_move()
+            self.frame_timer.start()
+
+    def apply_pointer_move(self) -> None:
+        """move the ghost or resize edge to the latest pointer position"""
+        y, self.pending_pointer_y = self.pending_pointer_y, None
+        if y is None:
+            return
+        if self.dragging_block:
+            self.move_ghost_to(y)
+        elif self.resizing_block:
+            self.resize_to(y)
+
+    def pointer_slot(self, y: int) -> int:
+        """minutes past midnight of the snapped slot under y, kept inside the day"""
+        total_minutes = int((self.snap_y(y) / self.hour_height) * 60)
+        return min(max(0, total_minutes), 24 * 60 - 15)
+
+    def move_ghost_to(self, y: int) -> None:
+        """update the dragged block's ghost, repainting only where it was and where it goes"""
+        block = self.dragging_block
+        total_minutes = self.pointer_slot(y - self.drag_offset)
+        if total_minutes == self.last_pointer_slot:
+            return
+        self.last_pointer_slot = total_minutes
 
-            start = self.dragging_block.start
-            ghost_start = start.replace(hour=total_minutes // 60, minute=total_minutes % 60)
+        start = block.start
+        ghost_start = start.replace(hour=total_minutes // 60, minute=total_minutes % 60)
 
-            now = datetime.now()
-            block_active = start <= now <= start + self.dragging_block.duration
+        now = datetime.now()
+        block_active = start <= now <= start + block.duration
 
-            if block_active:
-                # cannot drag before original start
-                if ghost_start < start:
-                    ghost_start = start
-            else:
-                # cannot drag before current time
-                if ghost_start < now:
-                    ghost_start = now
+        if block_active:
+            # cannot drag before original start
+            if ghost_start < start:
+                ghost_start = start
+        else:
+            # cannot drag before current time
+            if ghost_start < now:
+                ghost_start = now
 
-            ghost_start = self.find_nearest_non_colliding(ghost_start, self.dragging_block.duration)
-            self.dragging_block.ghost_start = ghost_start
-            self.update()
+        ghost_start = self.find_nearest_non_colliding(ghost_start, block.duration)
+        # before the first move the block is still drawn in its own slot
+        old_start = getattr(block, "ghost_start", start)
+        block.ghost_start = ghost_start
+        self.update(self.slot_rect(old_start, block.duration).united(self.slot_rect(ghost_start, block.duration)))
+        if ghost_start != old_start:
+            # work out what dropping here would displace; the schedule is snapshot on the first move
+            if self.preview.block_id != block.id:
+                self.preview.begin(block)
+            self.preview.request(ghost_start)
+
+    def resize_to(self, y: int) -> None:
+        """move the grabbed edge of the resizing block, repainting only the strip it covers"""
+        block, edge = self.resizing_block
+        total_minutes = self.pointer_slot(y)
+        if total_minutes == self.last_pointer_slot:
+            return
+        self.last_pointer_slot = total_minutes
 
-        elif self.resizing_block:
-            block, edge = self.resizing_block
-            y = event.y()
-            snapped_y = self.snap_y(y)
-            total_minutes = int((snapped_y / self.hour_height) * 60)
-            start = block.start
-            end = start + block.duration
-            new_time = datetime.combine(start.date(), time(total_minutes // 60, total_minutes % 60))
+        start = block.start
+        end = start + block.duration
+        old_rect = self.slot_rect(start, block.duration)
+        new_time = datetime.combine(start.date(), time(total_minutes // 60, total_minutes % 60))
 
-            now = datetime.now()
-            block_active = start <= now <= end  # currently active block
+        now = datetime.now()
+        block_active = start <= now <= end  # currently active block
 
-            if edge == 'top':
-                new_start = new_time
+        if edge == 'top':
+            new_start = new_time
 
-                if block_active and new_start < start:
-                    new_start = start
-                elif not block_active and new_start < now:
-                    new_start = now
+            if block_active and new_start < start:
+                new_start = start
+            elif not block_active and new_start < now:
+                new_start = now
 
-                # collision with fixed blocks
-                for _, fb in self.block_rects:
-                    if getattr(fb, "is_fixed", False):
-                        fb_start = fb.start
-                        fb_end = fb.start + fb.duration
-                        if new_start < fb_end and end > fb_start:
-                            new_start = fb_end
+            # collision with fixed blocks
+            for fb in self.layout_index.fixed_from(new_start):
+                fb_start = fb.start
+                fb_end = fb.start + fb.duration
+                if fb_start >= end:
+                    break
+                if new_start < fb_end:
+                    new_start = fb_end
 
-                block.start = new_start
-                block.duration = max(timedelta(minutes=15), end - new_start)
+            block.start = new_start
+            block.duration = max(timedelta(minutes=15), end - new_start)
 
-            elif edge == 'bottom':
-                new_end = new_time
+        elif edge == 'bottom':
+            new_end = new_time
 
-                # collision with fixed blocks
-                for _, fb in self.block_rects:
-                    if getattr(fb, "is_fixed", False):
-                        fb_start = fb.start
-                        fb_end = fb.start + fb.duration
-                        if start < fb_end and new_end > fb_start:
-                            new_end = fb_start
+            # collision with fixed blocks
+            for fb in self.layout_index.fixed_from(start):
+                fb_start = fb.start
+                fb_end = fb.start + fb.duration
+                if fb_start >= new_end:
+                    break
+                if start < fb_end:
+                    new_end = fb_start
 
-                block.duration = max(timedelta(minutes=15), new_end - start)
+            block.duration = max(timedelta(minutes=15), new_end - start)
 
-            self.update()
+        self.update(old_rect.united(self.slot_rect(block.start, block.duration)))
 
     def mouseReleaseEvent(self, event) -> None:
         """finalize drag or resize operations and update schedule"""
+        # honour a move still waiting for the next frame
+        self.frame_timer.stop()
+        self.apply_pointer_move()
+        self.last_pointer_slot = None
+        if self.dragging_block:
+            self.end_preview()
+
         if self.dragging_block and hasattr(self.dragging_block, 'ghost_start'):
             self.dragging_block.start = self.dragging_block.ghost_start
             delattr(self.dragging_block, 'ghost_start')
@@ -255,7 +324,7 @@ class DayViewMouseMixin:
         if self.resizing_block:
             block, _ = self.resizing_block
             self.schedule.global_edf_scheduler(ignore_blocks=[block])
-            self.items = self.schedule.day(date.today())
+            self.load_blocks_for_day()
             self.update()
 
         self.dragging_block = None
@@ -0,0 +1,173 @@
+from PyQt5.QtGui import QFont, QPainter, QColor, QPixmap, QPen
+from PyQt5.QtCore import Qt, QRect, QPoint
+from datetime import datetime, timedelta, date, time
+
+
+class DayViewPaintMixin:
+    """
+    block drawing, time/pixel conversion and the cached grid backdrop, shared by
+    DayView and the week canvas
+    expects util, the grid constants (hour_height, line heights, segment_spacing)
+    and _grid_cache/_grid_key set to None
+    """
+
+    def time_to_y(self, dt=datetime) -> int:
+        """convert a datetime to a vertical pixel position"""
+        minutes = dt.hour * 60 + dt.minute
+        return int((minutes / (24 * 60)) * (24 * self.hour_height))
+
+    def snap_y(self, y=int) -> int:
+        """snap a y-coordinate to the nearest 15-minute interval"""
+        snap_height = self.hour_height / 4
+        return round(y / snap_height) * snap_height
+
+    def draw_block(self, item, rect, painter, alpha=200) -> None:
+        """draw a block (task/event or incoming ghost) with optional transparency"""
+        # vertical triple-dot
+        dot_x = rect.right() - 12
+        dot_y = rect.top() + 8
+        dot_radius = 2
+        dot_spacing = 6
+
+        # prepare text info
+        if isinstance(item, dict):
+            color = self.col_block_default
+
+            # adjust dot brightness
+            h, s, v, _ = color.getHsvF()
+            if v > 0.5:  # light block
+                v = max(0, v - 0.4)
+            else:  # dark block
+                v = min(1, v + 0.4)
+
+            dot_color = QColor()
+            dot_color.setHsvF(h, s, v, 1.0)
+            painter.setBrush(dot_color)
+            for i in range(3):
+                painter.drawEllipse(QPoint(dot_x, dot_y + i * dot_spacing), dot_radius, dot_radius)
+
+            color.setAlpha(alpha)
+            painter.setBrush(color)
+            painter.setPen(Qt.NoPen)
+            painter.drawRoundedRect(rect, 6, 6)
+
+            # block text lines
+            name = item.get("name", "Block")
+            start = item.get("ghost_start") or datetime.combine(date.today(), time(0, 0))
+            duration = item.get("ghost_duration", timedelta(minutes=60))
+            lines = [
+                f"{name}",
+                f"{start.strftime('%H:%M')} - {(start + duration).strftime('%H:%M')}",
+                f"duration: {int(duration.total_seconds() // 3600)}h {(int(duration.total_seconds() % 3600) // 60)}m"
+            ]
+        else:
+            color = QColor(item.colour) if getattr(item, "colour", None) else self.col_block_default
+
+            # adjust dot brightness
+            h, s, v, a = color.getHsvF()
+            if v > 0.5:
+                v = max(0, v - 0.4)
+            else:
+                v = min(1, v + 0.4)
+
+            dot_color = QColor()
+            dot_color.setHsvF(h, s, v, 1.0)
+            painter.setBrush(dot_color)
+            for i in range(3):
+                painter.drawEllipse(QPoint(dot_x, dot_y + i * dot_spacing), dot_radius, dot_radius)
+
+            color.setAlpha(alpha)
+            painter.setBrush(color)
+            painter.setPen(Qt.NoPen)
+            painter.drawRoundedRect(rect, 6, 6)
+
+            # block text lines
+            lines = [
+                f"{item.name}",
+                f"{item.start.strftime('%H:%M')} - {(item.start + item.duration).strftime('%H:%M')}",
+                f"duration: {int(item.duration.total_seconds() // 3600)}h {(int(item.duration.total_seconds() % 3600) // 60)}m"
+            ]
+            if getattr(item, "type", None) == "task":
+                if getattr(item, "deadline", None):
+                    lines.append(f"deadline: {item.deadline.strftime('%d/%m/%Y %H:%M')}")
+            elif getattr(item, "type", None) == "event":
+                lines.append(f"priority: {getattr(item,'priority','-')}")  # 0 = low, 2 = high
+                lines.append(f"repeat: {getattr(item,'repeat_count',0)} days")
+                interval = getattr(item,'interval', None)
+                if interval:
+                    lines.append(f"interval: {interval} min")
+
+            if getattr(item, "location", None):
+                lines.append(f"loc: {item.location}")
+            if getattr(item, "notes", None):
+                lines.append(f"notes: {item.notes}")
+
+        # clip lines to fit rect
+        text_height = rect.height() - 8
+        line_height = painter.fontMetrics().height()
+        max_lines = max(1, text_height // line_height)
+        lines_to_draw = lines[:max_lines]
+
+        painter.setPen(Qt.white)
+        painter.drawText(
+            QRect(rect.left() + 5, rect.top() + 4, rect.width() - 20, rect.height() - 4),
+            Qt.TextWordWrap,
+            "\n".join(lines_to_draw)
+        )
+
+    def draw_infeasible(self, rect, message: str, painter) -> None:
+        """outline a ghost whose drop the scheduler could not fit, with its reason along the bottom"""
+        warning = QColor("#d9534f")
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(QPen(warning, 3))
+        painter.drawRoundedRect(rect, 6, 6)
+
+        line_height = painter.fontMetrics().height()
+        text_rect = QRect(rect.left() + 5, rect.bottom() - line_height - 2, rect.width() - 10, line_height)
+        painter.setPen(warning)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         painter.fontMetrics().elidedText(message, Qt.ElideRight, text_rect.width()))
+
+    def update_theme_colours(self) -> None:
+        """update colours from theme manager"""
+        tm = self.util.tm
+        theme = self.util.settings.theme
+        self.col_block_default = tm.get_colour(theme, "default_block")
+        self.col_pointer = tm.get_colour(theme, "current_time_pointer")
+        self.col_grid_light = tm.get_colour(theme, "calendar_grid_light")
+        self.col_grid_dark = tm.get_colour(theme, "calendar_grid_dark")
+        self.col_text = tm.get_colour(theme, "label_color")
+
+    def paint_grid(self, painter) -> None:
+        """draw the hour lines, faint quarter lines and hour labels"""
+        painter.setFont(QFont("Arial", 12))
+        for hour in range(24):
+            y_start = int(hour * self.hour_height)
+            # main line
+            painter.fillRect(50, y_start, self.width() - 50, self.main_line_height, self.col_grid_dark)
+
+            current_y = y_start + self.main_line_height
+            for _ in range(self.num_faint_lines):
+                current_y += self.segment_spacing
+                painter.fillRect(50, int(current_y), self.width() - 50, self.faint_line_height, self.col_grid_light)
+                current_y += self.faint_line_height
+
+            # hour label
+            painter.setPen(Qt.black)
+            line_center = y_start + self.main_line_height / 2
+            text_y = int(line_center + painter.fontMetrics().ascent() / 2)
+            painter.drawText(5, text_y, f"{hour:02d}:00")
+
+    def grid_pixmap(self) -> QPixmap:
+        """the static grid, rendered once and reused until the size or theme colours change"""
+        ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), ratio, self.col_grid_dark.rgba(), self.col_grid_light.rgba())
+        if self._grid_cache is None or self._grid_key != key:
+            pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            grid_painter = QPainter(pixmap)
+            self.paint_grid(grid_painter)
+            grid_painter.end()
+            self._grid_cache, self._grid_key = pixmap, key
+        return self._grid_cache
@@ -0,0 +1,402 @@
+"""
+streaming iCalendar (.ics) import and export
+
+files are read and written a line at a time, so memory use does not grow with
+the size of the file: the importer only ever holds the component being parsed
+plus one batch of blocks, and the exporter writes each block as it goes (keeping
+only the ids written so far, and the first occurrence of each repeating series
+until the end)
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import re
+from blocks import Task, EventBlock
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # python < 3.9
+    ZoneInfo = None
+
+DEFAULT_TASK_DURATION = timedelta(minutes=30)
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+FOLD_LIMIT = 75  # octets per line, RFC 5545 3.1
+
+RRULE_DAYS = {"DAILY": 1, "WEEKLY": 7}
+MAX_SERIES_OCCURRENCES = 1000  # finite series are expanded into single events, longer ones are skipped
+
+# iCalendar priority is 1 (highest) to 9, blocks use 0 (low) to 2 (high)
+IMPORT_PRIORITY = {1: 2, 2: 2, 3: 2, 4: 1, 5: 1, 6: 1}
+EXPORT_PRIORITY = {1: 5, 2: 1}
+SPECIAL_NAMES = {"breakfast", "lunch", "dinner", "break"}
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+DURATION_PATTERN = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+
+# reading
+def _unfolded_lines(stream: IO[str]) -> Iterator[str]:
+    """join folded continuation lines (starting with a space or tab) back together"""
+    current = None
+    for raw in stream:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split_property(line: str) -> Tuple[str, Dict[str, str], str]:
+    """'DTSTART;TZID=Europe/London:20260105T090000' -> name, params, value"""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.partition("=")[::2] for p in params), value
+
+
+def iter_components(stream: IO[str]) -> Iterator[Tuple[str, Dict[str, Tuple[Dict[str, str], str]]]]:
+    """
+    yield (kind, properties) for each VEVENT and VTODO in the stream
+    properties map a name to (params, value); nested components such as VALARM
+    are skipped
+    """
+    kind, props, depth = None, None, 0
+    for line in _unfolded_lines(stream):
+        name, params, value = _split_property(line)
+        if name == "BEGIN":
+            if kind is not None:
+                depth += 1
+            elif value.upper() in ("VEVENT", "VTODO"):
+                kind, props, depth = value.upper(), {}, 0
+        elif name == "END":
+            if kind is not None and depth:
+                depth -= 1
+            elif kind is not None and value.upper() == kind:
+                yield kind, props
+                kind, props = None, None
+        elif kind is not None and not depth:
+            props.setdefault(name, (params, value))
+
+
+def _unescape(text: str) -> str:
+    return ESCAPE_PATTERN.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def _parse_datetime(params: Dict[str, str], value: str) -> datetime:
+    """parse DATE or DATE-TIME values into the naive local datetimes blocks use"""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d")
+
+    if value.endswith("Z"):
+        dt = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return dt.astimezone().replace(tzinfo=None)
+
+    dt = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    if "TZID" in params and ZoneInfo is not None:
+        try:
+            dt = dt.replace(tzinfo=ZoneInfo(params["TZID"].strip('"')))
+            return dt.astimezone().replace(tzinfo=None)
+        except (KeyError, ValueError):
+            pass  # unknown zone: treat as local time
+    return dt
+
+
+def _parse_duration(value: str) -> Optional[timedelta]:
+    match = DURATION_PATTERN.match(value.strip())
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(
+        weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+        minutes=int(minutes or 0), seconds=int(seconds or 0)
+    )
+    return -duration if sign == "-" else duration
+
+
+def _rrule_parts(rrule: str) -> Dict[str, str]:
+    """'FREQ=WEEKLY;COUNT=4' -> {'FREQ': 'WEEKLY', 'COUNT': '4'}"""
+    return dict(p.partition("=")[::2] for p in rrule.upper().split(";") if p)
+
+
+def _repeat_interval(rrule: str) -> int:
+    """
+    days between repeats for a simple daily/weekly RRULE, 0 if it cannot be
+    expressed as a fixed interval (monthly, yearly, BYDAY lists...)
+    """
+    parts = _rrule_parts(rrule)
+    days = RRULE_DAYS.get(parts.get("FREQ"))
+    if days is None or "," in parts.get("BYDAY", ""):
+        return 0
+    try:
+        return days * int(parts.get("INTERVAL", 1))
+    except ValueError:
+        return 0
+
+
+def _is_all_day(props: dict) -> bool:
+    """true for a VEVENT given as a DATE: a day marker, not a time to block out"""
+    params, value = props.get("DTSTART", ({}, ""))
+    return params.get("VALUE") == "DATE" or len(value.strip()) == 8
+
+
+def _expand_series(event: EventBlock, rrule: str) -> Optional[List[EventBlock]]:
+    """
+    the occurrences of a repeating event whose RRULE has a COUNT or UNTIL, as
+    separate non-repeating events (blocks themselves repeat forever)
+    the event itself if the series is open-ended, None if it is too long to expand
+    """
+    parts = _rrule_parts(rrule)
+    if not event.repeatable or ("COUNT" not in parts and "UNTIL" not in parts):
+        return [event]
+    try:
+        count = int(parts["COUNT"]) if "COUNT" in parts else None
+        until = _parse_datetime({}, parts["UNTIL"]) if "UNTIL" in parts else None
+    except ValueError:
+        return None
+    if until is not None and len(parts["UNTIL"]) == 8:
+        until = until.replace(hour=23, minute=59, second=59)  # a DATE includes the whole day
+
+    occurrences = []
+    start = event.start
+    while (count is None or len(occurrences) < count) and (until is None or start <= until):
+        if len(occurrences) >= MAX_SERIES_OCCURRENCES:
+            return None
+        occurrence = EventBlock(
+            event.name, start, event.duration,
+            location=event.location, notes=event.notes, priority=event.priority
+        )
+        occurrence.id = f"{event.id}-{len(occurrences)}"
+        occurrences.append(occurrence)
+        start += timedelta(days=event.interval)
+    return occurrences
+
+
+def component_to_blocks(kind: str, props: dict) -> List[Union[Task, EventBlock]]:
+    """
+    the blocks a component imports as, empty if it is skipped: all-day events,
+    components without a usable time and finite series too long to expand
+    """
+    if kind == "VEVENT" and _is_all_day(props):
+        return []
+    block = component_to_block(kind, props)
+    if block is None:
+        return []
+    if kind == "VEVENT" and "RRULE" in props:
+        return _expand_series(block, props["RRULE"][1]) or []
+    return [block]
+
+
+def component_to_block(kind: str, props: dict) -> Optional[Union[Task, EventBlock]]:
+    """map a VEVENT to an EventBlock or a VTODO to a Task, None if it has no usable time"""
+    def text(name: str) -> str:
+        return _unescape(props[name][1]) if name in props else ""
+
+    def when(name: str) -> Optional[datetime]:
+        if name not in props:
+            return None
+        try:
+            return _parse_datetime(*props[name])
+        except ValueError:
+            return None
+
+    start = when("DTSTART")
+    duration = _parse_duration(props["DURATION"][1]) if "DURATION" in props else None
+    name = text("SUMMARY") or "untitled"
+
+    if kind == "VEVENT":
+        if start is None:
+            return None
+        end = when("DTEND")
+        if duration is None:
+            duration = end - start if end else DEFAULT_EVENT_DURATION
+        if duration <= timedelta(0):
+            duration = DEFAULT_EVENT_DURATION
+        interval = _repeat_interval(props["RRULE"][1]) if "RRULE" in props else 0
+        try:
+            priority = IMPORT_PRIORITY.get(int(text("PRIORITY") or 0), 0)
+        except ValueError:
+            priority = 0
+        block = EventBlock(
+            name, start, duration,
+            location=text("LOCATION"), notes=text("DESCRIPTION"),
+            priority=priority, repeatable=interval > 0, interval=interval
+        )
+    else:
+        deadline = when("DUE")
+        if start is None and deadline is None:
+            return None
+        if duration is None or duration <= timedelta(0):
+            duration = DEFAULT_TASK_DURATION
+        block = Task(
+            name, start if start is not None else deadline - duration, duration,
+            deadline=deadline, location=text("LOCATION"), notes=text("DESCRIPTION")
+        )
+        if text("STATUS").upper() == "COMPLETED" or "COMPLETED" in props:
+            block.is_completed = True
+            block.completed_at = when("COMPLETED") or block.end
+
+    if "UID" in props:
+        block.id = props["UID"][1]
+    return block
+
+
+def import_ics(source: Union[str, IO[str]], schedule, batch_size: int = 1000) -> Tuple[int, int]:
+    """
+    stream VEVENT/VTODO components from an .ics path or text stream into the
+    schedule, adding them in batches and rescheduling once at the end
+    blocks whose UID is already in the schedule are left out
+    returns (blocks added, components skipped, see component_to_blocks)
+    """
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8", newline="") as stream:
+            return import_ics(stream, schedule, batch_size)
+
+    known = {b.id for b in schedule.blocks}
+    added, skipped, batch = 0, 0, []
+    for kind, props in iter_components(source):
+        blocks = component_to_blocks(kind, props)
+        if not blocks:
+            skipped += 1
+        for block in blocks:
+            if block.id in known:
+                continue
+            known.add(block.id)
+            batch.append(block)
+            if len(batch) >= batch_size:
+                schedule.add_blocks(batch, reschedule=False)
+                added += len(batch)
+                batch = []
+
+    if batch:
+        schedule.add_blocks(batch, reschedule=False)
+        added += len(batch)
+    if added:
+        schedule.global_edf_scheduler()
+    return added, skipped
+
+
+# writing
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """split a content line into CRLF-terminated pieces of at most 75 octets"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= FOLD_LIMIT:
+        return line + "\r\n"
+
+    pieces, current, size, limit = [], [], 0, FOLD_LIMIT
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            pieces.append("".join(current))
+            current, size, limit = [], 0, FOLD_LIMIT - 1  # continuation lines start with a space
+        current.append(char)
+        size += width
+    pieces.append("".join(current))
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _format_datetime(dt: datetime) -> str:
+    return dt.strftime("%Y%m%dT%H%M%S")
+
+
+def block_to_lines(b, stamp: str) -> List[str]:
+    """the content lines of one block as a VEVENT or VTODO"""
+    kind = "VEVENT" if b.type == "event" else "VTODO"
+    lines = [
+        f"BEGIN:{kind}",
+        f"UID:{b.id}",
+        f"DTSTAMP:{stamp}",
+        f"SUMMARY:{_escape(b.name)}",
+        f"DTSTART:{_format_datetime(b.start)}",
+    ]
+    if b.type == "event":
+        lines.append(f"DTEND:{_format_datetime(b.end)}")
+        if b.repeatable and b.interval:
+            if b.interval % 7 == 0:
+                lines.append(f"RRULE:FREQ=WEEKLY;INTERVAL={b.interval // 7}")
+            else:
+                lines.append(f"RRULE:FREQ=DAILY;INTERVAL={b.interval}")
+        if b.priority:
+            lines.append(f"PRIORITY:{EXPORT_PRIORITY.get(b.priority, 9)}")
+    else:
+        lines.append(f"DURATION:PT{int(b.duration.total_seconds() // 60)}M")
+        if b.deadline:
+            lines.append(f"DUE:{_format_datetime(b.deadline)}")
+        if b.is_completed:
+            lines.append("STATUS:COMPLETED")
+            if b.completed_at:
+                lines.append(f"COMPLETED:{b.completed_at.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}")
+    if b.location:
+        lines.append(f"LOCATION:{_escape(b.location)}")
+    if b.notes:
+        lines.append(f"DESCRIPTION:{_escape(b.notes)}")
+    lines.append(f"END:{kind}")
+    return lines
+
+
+def _series_key(b) -> tuple:
+    """
+    what the occurrences of one repeating event share: the copies the scheduler
+    generates differ from their series' first event only by a whole number of intervals
+    """
+    return (b.name, b.interval, b.duration, b.start.time(), b.start.toordinal() % b.interval)
+
+
+def export_ics(schedule, target: Union[str, IO[str]], stored: Iterable[List[dict]] = ()) -> int:
+    """
+    write the schedule's blocks (without generated meals and breaks) to an .ics
+    path or text stream, one block at a time
+    stored yields batches of block dictionaries still on disk (see
+    PersistenceManager.iter_unloaded), so months and history that were never
+    loaded are exported too
+    a repeating event is written once, as its earliest occurrence with an RRULE
+    returns the number of blocks written
+    """
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8", newline="") as stream:
+            return export_ics(schedule, stream, stored)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    target.write(_fold("BEGIN:VCALENDAR"))
+    target.write(_fold("VERSION:2.0"))
+    target.write(_fold("PRODID:-//NEA//Schedule//EN"))
+
+    def blocks():
+        yield from schedule.blocks
+        yield from schedule.pending_archive
+        for batch in stored:
+            for bd in batch:
+                yield schedule.block_from_dict(bd)
+
+    written = 0
+    seen = set()
+    series = {}  # series key -> its earliest occurrence so far
+    for b in blocks():
+        if b.name.lower() in SPECIAL_NAMES or b.start is None or b.id in seen:
+            continue
+        seen.add(b.id)
+        if b.type == "event" and b.repeatable and b.interval:
+            key = _series_key(b)
+            if key not in series or b.start < series[key].start:
+                series[key] = b
+            continue
+        target.write("".join(_fold(line) for line in block_to_lines(b, stamp)))
+        written += 1
+
+    for b in series.values():
+        target.write("".join(_fold(line) for line in block_to_lines(b, stamp)))
+        written += 1
+
+    target.write(_fold("END:VCALENDAR"))
+    return written
@@ -0,0 +1,47 @@
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from typing import Iterator, List, Tuple
+
+
+class LayoutIndex:
+    """
+    index over a day view's painted (rect, item) pairs
+
+    rects are kept sorted by their top edge so hit tests only look at the few
+    rects near the pointer, and fixed blocks are kept sorted by start so drag
+    and resize collision checks only look at the ones near the moving block.
+    built once per layout change and reused by every mouse event until the next
+    """
+
+    def __init__(self, block_rects: List[Tuple]) -> None:
+        # paint order decides which of two overlapping rects is on top
+        ordered = sorted(enumerate(block_rects), key=lambda entry: entry[1][0].top())
+        self.entries = [(order, rect, item) for order, (rect, item) in ordered]
+        self.tops = [rect.top() for _, rect, _ in self.entries]
+        self.tallest = max((rect.height() for _, rect, _ in self.entries), default=0)
+
+        self.fixed = sorted(
+            (item for _, item in block_rects if getattr(item, "is_fixed", False)),
+            key=lambda b: b.start
+        )
+        self.fixed_starts = [b.start for b in self.fixed]
+        self.longest_fixed = max((b.duration for b in self.fixed), default=timedelta(0))
+
+    def near(self, y: int, margin: int = 0) -> List[Tuple]:
+        """(rect, item) pairs whose rect, grown by margin, spans y; topmost first"""
+        lo = bisect_left(self.tops, y - margin - self.tallest)
+        hi = bisect_right(self.tops, y + margin)
+        hits = [
+            (order, rect, item) for order, rect, item in self.entries[lo:hi]
+            if rect.top() - margin <= y <= rect.bottom() + margin
+        ]
+        hits.sort(key=lambda hit: hit[0], reverse=True)
+        return [(rect, item) for _, rect, item in hits]
+
+    def fixed_from(self, start) -> Iterator:
+        """
+        fixed blocks in start order, skipping those that end before start;
+        callers stop once a block starts after the span they are checking
+        """
+        for i in range(bisect_left(self.fixed_starts, start - self.longest_fixed), len(self.fixed)):
+            yield self.fixed[i]
@@ -1,4 +1,5 @@
-from persistence_manager import PersistenceManager
+from partitioned_persistence_manager import PartitionedPersistenceManager
+from sqlite_persistence_manager import SQLitePersistenceManager, migrate_json_to_sqlite
 from schedule import Schedule
 from settings import Settings
 from theme_manager import ThemeManager
@@ -6,33 +7,81 @@ from blocks import CustomBlocks
 from main_window import MainWindow
 from utils import GUIUtils
 from notification_manager import NotificationManager
+from startup import StartupLoader, FirstPaintTimer
 
-from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtCore import Qt
 import sys
+import time
+
+
+def make_persistence_manager(argv):
+    """
+    monthly encrypted partitions by default, or the sqlite database with --sqlite;
+    the database is filled from the JSON files the first time it is used
+    """
+    if "--sqlite" not in argv:
+        return PartitionedPersistenceManager()
+    manager = SQLitePersistenceManager()
+    if manager.is_empty():
+        migrate_json_to_sqlite(PartitionedPersistenceManager(), manager)
+    return manager
 
 
 def main():
+    started_at = time.perf_counter()
+
     # create qt application
     app = QApplication(sys.argv)
 
-    # load settings + persistence
-    persistence_manager = PersistenceManager()
+    # decrypt and parse the independent files on worker threads
+    persistence_manager = make_persistence_manager(sys.argv)
+    loader = StartupLoader({
+        "settings": persistence_manager.load_settings,
+        "custom_blocks": persistence_manager.load_custom_blocks,
+        "schedule": lambda: persistence_manager.replay_journal(persistence_manager.load_data()),
+        "themes": ThemeManager
+    })
 
+    # settings, templates and themes are small and every view needs them
     settings = Settings()
-    settings_data = persistence_manager.load_settings()
-    settings.from_dict(settings_data)
-
     customs = CustomBlocks()
-    templates = persistence_manager.load_custom_blocks()
-    customs.from_dict(templates)
-
-    # initialise schedule
     schedule = Schedule(settings)
-    schedule_data = persistence_manager.load_data()
-    schedule.from_dict(schedule_data)
+    window = None
+    notification_manager = None
+
+    def on_loaded(name, result):
+        if name != "schedule":
+            return
+        schedule.from_dict(result.get("schedule", {}))
+        schedule.archive_loader = persistence_manager.load_archive
+        schedule.period_loader = persistence_manager.load_period
+        schedule.range_reader = persistence_manager.read_period
+        schedule.range_bounds = persistence_manager.stored_bounds
+        persistence_manager.attach_journal(schedule)
+        persistence_manager.mark_saved(schedule=schedule)
+        window.on_schedule_loaded()
+        notification_manager.rebuild()
+        print(f"[STARTUP] schedule ready after {loader.elapsed_ms():.0f} ms")
+
+    def on_failed(name, error):
+        print(f"[STARTUP] loading {name} failed: {error}")
+        if name == "schedule":
+            # never carry on with an empty schedule, the next save would overwrite the real one
+            QMessageBox.critical(window, "startup error", f"could not load schedule: {error}")
+            app.exit(1)
+
+    # queued so handlers run from the event loop, once the window exists
+    loader.loaded.connect(on_loaded, Qt.QueuedConnection)
+    loader.failed.connect(on_failed, Qt.QueuedConnection)
+    loader.start()
+
+    settings.from_dict(loader.result("settings"))
+    customs.from_dict(loader.result("custom_blocks"))
+    theme_manager = loader.result("themes")
+    persistence_manager.mark_saved(settings=settings, custom_blocks=customs)
 
-    # gui setup
-    theme_manager = ThemeManager()
+    # gui setup, while the schedule is still being decrypted
     gui_utils = GUIUtils(theme_manager, settings)
 
     app.setStyle("Fusion")
@@ -42,8 +91,11 @@ def main():
         settings,
         persistence_manager,
         gui_utils,
-        customs
+        customs,
+        loading=True
     )
+    first_paint = FirstPaintTimer(started_at, parent=window)
+    window.installEventFilter(first_paint)
     window.show()
     
     notification_manager = NotificationManager(
@@ -52,6 +104,8 @@ def main():
                                 utils=gui_utils,
                                 parent=window
                             )
+    window.settings_view.settings_saved.connect(lambda _: notification_manager.rebuild())
+    app.aboutToQuit.connect(notification_manager.dispatcher.stop)
 
     gui_utils.apply_theme()
 
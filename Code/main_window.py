@@ -1,17 +1,27 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QMainWindow, QMessageBox, QStackedWidget
+    QWidget, QVBoxLayout, QMainWindow, QMessageBox, QStackedWidget, QFileDialog
 )
+from PyQt5.QtCore import QTimer
 from utils import IndexStack
 from other_views import ToDoListView, MonthView
 from day_view_container import DayViewContainer
 from settings_view import SettingsView
 from week_view import WeekViewContainer
+from agenda_view import AgendaView
+from autosave import AutosaveService
+from schedule import ScheduleInfeasibleError
+import ical
 
 class MainWindow(QMainWindow):
     """main application window containing all views and navigation logic"""
-    
-    def __init__(self, schedule, settings, persistence_manager, util, customs) -> None:
-        """initialize main window, set up views, and configure navigation"""
+
+    OPTIMIZE_IDLE_MS = 30000  # with the optimizer engine, search once edits have been quiet this long
+
+    def __init__(self, schedule, settings, persistence_manager, util, customs, loading: bool = False) -> None:
+        """
+        initialize main window, set up views, and configure navigation
+        with loading=True the views stay disabled until on_schedule_loaded is called
+        """
         super().__init__()
         self.util = util
         self.schedule = schedule
@@ -34,6 +44,18 @@ class MainWindow(QMainWindow):
         self.main_layout.setContentsMargins(12, 12, 12, 12)
         self.main_layout.setSpacing(12)
 
+        # background saving shortly after each change
+        self.autosave = AutosaveService(
+            self.persistence, self.schedule, self.settings, self.customs, parent=self
+        )
+
+        # edits reschedule with plain EDF; the optimizer runs once they settle
+        self.optimize_timer = QTimer(self)
+        self.optimize_timer.setSingleShot(True)
+        self.optimize_timer.timeout.connect(self.optimize_schedule)
+        self.optimizing = False
+        self.schedule.add_listener(self._on_schedule_change)
+
         # stack for screens
         self.stack = QStackedWidget()
         self.main_layout.addWidget(self.stack)
@@ -44,23 +66,29 @@ class MainWindow(QMainWindow):
         self.month_view = MonthView(self.schedule, self.util)
         self.day_view_container = DayViewContainer(self.schedule, self.util, self.customs)
         self.week_view_container = WeekViewContainer(self.schedule, self.util)
+        self.agenda_view = AgendaView(self.schedule, self.util)
 
         self.stack.addWidget(self.month_view)
         self.stack.addWidget(self.settings_view)
         self.stack.addWidget(self.todo_view)
         self.stack.addWidget(self.day_view_container)
         self.stack.addWidget(self.week_view_container)
+        self.stack.addWidget(self.agenda_view)
 
         # navigation
         self.todo_view.open_settings.connect(lambda: self.switch_to(1))
         self.todo_view.back.connect(lambda: self.switch_back())
         self.settings_view.back.connect(lambda: self.switch_back())
+        self.settings_view.settings_saved.connect(self.apply_settings)
+        self.settings_view.import_calendar.connect(self.import_calendar)
+        self.settings_view.export_calendar.connect(self.export_calendar)
         self.month_view.open_settings.connect(lambda: self.switch_to(1))
         self.month_view.open_todo.connect(lambda: self.switch_to(2))
         self.month_view.open_day.connect(self.day_view_container.set_current_day)
         self.month_view.open_day.connect(lambda _: self.switch_to(3))
         self.month_view.open_week.connect(self.week_view_container.set_current_week)
         self.month_view.open_week.connect(lambda _: self.switch_to(4))
+        self.month_view.open_agenda.connect(lambda: self.switch_to(5))
         self.month_view.back.connect(lambda: self.switch_back())
         self.day_view_container.back.connect(lambda: self.switch_back())
         self.day_view_container.open_settings.connect(lambda: self.switch_to(1))
@@ -69,18 +97,52 @@ class MainWindow(QMainWindow):
         self.day_view_container.open_month.connect(lambda: self.switch_to(0))
         self.day_view_container.open_week.connect(self.week_view_container.set_current_week)
         self.day_view_container.open_week.connect(lambda _: self.switch_to(4))
+        self.day_view_container.open_agenda.connect(lambda: self.switch_to(5))
         self.week_view_container.open_settings.connect(lambda: self.switch_to(1))
         self.week_view_container.open_todo.connect(lambda: self.switch_to(2))
         self.week_view_container.open_day.connect(self.day_view_container.set_current_day)
         self.week_view_container.open_day.connect(lambda _: self.switch_to(3))
         self.week_view_container.open_month.connect(self.month_view.change_to_month)
         self.week_view_container.open_month.connect(lambda _: self.switch_to(0))
+        self.week_view_container.open_agenda.connect(lambda: self.switch_to(5))
         self.week_view_container.back.connect(lambda: self.switch_back())
+        self.agenda_view.open_settings.connect(lambda: self.switch_to(1))
+        self.agenda_view.open_todo.connect(lambda: self.switch_to(2))
+        self.agenda_view.open_day.connect(self.day_view_container.set_current_day)
+        self.agenda_view.open_day.connect(lambda _: self.switch_to(3))
+        self.agenda_view.back.connect(lambda: self.switch_back())
         self.setObjectName("MainWindow")
 
         # apply themes
         self.util.apply_theme()
 
+        self.data_ready = not loading
+        self.central.setEnabled(self.data_ready)
+
+    def on_schedule_loaded(self) -> None:
+        """enable the views and fill them once the schedule has been loaded in the background"""
+        self.data_ready = True
+        self.central.setEnabled(True)
+        self.month_view.refresh_month_view()
+        self.week_view_container.refresh_week_view()
+        self.todo_view.refresh()
+        self.day_view_container.day_view.update()
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        """restart the idle countdown for the optimizer engine"""
+        if not self.optimizing and getattr(self.settings, "scheduler_engine", "edf") == "optimizer":
+            self.optimize_timer.start(self.OPTIMIZE_IDLE_MS)
+
+    def optimize_schedule(self) -> None:
+        """idle reschedule with the optimizer, its own changes do not restart the countdown"""
+        self.optimizing = True
+        try:
+            self.schedule.optimize()
+        except ScheduleInfeasibleError:
+            pass  # nothing was moved, the next edit reports it
+        finally:
+            self.optimizing = False
+
     def switch_to(self, index: int) -> None:
         """switch to a given screen index and refresh the widget if possible"""
         self.schedule.clear_history()
@@ -108,12 +170,57 @@ class MainWindow(QMainWindow):
             if hasattr(widget, "refresh"):
                 widget.refresh()
 
+    def apply_settings(self, before: dict) -> None:
+        """reschedule for the saved settings, warning if they leave the schedule infeasible"""
+        try:
+            self.schedule.apply_settings_change(before)
+        except ScheduleInfeasibleError as e:
+            QMessageBox.warning(self, "settings saved", f"settings saved, but {e}")
+
+    def import_calendar(self) -> None:
+        """ask for an .ics file and add its events and tasks to the schedule"""
+        path, _ = QFileDialog.getOpenFileName(self, "import calendar", "", "iCalendar (*.ics)")
+        if not path:
+            return
+        try:
+            added, skipped = ical.import_ics(path, self.schedule)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "import failed", f"could not read calendar: {e}")
+            return
+        except ScheduleInfeasibleError as e:
+            QMessageBox.warning(self, "import calendar", f"calendar imported, but {e}")
+            return
+        message = f"imported {added} blocks"
+        if skipped:
+            message += f", skipped {skipped} all-day, untimed or over-long repeating entries"
+        QMessageBox.information(self, "import calendar", message)
+
+    def export_calendar(self) -> None:
+        """ask where to save and write the schedule as an .ics file"""
+        path, _ = QFileDialog.getSaveFileName(self, "export calendar", "schedule.ics", "iCalendar (*.ics)")
+        if not path:
+            return
+        try:
+            written = ical.export_ics(self.schedule, path, self.persistence.iter_unloaded())
+        except OSError as e:
+            QMessageBox.warning(self, "export failed", f"could not write calendar: {e}")
+            return
+        QMessageBox.information(self, "export calendar", f"exported {written} blocks")
+
     def closeEvent(self, event):
+        # nothing can have changed before the schedule finished loading,
+        # and saving the empty placeholder would overwrite the real data
+        if not self.data_ready:
+            event.accept()
+            return
+
         # if currently in settings view, commit settings first
         if self.current_index == 1 and hasattr(self, "settings_view"):
             self.settings_view.save_settings()
 
-        # then save everything
+        # let any background save finish, then save everything
+        self.optimize_timer.stop()
+        self.autosave.stop()
         try:
             self.persistence.save_all(self.schedule, self.settings, self.customs)
         except Exception as e:
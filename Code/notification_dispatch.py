@@ -0,0 +1,230 @@
+import queue
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Optional cross-platform fallback
+try:
+    from plyer import notification as plyer_notification
+except ImportError:
+    plyer_notification = None
+
+# Optional Windows toast
+try:
+    from win10toast import ToastNotifier
+except ImportError:
+    ToastNotifier = None
+
+# macOS pync
+try:
+    from pync import Notifier
+except ImportError:
+    Notifier = None
+
+
+# backends: anything with a name and send(title, message)
+class PyncBackend:
+    name = "pync"
+
+    def send(self, title: str, message: str) -> None:
+        Notifier.notify(message, title=title, sound="Ping")
+
+
+class Win10ToastBackend:
+    name = "win10toast"
+
+    def __init__(self) -> None:
+        self.toaster = ToastNotifier()
+
+    def send(self, title: str, message: str) -> None:
+        self.toaster.show_toast(title, message, duration=5, threaded=True)
+
+
+class PlyerBackend:
+    name = "plyer"
+
+    def send(self, title: str, message: str) -> None:
+        plyer_notification.notify(title=title, message=message, app_name="Scheduler", timeout=5)
+
+
+class PrintBackend:
+    name = "print"
+
+    def send(self, title: str, message: str) -> None:
+        print(f"Notification: {title} – {message}")  # fallback if nothing available
+
+
+class RecordingBackend:
+    """stand-in that keeps what it was sent, for headless tests and benchmarks"""
+    name = "recording"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.sent: List[Tuple[str, str]] = []
+
+    def send(self, title: str, message: str) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("recording backend set to fail")
+        self.sent.append((title, message))
+
+
+def default_backends() -> list:
+    """the native backends available on this platform, best first, ending with print"""
+    backends = []
+    if sys.platform == "darwin" and Notifier:
+        backends.append(PyncBackend())
+    if sys.platform == "win32" and ToastNotifier:
+        backends.append(Win10ToastBackend())
+    if plyer_notification:
+        backends.append(PlyerBackend())
+    backends.append(PrintBackend())
+    return backends
+
+
+class NotificationDispatcher:
+    """
+    sends notifications from a worker thread so a slow notification daemon
+    never stalls the GUI
+
+    notifications submitted within `coalesce_ms` of each other are sent as one
+    summary. each backend gets `timeout` seconds; a backend that times out or
+    raises is skipped for a backoff period that doubles with each failure
+    (up to `max_backoff`), and the next backend is tried instead. consecutive
+    failures and the last error of each backend are kept in `failures` and `errors`
+    """
+
+    def __init__(self, backends: Optional[list] = None, coalesce_ms: int = 1500,
+                 timeout: float = 5.0, backoff: float = 30.0, max_backoff: float = 600.0) -> None:
+        self.backends = backends if backends is not None else default_backends()
+        self.coalesce_ms = coalesce_ms
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.failures = {b.name: 0 for b in self.backends}
+        self.errors = {b.name: None for b in self.backends}  # last exception, TimeoutError if it hung
+        self.retry_at = {b.name: 0.0 for b in self.backends}
+
+        self.queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self.worker.start()
+
+        # one long-lived helper runs the backend calls, so the worker can stop
+        # waiting on a hung one; it is only replaced after a send times out
+        self.sends: Optional[queue.Queue] = None
+        self.sender: Optional[threading.Thread] = None
+
+    def submit(self, title: str, message: str) -> None:
+        """queue a notification; returns immediately"""
+        self.queue.put((title, message))
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """wait until everything submitted so far has been handled"""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def stop(self) -> None:
+        """finish what is queued, then stop the worker and its send helper"""
+        self.queue.put(None)
+        self.worker.join(timeout=self.timeout + self.coalesce_ms / 1000 + 1)
+        if self.sends is not None:
+            self.sends.put(None)
+
+    # worker thread
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+
+            # collect anything else that arrives within the coalescing window
+            batch = [item]
+            stop = False
+            window_ends = time.monotonic() + self.coalesce_ms / 1000
+            while True:
+                remaining = window_ends - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    more = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if more is None:
+                    stop = True
+                    break
+                batch.append(more)
+
+            try:
+                self._deliver(*self._summarise(batch))
+            finally:
+                for _ in range(len(batch) + stop):
+                    self.queue.task_done()
+            if stop:
+                return
+
+    @staticmethod
+    def _summarise(batch: List[Tuple[str, str]]) -> Tuple[str, str]:
+        if len(batch) == 1:
+            return batch[0]
+        return f"{len(batch)} blocks starting soon", "\n".join(message for _, message in batch)
+
+    def _deliver(self, title: str, message: str) -> Optional[str]:
+        """try each backend not backing off; returns the name of the one that worked"""
+        for backend in self.backends:
+            if time.monotonic() < self.retry_at[backend.name]:
+                continue
+            error = self._send_with_timeout(backend, title, message)
+            if error is None:
+                self.failures[backend.name] = 0
+                return backend.name
+
+            self.failures[backend.name] += 1
+            self.errors[backend.name] = error
+            delay = min(self.backoff * 2 ** (self.failures[backend.name] - 1), self.max_backoff)
+            self.retry_at[backend.name] = time.monotonic() + delay
+        return None
+
+    def _send_with_timeout(self, backend, title: str, message: str) -> Optional[Exception]:
+        """
+        run one send on the helper thread so a hung backend cannot block the queue
+        returns None if it worked, otherwise what went wrong
+        """
+        if self.sender is None:
+            self.sends = queue.Queue()
+            self.sender = threading.Thread(target=self._send_loop, args=(self.sends,),
+                                           name="notification-send", daemon=True)
+            self.sender.start()
+
+        outcome, done = {}, threading.Event()
+        self.sends.put((backend, title, message, outcome, done))
+        if done.wait(self.timeout):
+            return outcome.get("error")
+
+        # the helper is stuck in the backend: let it exit if the call ever returns,
+        # and start a fresh one for the next send
+        self.sends.put(None)
+        self.sends, self.sender = None, None
+        return TimeoutError(f"{backend.name} did not return within {self.timeout}s")
+
+    @staticmethod
+    def _send_loop(sends: queue.Queue) -> None:
+        """helper thread: run queued backend calls until told to stop"""
+        while True:
+            job = sends.get()
+            if job is None:
+                return
+            backend, title, message, outcome, done = job
+            try:
+                backend.send(title, message)
+            except Exception as e:
+                outcome["error"] = e
+            done.set()
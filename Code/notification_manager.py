@@ -1,83 +1,124 @@
 from datetime import datetime, timedelta
-import sys
+import heapq
 from PyQt5.QtCore import QTimer
 
-# Optional cross-platform fallback
-try:
-    from plyer import notification as plyer_notification
-except ImportError:
-    plyer_notification = None
+from notification_dispatch import NotificationDispatcher
 
-# Optional Windows toast
-try:
-    from win10toast import ToastNotifier
-except ImportError:
-    ToastNotifier = None
 
-# macOS pync
-try:
-    from pync import Notifier
-except ImportError:
-    Notifier = None
+class NotificationManager:
+    """
+    Cross-platform native notifications for scheduled blocks.
 
+    Upcoming blocks sit in a min-heap keyed by when their notification is due,
+    and a single-shot timer is armed for the earliest one, so nothing runs
+    between notifications. The heap is updated from schedule change
+    notifications; stale heap entries are skipped lazily when popped, and the
+    heap is rebuilt from the live entries once stale ones outnumber them.
+    """
 
-class NotificationManager:
-    """Cross-platform native notifications for scheduled blocks."""
+    MAX_WAIT_MS = 60 * 60 * 1000  # re-check at least hourly (clock changes, sleep)
 
-    def __init__(self, schedule, settings, utils, parent) -> None:
+    def __init__(self, schedule, settings, utils, parent, dispatcher=None) -> None:
         self.schedule = schedule
         self.settings = settings
         self.parent = parent
         self.utils = utils  # keep it for global theme if needed
 
-        self.check_interval_ms = 5 * 1000  # 5 seconds
+        self.heap = []        # (fire_at, block id, start)
+        self.pending = {}     # block id -> (fire_at, start) of its live heap entry
+        self.notified = {}    # block id -> start it was notified for, pruned once started
+
         self.timer = QTimer(self.parent)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.check_notifications)
-        self.timer.start(self.check_interval_ms)
 
-        self.notified_blocks = set()
+        # native notifications are sent from a worker thread, never from the timer callback
+        self.dispatcher = dispatcher or NotificationDispatcher()
+
+        if hasattr(self.schedule, "add_listener"):
+            self.schedule.add_listener(self._on_schedule_change)
+        self.rebuild()
+
+    # heap maintenance
+    def _notify_frequency(self) -> timedelta:
+        return getattr(self.settings, "notification_frequency", timedelta(minutes=30))
+
+    def _push(self, block, now: datetime) -> None:
+        """queue (or requeue) a block's notification if it is still to come"""
+        self.pending.pop(block.id, None)
+        if block.start is None or block.start <= now:
+            return
+        if self.notified.get(block.id) == block.start:
+            return
+        fire_at = max(block.start - self._notify_frequency(), now)
+        self.pending[block.id] = (fire_at, block.start)
+        heapq.heappush(self.heap, (fire_at, block.id, block.start))
+
+    def rebuild(self) -> None:
+        """rebuild the heap from the whole schedule (startup, settings changes)"""
+        now = datetime.now()
+        self.heap, self.pending = [], {}
+        for block in self.schedule.blocks:
+            if block.name.lower() not in self.schedule.SPECIAL_NAMES:
+                self._push(block, now)
+        self._arm()
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        """schedule listener: requeue changed blocks, forget removed ones"""
+        now = datetime.now()
+        for block in blocks:
+            if op in ("remove", "archive"):
+                self.pending.pop(block.id, None)
+                self.notified.pop(block.id, None)
+            else:
+                self._push(block, now)
+        self._arm()
+
+    def _compact(self) -> None:
+        """drop superseded entries, which otherwise stay until their fire time"""
+        self.heap = [(fire_at, block_id, start) for block_id, (fire_at, start) in self.pending.items()]
+        heapq.heapify(self.heap)
 
-        # Initialize Windows toaster if on Windows
-        self.win_toaster = ToastNotifier() if sys.platform == "win32" and ToastNotifier else None
+    def _arm(self) -> None:
+        """point the timer at the earliest live entry"""
+        if len(self.heap) > 2 * len(self.pending):
+            self._compact()
+        while self.heap and self.pending.get(self.heap[0][1]) != (self.heap[0][0], self.heap[0][2]):
+            heapq.heappop(self.heap)  # superseded or removed
+
+        if not self.heap:
+            self.timer.stop()
+            return
+
+        wait = (self.heap[0][0] - datetime.now()).total_seconds() * 1000
+        self.timer.start(int(min(max(wait, 0), self.MAX_WAIT_MS)))
 
     def check_notifications(self) -> None:
-        """Check schedule and notify for upcoming blocks."""
+        """Notify every block that is due, then re-arm for the next one."""
         now = datetime.now()
-        notif_freq = getattr(self.settings, "notification_frequency", timedelta(minutes=30))
+        blocks = {b.id: b for b in self.schedule.blocks}
 
-        for block in self.schedule.day(now):
-            # Skip meals/breaks
-            if any(keyword in block.name.lower() for keyword in ["breakfast", "lunch", "dinner", "break"]):
+        while self.heap and self.heap[0][0] <= now:
+            fire_at, block_id, start = heapq.heappop(self.heap)
+            if self.pending.get(block_id) != (fire_at, start):
                 continue
-
-            time_until_start = block.start - now
-
-            if timedelta(0) < time_until_start <= notif_freq and block not in self.notified_blocks:
+            del self.pending[block_id]
+            block = blocks.get(block_id)
+            if block is not None and block.start == start and start > now:
                 self.show_notification(block)
-                self.notified_blocks.add(block)
+                self.notified[block_id] = start
+
+        # forget notifications for blocks that have started
+        self.notified = {block_id: start for block_id, start in self.notified.items() if start > now}
+        self._arm()
 
     def show_notification(self, block) -> None:
-        """Send a cross-platform native notification."""
+        """Queue a cross-platform native notification (returns immediately)."""
         title = "yoo hoo"
         message = f"{block.start.strftime('%H:%M')} – {block.name}"
-
-        try:
-            if sys.platform == "darwin" and Notifier:  # macOS + pync
-                Notifier.notify(message, title=title, sound="Ping")
-            elif sys.platform == "win32" and self.win_toaster:  # Windows
-                self.win_toaster.show_toast(title, message, duration=5, threaded=True)
-            elif plyer_notification:  # fallback / Linux / other
-                plyer_notification.notify(
-                    title=title,
-                    message=message,
-                    app_name="Scheduler",
-                    timeout=5
-                )
-            else:
-                print(f"Notification: {title} – {message}")  # fallback if nothing available
-        except Exception as e:
-            print(f"Failed to show notification for '{block.name}': {e}")
+        self.dispatcher.submit(title, message)
 
     def reset_notifications(self) -> None:
         """Clear all notified blocks to allow re-notification."""
-        self.notified_blocks.clear()
+        self.notified.clear()
+        self.rebuild()
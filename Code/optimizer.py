@@ -0,0 +1,196 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import random
+import time as _time
+
+
+class _BudgetExceeded(Exception):
+    """raised internally when the wall-clock budget runs out mid-evaluation"""
+
+
+class ScheduleOptimizer:
+    """
+    anytime local search over task placements, starting from the EDF result
+
+    the search works on the order tasks are placed in, decoding each order
+    into start times with a first-fit placement around the fixed blocks.
+    moves are:
+    - swap: exchange two tasks in the order
+    - shift: move one task to another position in the order
+    - compaction: decode filling earlier gaps instead of only moving forward
+
+    the best placement found when the budget runs out is applied, and it is
+    only applied if it scores strictly better than the EDF placement.
+    lateness is compared first, so no saving in fragmentation or switches
+    can buy a later finish
+    """
+
+    FRAGMENT_WEIGHT = 1         # per idle minute between blocks on a day
+    SWITCH_WEIGHT = 10          # per change of task between adjacent blocks
+
+    def __init__(self, settings, budget_ms: int = 50, seed: Optional[int] = None) -> None:
+        self.settings = settings
+        self.budget = budget_ms / 1000.0
+        self.random = random.Random(seed)
+        self.deadline = 0.0
+
+    # public
+    def improve(self, tasks: List, fixed_blocks: List, start_pointer: datetime) -> bool:
+        """
+        improve the EDF placement of tasks in place
+        returns True if a better placement was applied
+        """
+        self.deadline = _time.perf_counter() + self.budget
+        if len(tasks) < 2:
+            return False
+
+        self.fixed = sorted(fixed_blocks, key=lambda b: b.start)
+        self.start_pointer = start_pointer
+
+        best_order = sorted(tasks, key=lambda t: t.start)
+        best_starts = {t: t.start for t in tasks}
+        try:
+            best_cost = self.cost(best_starts)
+        except _BudgetExceeded:
+            return False
+        edf_cost = best_cost
+
+        current_order, current_cost = list(best_order), best_cost
+        compact = False
+
+        while _time.perf_counter() < self.deadline:
+            order, mode = self._neighbour(current_order, compact)
+            try:
+                starts = self.decode(order, mode)
+                cost = self.cost(starts)
+            except _BudgetExceeded:
+                break
+
+            if cost <= current_cost:
+                current_order, current_cost, compact = order, cost, mode
+                if cost < best_cost:
+                    best_order, best_starts, best_cost = order, starts, cost
+
+        if best_cost >= edf_cost:
+            return False
+
+        for t, start in best_starts.items():
+            t.start = start
+        return True
+
+    # neighbourhood
+    def _neighbour(self, order: List, compact: bool) -> Tuple[List, bool]:
+        """return a random neighbouring (order, compact) pair"""
+        order = list(order)
+        n = len(order)
+        move = self.random.random()
+
+        if move < 0.4:
+            i, j = self.random.sample(range(n), 2)
+            order[i], order[j] = order[j], order[i]
+        elif move < 0.8:
+            i, j = self.random.sample(range(n), 2)
+            order.insert(j, order.pop(i))
+        else:
+            compact = not compact
+        return order, compact
+
+    # decoding
+    def decode(self, order: List, compact: bool) -> Dict:
+        """
+        place tasks in the given order and return {task: start}
+        sequential mode never places a task before the previous one ends
+        (like EDF), compact mode fills the earliest gap that fits
+        """
+        starts, ends = [], []
+        for b in self.fixed:
+            self._occupy(starts, ends, b.start, b.start + b.duration)
+
+        placed = {}
+        pointer = self.start_pointer
+        for t in order:
+            start = self._first_fit(starts, ends, pointer, t.duration)
+            placed[t] = start
+            self._occupy(starts, ends, start, start + t.duration)
+            if not compact:
+                pointer = start + t.duration
+        return placed
+
+    @staticmethod
+    def _occupy(starts: List, ends: List, start: datetime, end: datetime) -> None:
+        """insert an interval into the sorted busy list, merging overlaps"""
+        i = bisect_right(starts, start)
+        if i > 0 and ends[i - 1] >= start:
+            i -= 1
+            start = starts[i]
+            end = max(end, ends[i])
+            del starts[i]
+            del ends[i]
+        while i < len(starts) and starts[i] <= end:
+            end = max(end, ends[i])
+            del starts[i]
+            del ends[i]
+        starts.insert(i, start)
+        ends.insert(i, end)
+
+    def _first_fit(self, starts: List, ends: List, current: datetime, duration: timedelta) -> datetime:
+        """earliest start >= current inside day bounds that avoids the busy list"""
+        while True:
+            if _time.perf_counter() >= self.deadline:
+                raise _BudgetExceeded()
+
+            day_start, day_end = self.settings.get_day_bounds(current)
+            if current < day_start:
+                current = day_start
+
+            if current + duration > day_end:
+                next_day = current + timedelta(days=1)
+                next_day_start, _ = self.settings.get_day_bounds(next_day)
+                current = datetime.combine(next_day.date(), next_day_start.time())
+                continue
+
+            i = bisect_right(starts, current) - 1
+            if i >= 0 and ends[i] > current:
+                current = ends[i]
+                continue
+            if i + 1 < len(starts) and starts[i + 1] < current + duration:
+                current = ends[i + 1]
+                continue
+            return current
+
+    # scoring
+    def cost(self, placement: Dict) -> Tuple[float, float]:
+        """(total lateness, weighted fragmentation and context switches), compared in that order"""
+        lateness = 0.0
+        for t, start in placement.items():
+            if t.deadline is not None:
+                late = (start + t.duration - t.deadline).total_seconds() / 60.0
+                lateness += max(0.0, late)
+
+        # per-day timelines of (start, end, name, priority) for tasks and fixed blocks
+        days = {}
+        for t, start in placement.items():
+            days.setdefault(start.date(), []).append((start, start + t.duration, t.name, None))
+        for b in self.fixed:
+            day = b.start.date()
+            if day in days:
+                days[day].append((b.start, b.start + b.duration, b.name, getattr(b, "priority", 0)))
+
+        fragmentation = 0.0
+        switches = 0.0
+        for timeline in days.values():
+            if _time.perf_counter() >= self.deadline:
+                raise _BudgetExceeded()
+            timeline.sort(key=lambda x: x[0])
+            last_task_end = max(end for _, end, _, prio in timeline if prio is None)
+            for (a_start, a_end, a_name, a_prio), (b_start, b_end, b_name, b_prio) in zip(timeline, timeline[1:]):
+                if b_start >= last_task_end:
+                    break
+                if a_end >= self.start_pointer:
+                    fragmentation += max(0.0, (b_start - a_end).total_seconds() / 60.0)
+                if a_name != b_name:
+                    # switching into or out of an event costs more the higher its priority
+                    switches += 1 + (a_prio or 0) + (b_prio or 0)
+
+        return lateness, self.FRAGMENT_WEIGHT * fragmentation + self.SWITCH_WEIGHT * switches
@@ -1,16 +1,17 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout,
-    QTableWidget, QTableWidgetItem, QCheckBox, QHeaderView, 
+    QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QHeaderView,
     QAbstractItemView, QSizePolicy, QLineEdit, QDialog,
-    QStyledItemDelegate
+    QStyledItemDelegate, QTableView
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QRect
-from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QRect, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+)
+from PyQt5.QtGui import QColor, QFont, QPalette
 from blocks import Task
 from dialogs import AddTaskDialog
 import calendar
 from collections import defaultdict
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 
 class VerticalHeaderDelegate(QStyledItemDelegate):
@@ -34,6 +35,131 @@ class VerticalHeaderDelegate(QStyledItemDelegate):
         painter.restore()
 
 
+class MonthModel(QAbstractTableModel):
+    """
+    6 weeks x (week label + 7 days) of month data for the calendar table
+    changing month swaps the data in place; no cells or widgets are rebuilt
+    """
+
+    DATE_ROLE = Qt.UserRole  # week start for column 0, the cell's date otherwise
+    TASKS_ROLE = Qt.UserRole + 1
+    IN_MONTH_ROLE = Qt.UserRole + 2
+    IS_TODAY_ROLE = Qt.UserRole + 3
+
+    HEADERS = ["", "mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+    IGNORE_TASKS = {"breakfast", "lunch", "dinner", "break"}
+    MAX_TASKS = 3
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.display_start = date.today()
+        self.month = self.display_start.month
+        self.top_tasks = {}  # date -> names of its longest tasks
+
+    def set_month(self, year: int, month: int, blocks) -> None:
+        """show `month`, taking each day's top tasks from `blocks`"""
+        month_start = date(year, month, 1)
+        self.display_start = month_start - timedelta(days=month_start.weekday())
+        self.month = month
+
+        tasks_by_day = defaultdict(list)
+        for block in blocks:
+            if block.name.strip().lower() not in self.IGNORE_TASKS:
+                tasks_by_day[block.start.date()].append(block)
+        self.top_tasks = {
+            day: [t.name for t in sorted(tasks, key=lambda t: t.duration, reverse=True)[:self.MAX_TASKS]]
+            for day, tasks in tasks_by_day.items()
+        }
+        self.dataChanged.emit(self.index(0, 0), self.index(5, 7))
+        self.headerDataChanged.emit(Qt.Vertical, 0, 5)
+
+    def cell_date(self, row: int, col: int) -> date:
+        return self.display_start + timedelta(days=row * 7 + col - 1)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 6
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 8
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return f"WC {(self.display_start + timedelta(days=section * 7)).strftime('%d/%m')}"
+
+    def flags(self, index) -> Qt.ItemFlags:
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            week_start = self.display_start + timedelta(days=row * 7)
+            if role == Qt.DisplayRole:
+                return f"WC {week_start.strftime('%d/%m')}"
+            if role == Qt.TextAlignmentRole:
+                return Qt.AlignCenter
+            if role == self.DATE_ROLE:
+                return week_start
+            return None
+
+        cell_date = self.cell_date(row, col)
+        if role == Qt.DisplayRole:
+            return str(cell_date.day)
+        if role == self.DATE_ROLE:
+            return cell_date
+        if role == self.TASKS_ROLE:
+            return self.top_tasks.get(cell_date, [])
+        if role == self.IN_MONTH_ROLE:
+            return cell_date.month == self.month
+        if role == self.IS_TODAY_ROLE:
+            return cell_date == date.today()
+        return None
+
+
+class MonthCellDelegate(QStyledItemDelegate):
+    """paints a day cell's number and top tasks directly, instead of a widget per cell"""
+
+    def paint(self, painter, option, index) -> None:
+        painter.save()
+        area = option.rect.adjusted(4, 4, -4, -4)
+
+        # --- day number ---
+        day_font = QFont(option.font)
+        if index.data(MonthModel.IN_MONTH_ROLE):
+            day_font.setBold(True)
+            painter.setPen(option.palette.color(QPalette.Text))
+        else:
+            painter.setPen(QColor("#AAA"))
+        painter.setFont(day_font)
+        line_height = painter.fontMetrics().height()
+        if index.data(MonthModel.IS_TODAY_ROLE):
+            # today gets its number on a highlight-coloured badge
+            text = index.data(Qt.DisplayRole)
+            badge = QRect(area.left() - 2, area.top(), painter.fontMetrics().width(text) + 4, line_height)
+            painter.fillRect(badge, option.palette.color(QPalette.Highlight))
+            painter.setPen(option.palette.color(QPalette.HighlightedText))
+        painter.drawText(area, Qt.AlignTop | Qt.AlignLeft, index.data(Qt.DisplayRole))
+
+        # --- tasks (filtered) ---
+        task_font = QFont(option.font)
+        task_font.setPixelSize(10)
+        painter.setFont(task_font)
+        painter.setPen(option.palette.color(QPalette.Text))
+        task_height = painter.fontMetrics().height() + 1
+        y = area.top() + line_height + 1
+        for name in index.data(MonthModel.TASKS_ROLE) or []:
+            if y + task_height > area.bottom():
+                break
+            elided = painter.fontMetrics().elidedText(name, Qt.ElideRight, area.width())
+            painter.drawText(QRect(area.left(), y, area.width(), task_height), Qt.AlignTop | Qt.AlignLeft, elided)
+            y += task_height
+        painter.restore()
+
+
 class MonthView(QWidget):
     """month view calendar showing tasks and week labels"""
     
@@ -42,6 +168,7 @@ class MonthView(QWidget):
     open_day = pyqtSignal(object)  # emits a date object
     back = pyqtSignal()
     open_week = pyqtSignal(object)  # emits week start date
+    open_agenda = pyqtSignal()
 
     def __init__(self, schedule, util) -> None:
         """initialize MonthView with calendar table and navigation"""
@@ -57,11 +184,12 @@ class MonthView(QWidget):
 
         # top bar (back, todo, settings)
         top_bar, buttons = self.util.create_top_bar(
-            show_back=True, show_todo=True, show_settings=True
+            show_back=True, show_todo=True, show_settings=True, show_agenda=True
         )
         buttons["back"].clicked.connect(self.back.emit)
         buttons["todo"].clicked.connect(self.open_todo.emit)
         buttons["settings"].clicked.connect(self.open_settings.emit)
+        buttons["agenda"].clicked.connect(self.open_agenda.emit)
         main_layout.addWidget(top_bar)
 
         # month navigation header
@@ -78,17 +206,18 @@ class MonthView(QWidget):
         self.next_btn.clicked.connect(lambda: self.change_month(1))
 
         # Calendar grid
-        self.calendar_table = QTableWidget(6, 8)
-        days = ["", "mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-        self.calendar_table.setHorizontalHeaderLabels(days)
+        self.month_model = MonthModel(self)
+        self.calendar_table = QTableView()
+        self.calendar_table.setModel(self.month_model)
         self.calendar_table.horizontalHeader().setVisible(True)
         self.calendar_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.calendar_table.verticalHeader().setVisible(False)
         self.calendar_table.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.calendar_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.calendar_table.setSelectionMode(QAbstractItemView.NoSelection)
-        self.calendar_table.cellClicked.connect(self.on_cell_clicked)
+        self.calendar_table.clicked.connect(lambda index: self.on_cell_clicked(index.row(), index.column()))
         self.calendar_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.calendar_table.setItemDelegate(MonthCellDelegate(self.calendar_table))
 
         delegate = VerticalHeaderDelegate(self.calendar_table)
         self.calendar_table.setItemDelegateForColumn(0, delegate)
@@ -100,83 +229,14 @@ class MonthView(QWidget):
         self.util.apply_theme()
 
     def refresh_month_view(self) -> None:
-        """populate the 6x7 calendar grid for the current month with tasks"""
+        """show the 6x7 calendar grid for the current month with its tasks"""
         self.month_label.setText(f"{calendar.month_name[self.current_month]} {self.current_year}")
 
-        # find monday of first week to display
+        # month() covers the first five displayed weeks, the grid shows six
         month_start = date(self.current_year, self.current_month, 1)
-        display_start = month_start
-        while display_start.weekday() != 0:
-            display_start -= timedelta(days=1)
-
-        # collect Tasks by day
-        month_blocks = self.schedule.month(month_start)
-        tasks_by_day = defaultdict(list)
-        for block in month_blocks:
-            tasks_by_day[block.start.date()].append(block)
-
-        # fill table
-
-        today = date.today()
-        IGNORE_TASKS = {"breakfast", "lunch", "dinner", "break"}
-
-        for week in range(6):
-            week_start = display_start + timedelta(days=week * 7)
-            wc_item = QTableWidgetItem(f"WC {week_start.strftime('%d/%m')}")
-            wc_item.setTextAlignment(Qt.AlignCenter)
-            wc_item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            wc_item.setData(Qt.UserRole, week_start)
-            self.calendar_table.setItem(week, 0, wc_item)
-
-
-            for day_col in range(1, 8):
-                cell_date = display_start + timedelta(days=week * 7 + day_col - 1)
-
-                is_current_month = (cell_date.month == self.current_month)
-                is_today = (cell_date == today)
-
-                cell_widget = QWidget()
-                cell_layout = QVBoxLayout(cell_widget)
-                cell_layout.setContentsMargins(4, 4, 4, 4)
-                cell_layout.setSpacing(1)
-
-
-                # --- day number ---
-                day_label = QLabel(str(cell_date.day))
-                day_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-
-                if is_current_month:
-                    day_label.setStyleSheet("font-weight: bold;")
-                else:
-                    day_label.setStyleSheet("color: #AAA;")
-
-                cell_layout.addWidget(day_label)
-
-                # --- tasks (filtered) ---
-                day_tasks = tasks_by_day.get(cell_date, [])
-                filtered_tasks = [
-                    t for t in day_tasks
-                    if t.name.strip().lower() not in IGNORE_TASKS
-                ]
-
-                filtered_tasks.sort(
-                    key=lambda t: t.duration.total_seconds(),
-                    reverse=True
-                )
-
-                for t in filtered_tasks[:3]:
-                    t_label = QLabel(t.name)
-                    t_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-                    t_label.setStyleSheet("font-size: 10px;")
-                    cell_layout.addWidget(t_label)
-
-                cell_layout.addStretch()
-
-                cell_widget.setProperty("date", cell_date)
-                cell_widget.setProperty("is_current_month", is_current_month)
-                self.calendar_table.setCellWidget(week, day_col, cell_widget)
-
-
+        display_start = month_start - timedelta(days=month_start.weekday())
+        blocks = self.schedule.between(display_start, display_start + timedelta(days=41))
+        self.month_model.set_month(self.current_year, self.current_month, blocks)
 
     def change_month(self, delta: int) -> None:
         """change the current month by delta (+1 or -1)"""
@@ -200,18 +260,144 @@ class MonthView(QWidget):
 
     def on_cell_clicked(self, row: int, col: int) -> None:
         """emit date for clicked cell: day or week start"""
+        selected = self.month_model.data(self.month_model.index(row, col), MonthModel.DATE_ROLE)
+        if selected is None:
+            return
         if col == 0:  # week start column
-            item = self.calendar_table.item(row, col)
-            if item:
-                week_start = item.data(Qt.UserRole)
-                if week_start:
-                    self.open_week.emit(week_start)
+            self.open_week.emit(selected)
         else:  # day cell
-            cell = self.calendar_table.cellWidget(row, col)
-            if cell:
-                day_date = cell.property("date")
-                if day_date:
-                    self.open_day.emit(day_date)
+            self.open_day.emit(selected)
+
+
+class ToDoModel(QAbstractTableModel):
+    """
+    the to-do list (or completed history) as a table: a checkable done column,
+    then name, deadline, duration and start time (completion time in history)
+    rows are updated one at a time as tasks change, the list is only rebuilt by set_tasks
+    """
+
+    toggled = pyqtSignal(object, bool)  # task, checked
+
+    SORT_ROLE = Qt.UserRole
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.tasks = []
+        self.rows = {}  # task id -> row, so a changed task is found without a scan
+        self.history = False
+
+    def set_tasks(self, tasks: list, history: bool) -> None:
+        """replace every row"""
+        self.beginResetModel()
+        self.tasks = list(tasks)
+        self.rows = {t.id: row for row, t in enumerate(self.tasks)}
+        self.history = history
+        self.endResetModel()
+
+    def headers(self) -> list:
+        return ["done", "name", "deadline", "duration", "date completed" if self.history else "start time"]
+
+    # incremental updates
+    def row_of(self, task) -> int:
+        row = self.rows.get(task.id, -1)
+        return row if row >= 0 and self.tasks[row] is task else -1
+
+    def add_task(self, task) -> None:
+        row = len(self.tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.tasks.append(task)
+        self.rows[task.id] = row
+        self.endInsertRows()
+
+    def remove_task(self, task) -> None:
+        row = self.row_of(task)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.tasks[row]
+            del self.rows[task.id]
+            for later in range(row, len(self.tasks)):
+                self.rows[self.tasks[later].id] = later
+            self.endRemoveRows()
+
+    def task_changed(self, task) -> None:
+        row = self.row_of(task)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    # model interface
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.tasks)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 5
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers()[section]
+        return None
+
+    def flags(self, index) -> Qt.ItemFlags:
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        t = self.tasks[index.row()]
+        col = index.column()
+
+        if col == 0:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if t.is_completed else Qt.Unchecked
+            if role == self.SORT_ROLE:
+                return int(t.is_completed)
+            return None
+
+        if role == Qt.DisplayRole:
+            if col == 1:
+                return t.name
+            if col == 2:
+                return t.deadline.strftime("%d/%m/%Y %H:%M") if t.deadline else "-"
+            if col == 3:
+                hours = t.duration.total_seconds() // 3600
+                minutes = (t.duration.total_seconds() % 3600) // 60
+                return f"{int(hours)}h {int(minutes)}m"
+            if self.history:
+                return t.completed_at.strftime("%d/%m/%Y %H:%M") if t.completed_at else "-"
+            return t.start.strftime("%d/%m/%Y %H:%M")
+
+        if role == self.SORT_ROLE:
+            if col == 1:
+                return t.name.lower()
+            if col == 2:
+                return t.deadline or datetime.max
+            if col == 3:
+                return t.duration
+            if self.history:
+                return t.completed_at or datetime.min
+            return t.start
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole) -> bool:
+        if index.column() != 0 or role != Qt.CheckStateRole:
+            return False
+        self.toggled.emit(self.tasks[index.row()], value == Qt.Checked)
+        return True
+
+
+class ToDoProxyModel(QSortFilterProxyModel):
+    """name search plus sorting on the model's raw values (dates, durations) rather than display text"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setFilterKeyColumn(1)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setSortRole(ToDoModel.SORT_ROLE)
+
+    def lessThan(self, left, right) -> bool:
+        return left.data(ToDoModel.SORT_ROLE) < right.data(ToDoModel.SORT_ROLE)
 
 
 class ToDoListView(QWidget):
@@ -242,12 +428,18 @@ class ToDoListView(QWidget):
         layout.addWidget(self.search_input)
 
         # table
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)  # placeholder
-        self.table.setHorizontalHeaderLabels(["name", "deadline", "duration"])
+        self.model = ToDoModel(self)
+        self.model.toggled.connect(self.on_task_toggled)
+        self.proxy = ToDoProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.verticalHeader().setVisible(False)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
+        self.table.setColumnWidth(0, 40)
         self.table.horizontalHeader().sectionClicked.connect(self.handle_header_click)
-        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicatorShown(True)
         layout.addWidget(self.table)
 
         # toggle history button
@@ -262,6 +454,7 @@ class ToDoListView(QWidget):
 
         self.util.apply_theme()
         self.refresh()
+        self.util.listen_while_alive(self, self.schedule, self._on_schedule_change)
 
     def toggle_view(self) -> None:
         """switch between showing active tasks and completed history"""
@@ -269,90 +462,58 @@ class ToDoListView(QWidget):
         self.toggle_btn.setText("show to-do" if self.show_history else "show history")
         self.refresh()
 
+    def belongs(self, task) -> bool:
+        """whether a task should be listed in the current mode"""
+        return task.is_completed if self.show_history else not task.is_completed
+
     def refresh(self) -> None:
-        """populate table with tasks, checkboxes, deadlines, durations, and start/completion times."""
+        """reload every row: open tasks, or completed tasks including archived ones"""
+        tasks = [t for t in self.schedule.ToDoList if self.belongs(t)]
         if self.show_history:
-            tasks = [t for t in self.schedule.ToDoList if t.is_completed]
-            self.table.setColumnCount(5)
-            self.table.setHorizontalHeaderLabels(["done", "name", "deadline", "duration", "date completed"])
-        else:
-            tasks = [t for t in self.schedule.ToDoList if not t.is_completed]
-            self.table.setColumnCount(5)
-            self.table.setHorizontalHeaderLabels(["done", "name", "deadline", "duration", "start time"])
-
-        # first column fixed width
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
-        self.table.setColumnWidth(0, 40)
-
-        # rest stretch
-        for col in range(1, self.table.columnCount()):
-            self.table.horizontalHeader().setSectionResizeMode(col, QHeaderView.Stretch)
-
-        self.table.setRowCount(len(tasks))
-
-        for row, t in enumerate(tasks):
-            # checkbox
-            cb = QCheckBox()
-            cb.setChecked(t.is_completed)
-            cb.stateChanged.connect(lambda state, task=t: self.on_checkbox_changed(state, task))
-            self.table.setCellWidget(row, 0, cb)
-
-            # Name
-            self.table.setItem(row, 1, QTableWidgetItem(t.name))
-
-            # deadline
-            deadline_text = t.deadline.strftime("%d/%m/%Y %H:%M") if t.deadline else "-"
-            self.table.setItem(row, 2, QTableWidgetItem(deadline_text))
-
-            # duration
-            hours = t.duration.total_seconds() // 3600
-            minutes = (t.duration.total_seconds() % 3600) // 60
-            self.table.setItem(row, 3, QTableWidgetItem(f"{int(hours)}h {int(minutes)}m"))
-
-            # start / completed
-            if self.show_history:
-                completed_str = t.completed_at.strftime("%d/%m/%Y %H:%M") if t.completed_at else "-"
-                self.table.setItem(row, 4, QTableWidgetItem(completed_str))
-            else:
-                start_str = t.start.strftime("%d/%m/%Y %H:%M")
-                self.table.setItem(row, 4, QTableWidgetItem(start_str))
-
-        self.util.apply_theme()
+            tasks += [t for t in self.schedule.archived() if t.type == "task" and t.is_completed]
+        self.model.set_tasks(tasks, self.show_history)
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        """keep rows in step with the schedule, touching only the tasks that changed"""
+        for b in blocks:
+            if b.type != "task":
+                continue
+            listed = self.model.row_of(b) >= 0
+            keep = op != "remove" and self.belongs(b)  # archived tasks are completed, so belongs() covers them
+            if listed and not keep:
+                self.model.remove_task(b)
+            elif listed:
+                self.model.task_changed(b)
+            elif keep:
+                self.model.add_task(b)
 
     def filter_tasks(self, text: str) -> None:
         """filter rows in table based on search input"""
-        text = text.lower()
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 1)  # name column
-            self.table.setRowHidden(row, text not in item.text().lower())
-
-    def on_checkbox_changed(self, state: int, task) -> None:
-        """handle checkbox state change for marking complete/incomplete"""
-        if state == Qt.Checked:
+        self.proxy.setFilterFixedString(text)
+
+    def on_task_toggled(self, task, checked: bool) -> None:
+        """handle the done checkbox for marking complete/incomplete"""
+        if checked:
             self.schedule.mark_complete(task)
         else:
             self.schedule.mark_incomplete(task)
-        self.refresh()
 
     def handle_header_click(self, col: int) -> None:
         """sort table column or restore original order on multiple clicks"""
         state = self.sort_state.get(col, 0)
+        header = self.table.horizontalHeader()
 
         if state == 0:
-            self.table.setSortingEnabled(True)
-            self.table.sortItems(col, Qt.AscendingOrder)
+            self.proxy.sort(col, Qt.AscendingOrder)
+            header.setSortIndicator(col, Qt.AscendingOrder)
             self.sort_state[col] = 1
         elif state == 1:
-            self.table.sortItems(col, Qt.DescendingOrder)
+            self.proxy.sort(col, Qt.DescendingOrder)
+            header.setSortIndicator(col, Qt.DescendingOrder)
             self.sort_state[col] = 2
         else:
-            self.table.setSortingEnabled(False)
-            header = self.table.horizontalHeader()
+            self.proxy.sort(-1)  # back to the model's own order
             header.setSortIndicator(-1, Qt.AscendingOrder)
-            header.setSortIndicatorShown(False)
-            self.refresh()
-            self.table.setSortingEnabled(True)
-            header.setSortIndicatorShown(True)
             self.sort_state[col] = 0
 
         # reset other columns
@@ -376,4 +537,3 @@ class ToDoListView(QWidget):
                 notes=data["notes"]
             )
             self.schedule.add_block(new_task)
-            self.refresh()
@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from cryptography.fernet import InvalidToken
+from persistence_manager import PersistenceManager
+
+
+class PartitionedPersistenceManager(PersistenceManager):
+    """
+    stores the schedule as one encrypted file per month plus a small encrypted
+    manifest, instead of a single data.json
+
+    startup only reads the months around today and any month holding open tasks
+    or repeatable events (the scheduler needs those); other months are read when
+    a view asks for them through load_period. saving rewrites only the months
+    whose contents changed, then the manifest
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.partition_dir = "partitions"
+
+        self._manifest: Optional[dict] = None  # None until loaded, or if there is none yet
+        self._loaded = set()                   # month keys whose blocks are all in memory
+        self._all_loaded = False               # e.g. after reading a legacy data.json
+        self._digests = {}                     # month key -> digest of what is on disk
+        self._partition_lock = threading.Lock()  # saves run on the autosave worker
+
+    # paths and keys
+    @property
+    def manifest_file(self) -> str:
+        return os.path.join(self.partition_dir, "manifest.json")
+
+    def _partition_file(self, key: str) -> str:
+        return os.path.join(self.partition_dir, f"{key}.part")
+
+    @staticmethod
+    def _partition_key(iso_start: str) -> str:
+        """month a block is stored under, e.g. '2026-01' (the start of its ISO string)"""
+        return iso_start[:7]
+
+    @staticmethod
+    def _digest(blocks: List[dict]) -> str:
+        return hashlib.sha256(json.dumps(blocks, sort_keys=True).encode("utf-8")).hexdigest()
+
+    # reading
+    def _load_manifest(self) -> Optional[dict]:
+        try:
+            with open(self.manifest_file, "rb") as f:
+                return self._decrypt(f.read())
+        except (FileNotFoundError, InvalidToken):
+            return None
+
+    def _read_partition(self, key: str) -> List[dict]:
+        """decrypt one month, remembering its digest; empty if missing or unreadable"""
+        blocks = self._peek_partition(key)
+        self._digests[key] = self._digest(blocks)
+        return blocks
+
+    def _peek_partition(self, key: str) -> List[dict]:
+        """decrypt one month without recording anything about it"""
+        try:
+            with open(self._partition_file(key), "rb") as f:
+                return self._decrypt(f.read()).get("blocks", [])
+        except (FileNotFoundError, InvalidToken):
+            return []
+
+    def load_data(self) -> Dict[str, Any]:
+        """
+        load the startup working set: the previous month onwards, plus any month
+        with open tasks or repeatable events
+        falls back to a legacy data.json (loaded whole) if no manifest exists yet
+        """
+        with self._partition_lock:
+            self._manifest = self._load_manifest()
+            self._loaded.clear()
+            self._digests.clear()
+
+            if self._manifest is None:
+                self._all_loaded = True
+                return super().load_data()
+
+            self._all_loaded = False
+            previous_month = date.today().replace(day=1) - timedelta(days=1)
+            first_key = f"{previous_month.year:04d}-{previous_month.month:02d}"
+
+            blocks = []
+            for key, info in sorted(self._manifest["partitions"].items()):
+                if key >= first_key or info.get("open_tasks") or info.get("repeatable"):
+                    blocks.extend(self._read_partition(key))
+                    self._loaded.add(key)
+
+            return {
+                "schedule": {"name": "Schedule", "blocks": blocks},
+                "journal_seq": self._manifest.get("journal_seq", 0)
+            }
+
+    def load_period(self, start: date, end: date) -> List[dict]:
+        """
+        block dictionaries for stored months between start and end that are not
+        in memory yet; used as Schedule.period_loader
+        """
+        if self._all_loaded or self._manifest is None:
+            return []
+
+        with self._partition_lock:
+            blocks = []
+            for key in self._month_keys(start, end):
+                if key in self._loaded or key not in self._manifest["partitions"]:
+                    continue
+                blocks.extend(self._read_partition(key))
+                self._loaded.add(key)
+            return blocks
+
+    def _load_everything(self) -> List[dict]:
+        """read every month not in memory yet"""
+        with self._partition_lock:
+            blocks = []
+            if self._manifest is not None:
+                for key in sorted(self._manifest["partitions"]):
+                    if key not in self._loaded:
+                        blocks.extend(self._read_partition(key))
+                        self._loaded.add(key)
+            self._all_loaded = True
+            return blocks
+
+    def read_period(self, start: date, end: date) -> List[dict]:
+        """
+        like load_period, but the months read are not marked as in memory:
+        for walks through the schedule that should not keep what they pass
+        """
+        blocks = []
+        if not self._all_loaded and self._manifest is not None:
+            first, last = start.isoformat(), end.isoformat()
+            with self._partition_lock:
+                for key in self._month_keys(start, end):
+                    if key in self._loaded or key not in self._manifest["partitions"]:
+                        continue
+                    blocks.extend(
+                        bd for bd in self._peek_partition(key)
+                        if first <= (bd.get("start") or "")[:10] <= last
+                    )
+        return blocks + super().read_period(start, end)
+
+    def stored_bounds(self) -> Optional[tuple]:
+        """(first, last) dates covered by stored months that are not in memory, or by the archive"""
+        months = []
+        if not self._all_loaded and self._manifest is not None:
+            months = [key for key in self._manifest["partitions"] if key not in self._loaded]
+        archive = super().stored_bounds()
+        bounds = self._month_bounds(months)
+        if archive is None or bounds is None:
+            return archive or bounds
+        return min(archive[0], bounds[0]), max(archive[1], bounds[1])
+
+    def iter_unloaded(self) -> Iterator[List[dict]]:
+        """months that are not in memory, a month at a time, then the archive"""
+        if not self._all_loaded and self._manifest is not None:
+            for key in sorted(self._manifest["partitions"]):
+                if key not in self._loaded:
+                    yield self._peek_partition(key)
+        yield from super().iter_unloaded()
+
+    def replay_journal(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        a non-empty journal means the last session did not shut down cleanly and
+        its entries may touch any month, so everything is read before replaying
+        """
+        has_entries = os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0
+        if has_entries and not self._all_loaded:
+            schedule_data = dict(data.get("schedule", {"name": "Schedule"}))
+            schedule_data["blocks"] = schedule_data.get("blocks", []) + self._load_everything()
+            data = {**data, "schedule": schedule_data}
+        return super().replay_journal(data)
+
+    # writing
+    def _snapshot_data(self, schedule) -> dict:
+        """
+        a block placed in a stored month that was never read would make that
+        month be rewritten without its other blocks, so such months are read in first
+        """
+        if not self._all_loaded and self._manifest is not None:
+            stored_keys = self._manifest["partitions"]
+            missing = {
+                self._partition_key(b.start.isoformat()) for b in schedule.blocks
+                if b.start is not None
+            }
+            missing = {key for key in missing if key in stored_keys and key not in self._loaded}
+            for key in sorted(missing):
+                bounds = date.fromisoformat(f"{key}-01")
+                schedule.add_stored(self.load_period(bounds, bounds))
+
+        return super()._snapshot_data(schedule)
+
+    def _write_data(self, data_to_save: dict) -> None:
+        """write the months whose blocks changed, then the manifest"""
+        groups = {}
+        for bd in data_to_save["schedule"].get("blocks", []):
+            groups.setdefault(self._partition_key(bd["start"]), []).append(bd)
+
+        with self._partition_lock:
+            os.makedirs(self.partition_dir, exist_ok=True)
+            old_manifest = self._manifest or {"partitions": {}, "journal_seq": 0}
+            partitions = dict(old_manifest["partitions"])
+            owned = set(partitions) if self._all_loaded else self._loaded
+            changed = False
+
+            for key in sorted(set(groups) | owned):
+                blocks = sorted(groups.get(key, []), key=lambda bd: (bd["start"], bd.get("id") or ""))
+                digest = self._digest(blocks)
+                if self._digests.get(key) == digest and (key in partitions) == bool(blocks):
+                    continue
+
+                changed = True
+                if blocks:
+                    self._atomic_write(self._partition_file(key), self._encrypt_data({"blocks": blocks}))
+                    partitions[key] = {
+                        "blocks": len(blocks),
+                        "open_tasks": any(bd["type"] == "task" and not bd.get("is_completed") for bd in blocks),
+                        "repeatable": any(bd.get("repeatable") for bd in blocks)
+                    }
+                else:
+                    if os.path.exists(self._partition_file(key)):
+                        os.remove(self._partition_file(key))
+                    partitions.pop(key, None)
+                self._digests[key] = digest
+                self._loaded.add(key)
+
+            seq = data_to_save.get("journal_seq", 0)
+            if not changed and self._manifest is not None and old_manifest.get("journal_seq") == seq:
+                return
+
+            # the manifest is written last, so a crash part way through still
+            # describes complete partition files
+            self._manifest = {"version": 1, "partitions": partitions, "journal_seq": seq}
+            self._atomic_write(self.manifest_file, self._encrypt(self._manifest))
+            if self._all_loaded:
+                self._loaded = set(partitions)
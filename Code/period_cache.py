@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class PeriodCache:
+    """
+    small LRU of what a view built for a period (a day, a week)
+
+    each entry is stored with the key it was built at, made from the period and
+    the schedule's day revisions, so an entry the schedule has since changed no
+    longer matches and is dropped the next time it is asked for
+    """
+
+    def __init__(self, capacity: int = 5) -> None:
+        self.capacity = capacity
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, period: Hashable, key: Hashable) -> Optional[Any]:
+        """the value cached for period if it was built at key, else None"""
+        entry = self.entries.get(period)
+        if entry is None:
+            return None
+        if entry[0] != key:
+            del self.entries[period]  # the schedule changed since
+            return None
+        self.entries.move_to_end(period)
+        return entry[1]
+
+    def put(self, period: Hashable, key: Hashable, value: Any) -> None:
+        self.entries[period] = (key, value)
+        self.entries.move_to_end(period)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
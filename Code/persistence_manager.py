@@ -1,7 +1,11 @@
 import json
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Dict, Any
 from cryptography.fernet import Fernet, InvalidToken
 import os
+import threading
+import codec
 
 class PersistenceManager:
     """
@@ -13,8 +17,42 @@ class PersistenceManager:
         self.data_file = "data.json"
         self.settings_file = "settings.json"
         self.custom_blocks_file = "custom_blocks.json"
+        self.archive_file = "archive.jsonl"
+        self.journal_file = "data.journal"
         self.key_file = "secret.key"
 
+        # write-ahead journal state: sequence number of the last entry written,
+        # and how many entries to allow before folding them into a fresh snapshot
+        self.journal_seq = 0
+        self.journal_entries = 0
+        self.journal_limit = 500
+        self._journaled_schedule = None
+        self._needs_compaction = False
+        self._journal_lock = threading.Lock()  # autosave may compact from a worker thread
+        # changes are queued on the GUI thread and appended by one writer thread,
+        # which folds everything queued since its last write into a single record
+        self._journal_queue = []
+        self._journal_queue_lock = threading.Lock()
+        self._journal_writer = None
+        self._write_lock = threading.Lock()
+        self._committed_seq = -1
+
+        # archive batches taken from the schedule but not yet appended to disk
+        self._archive_queue = []
+        self._archive_lock = threading.Lock()
+
+        # month key -> offsets of the archive lines holding blocks from that month,
+        # built incrementally up to _archive_indexed bytes, see read_period
+        self._archive_index = {}
+        self._archive_indexed = 0
+
+        # component -> (id of the object, its revision) as last written,
+        # so save_all can skip anything that has not changed since
+        self._saved_revisions = {}
+
+        # format for schedule data; anything already on disk is detected on load
+        self.codec = codec.JSONCodec()
+
         self.fernet = Fernet(self._load_or_create_key())
 
     # encryption helpers
@@ -32,9 +70,27 @@ class PersistenceManager:
         json_bytes = json.dumps(data).encode("utf-8")
         return self.fernet.encrypt(json_bytes)
 
+    def _encrypt_data(self, data: dict) -> bytes:
+        """encrypt schedule data (anything holding a block list) using self.codec"""
+        return self.fernet.encrypt(self.codec.encode(data))
+
     def _decrypt(self, encrypted_data: bytes) -> dict:
         decrypted_bytes = self.fernet.decrypt(encrypted_data)
-        return json.loads(decrypted_bytes.decode("utf-8"))
+        return codec.decode(decrypted_bytes)
+
+    # file helpers
+    @staticmethod
+    def _atomic_write(path, data: bytes) -> None:
+        """
+        write to a temporary file next to path, fsync it and rename it into place,
+        so a crash mid-write leaves either the old or the new file, never half of one
+        """
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
 
     # custom Block templates 
     def load_custom_blocks(self) -> list:
@@ -58,11 +114,13 @@ class PersistenceManager:
         if custom_blocks is None:
             return
 
-        data_to_save = {"Templates": custom_blocks.to_dict()}
-        encrypted = self._encrypt(data_to_save)
+        revision = self._revision(custom_blocks)
+        self._write_custom_blocks({"Templates": custom_blocks.to_dict()})
+        self._saved_revisions["custom_blocks"] = revision
 
-        with open(self.custom_blocks_file, "wb") as f:
-            f.write(encrypted)
+    def _write_custom_blocks(self, data_to_save: dict) -> None:
+        """encrypt and write prepared template data"""
+        self._atomic_write(self.custom_blocks_file, self._encrypt(data_to_save))
 
 
     # settings 
@@ -73,9 +131,13 @@ class PersistenceManager:
         """
         if settings is None:
             return
-        data_to_save = {'settings': settings.to_dict()}
-        with open(self.settings_file, 'w') as f:
-            json.dump(data_to_save, f, indent=4)
+        revision = self._revision(settings)
+        self._write_settings({'settings': settings.to_dict()})
+        self._saved_revisions["settings"] = revision
+
+    def _write_settings(self, data_to_save: dict) -> None:
+        """write prepared settings data"""
+        self._atomic_write(self.settings_file, json.dumps(data_to_save, indent=4).encode("utf-8"))
 
     def load_settings(self) -> Dict[str, Any]:
         """
@@ -99,11 +161,35 @@ class PersistenceManager:
         if schedule is None:
             return
 
-        data_to_save = {"schedule": schedule.to_dict()}
-        encrypted = self._encrypt(data_to_save)
+        revision = self._revision(schedule)
+        self._commit_data(self._snapshot_data(schedule))
+        self._saved_revisions["data"] = revision
 
-        with open(self.data_file, "wb") as f:
-            f.write(encrypted)
+    def _snapshot_data(self, schedule) -> dict:
+        """capture the schedule as data to save (must run where the schedule is edited)"""
+        # aged blocks are queued for the archive before they disappear from the snapshot;
+        # whoever commits the snapshot writes the queue first
+        self._queue_archive(schedule)
+        return {"schedule": schedule.to_dict(), "journal_seq": self.journal_seq}
+
+    def _commit_data(self, data_to_save: dict) -> None:
+        """
+        write a snapshot, then drop the journal entries it covers
+        a snapshot older than one already written (e.g. a background save
+        finishing after a compaction) is skipped so the file never goes backwards
+        """
+        seq = data_to_save.get("journal_seq", 0)
+        self._write_archive()
+        with self._write_lock:
+            if seq < self._committed_seq:
+                return
+            self._write_data(data_to_save)
+            self._committed_seq = seq
+            self._truncate_journal(seq)
+
+    def _write_data(self, data_to_save: dict) -> None:
+        """encrypt and write prepared schedule data"""
+        self._atomic_write(self.data_file, self._encrypt_data(data_to_save))
 
     def load_data(self) -> Dict[str, Any]:
         try:
@@ -112,12 +198,370 @@ class PersistenceManager:
                 return self._decrypt(encrypted)
         except (FileNotFoundError, InvalidToken):
             return {}
+
+    # write-ahead journal
+    def attach_journal(self, schedule) -> None:
+        """
+        journal every change the schedule reports from now on
+        if the loaded data needed replaying (or predates block ids) it is
+        folded into a fresh snapshot first
+        """
+        self._journaled_schedule = schedule
+        if self._needs_compaction:
+            self.compact_journal(schedule)
+        schedule.add_listener(self._on_schedule_change)
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        """schedule listener: journal the change, compacting once the journal is long"""
+        self.append_journal(op, blocks)
+        if self.journal_entries >= self.journal_limit:
+            self.compact_journal(self._journaled_schedule)
+
+    def append_journal(self, op: str, blocks: list) -> None:
+        """
+        queue a journal record describing a change to some blocks
+        moves only record the new placement, other changes record the whole block
+        archived blocks are not journalled, they stay in the snapshot until it is rewritten
+        the encrypted line is appended and fsynced on the writer thread, see flush_journal
+        """
+        if op == "archive":
+            return
+
+        ops = []
+        for b in blocks:
+            if op == "remove":
+                ops.append({"op": "remove", "id": b.id})
+            elif op == "move":
+                ops.append({
+                    "op": "move",
+                    "id": b.id,
+                    "start": b.start.isoformat(),
+                    "duration": b.duration.total_seconds() // 60
+                })
+            else:
+                ops.append({"op": "put", "block": self._journaled_schedule.block_to_dict(b)})
+
+        with self._journal_queue_lock:
+            self.journal_seq += 1
+            self._journal_queue.extend(ops)
+            if self._journal_writer is None:
+                self._journal_writer = ThreadPoolExecutor(max_workers=1)
+            self._journal_writer.submit(self._write_journal)
+
+    def _write_journal(self) -> None:
+        """append everything queued so far as one line (writer thread)"""
+        with self._journal_lock:
+            with self._journal_queue_lock:
+                ops, self._journal_queue = self._journal_queue, []
+                seq = self.journal_seq
+            if not ops:
+                return  # an earlier write already took it
+
+            # a record can repeat changes a snapshot already holds; replaying
+            # them is harmless since every op sets a block's state outright
+            with open(self.journal_file, "ab") as f:
+                f.write(self._encrypt({"seq": seq, "ops": ops}) + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_entries += 1
+
+    def flush_journal(self) -> None:
+        """wait until every queued journal record is on disk"""
+        if self._journal_writer is not None:
+            self._journal_writer.submit(self._write_journal).result()
+
+    def replay_journal(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        apply journal entries newer than the snapshot to loaded schedule data
+        returns the updated data (same shape as load_data)
+        a torn final line from a crash is ignored
+        """
+        self.flush_journal()
+        snapshot_seq = data.get("journal_seq", 0)
+        blocks = {}
+        for bd in data.get("schedule", {}).get("blocks", []):
+            if not bd.get("id"):
+                self._needs_compaction = True
+            blocks[bd.get("id") or id(bd)] = bd
+
+        self.journal_seq = snapshot_seq
+        self.journal_entries = 0
+        try:
+            with open(self.journal_file, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = self._decrypt(line)
+                    except InvalidToken:
+                        continue
+                    self.journal_entries += 1
+                    self._needs_compaction = True
+                    if entry["seq"] <= snapshot_seq:
+                        continue
+                    for change in entry["ops"]:
+                        if change["op"] == "put":
+                            blocks[change["block"]["id"]] = change["block"]
+                        elif change["op"] == "remove":
+                            blocks.pop(change["id"], None)
+                        elif change["op"] == "move" and change["id"] in blocks:
+                            blocks[change["id"]] = {
+                                **blocks[change["id"]],
+                                "start": change["start"],
+                                "duration": change["duration"]
+                            }
+                    self.journal_seq = max(self.journal_seq, entry["seq"])
+        except FileNotFoundError:
+            pass
+
+        schedule_data = dict(data.get("schedule", {}))
+        schedule_data["blocks"] = list(blocks.values())
+        return {**data, "schedule": schedule_data, "journal_seq": self.journal_seq}
+
+    def compact_journal(self, schedule) -> None:
+        """fold the journal into a fresh snapshot (save_data truncates the journal)"""
+        self.flush_journal()
+        self.save_data(schedule)
+        self._needs_compaction = False
+
+    def _truncate_journal(self, upto_seq: Optional[int] = None) -> None:
+        """
+        drop journal entries a snapshot covers (all of them if upto_seq is None)
+        entries written after the snapshot was taken are kept
+        """
+        with self._journal_lock:
+            if not os.path.exists(self.journal_file):
+                self.journal_entries = 0
+                return
+
+            if upto_seq is None or upto_seq >= self.journal_seq:
+                with open(self.journal_file, "wb"):
+                    pass
+                self.journal_entries = 0
+                return
+
+            kept = []
+            with open(self.journal_file, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    try:
+                        if line and self._decrypt(line)["seq"] > upto_seq:
+                            kept.append(line)
+                    except InvalidToken:
+                        continue
+            self._atomic_write(self.journal_file, b"".join(line + b"\n" for line in kept))
+            self.journal_entries = len(kept)
+
+    # history archive
+    def save_archive(self, schedule) -> None:
+        """
+        append the schedule's pending archived blocks to the archive file
+        as one encrypted line, never rewriting what is already there
+        """
+        self._queue_archive(schedule)
+        self._write_archive()
+
+    def _queue_archive(self, schedule) -> None:
+        """move the schedule's pending archived blocks into the write queue (GUI thread)"""
+        pending = getattr(schedule, "pending_archive", None)
+        if not pending:
+            return
+        batch = {"blocks": [schedule.block_to_dict(b) for b in pending]}
+        pending.clear()
+        with self._archive_lock:
+            self._archive_queue.append(batch)
+
+    def _write_archive(self) -> None:
+        """
+        append queued batches to the archive file, safe to call from a worker thread
+        batches stay queued if the write fails, so the next save retries them
+        """
+        with self._archive_lock:
+            if not self._archive_queue:
+                return
+            lines = b"".join(self._encrypt_data(batch) + b"\n" for batch in self._archive_queue)
+            with open(self.archive_file, "ab") as f:
+                f.write(lines)
+            self._archive_queue.clear()
+
+    def load_archive(self) -> List[Dict[str, Any]]:
+        """
+        load and decrypt every batch in the archive file
+        returns a list of block dictionaries, empty if file missing
+        unreadable lines (e.g. a torn final write) are skipped
+        blocks are deduplicated by id; legacy rows without one fall back to (type, name, start)
+        """
+        blocks = []
+        seen = set()
+        for batch in self._archive_batches():
+            for bd in batch:
+                key = bd.get("id") or (bd.get("type"), bd.get("name"), bd.get("start"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                blocks.append(bd)
+        return blocks
+
+    def _archive_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """the block dictionaries of each readable archive line, in the order they were written"""
+        try:
+            with open(self.archive_file, "rb") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield self._decrypt(line).get("blocks", [])
+                    except InvalidToken:
+                        continue
+        except FileNotFoundError:
+            return
+
+    @staticmethod
+    def _month_keys(start: date, end: date) -> List[str]:
+        """every month key from start to end inclusive"""
+        keys = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            keys.append(f"{year:04d}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return keys
+
+    def read_period(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """
+        stored block dictionaries starting between start and end (inclusive) that
+        load_data left on disk, read without being kept; used as Schedule.range_reader
+        for this manager that is the archive, read through a month index so only
+        lines holding blocks from those months are decrypted
+        """
+        first, last = start.isoformat(), end.isoformat()
+        blocks = []
+        seen = set()
+        with self._archive_lock:
+            self._index_archive()
+            offsets = set()
+            for key in self._month_keys(start, end):
+                offsets.update(self._archive_index.get(key, ()))
+            if not offsets:
+                return []
+            with open(self.archive_file, "rb") as f:
+                for offset in sorted(offsets):
+                    f.seek(offset)
+                    try:
+                        batch = self._decrypt(f.readline().strip())
+                    except InvalidToken:
+                        continue
+                    for bd in batch.get("blocks", []):
+                        if first <= (bd.get("start") or "")[:10] <= last and bd.get("id") not in seen:
+                            seen.add(bd.get("id"))
+                            blocks.append(bd)
+        return blocks
+
+    def stored_bounds(self) -> Optional[tuple]:
+        """(first, last) dates that read_period could return blocks for, None if nothing is stored"""
+        with self._archive_lock:
+            self._index_archive()
+            months = [key for key in self._archive_index if key]
+        return self._month_bounds(months)
+
+    @staticmethod
+    def _month_bounds(months: List[str]) -> Optional[tuple]:
+        """first day of the earliest and last day of the latest month key"""
+        if not months:
+            return None
+        first = date.fromisoformat(f"{min(months)}-01")
+        last = date.fromisoformat(f"{max(months)}-01")
+        last = (last.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        return first, last
+
+    def _index_archive(self) -> None:
+        """index archive lines appended since the last call (callers hold _archive_lock)"""
+        try:
+            size = os.path.getsize(self.archive_file)
+        except OSError:
+            size = 0
+        if size < self._archive_indexed:  # replaced by a shorter file
+            self._archive_index, self._archive_indexed = {}, 0
+        if size == self._archive_indexed:
+            return
+
+        offset = self._archive_indexed
+        with open(self.archive_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    batch = self._decrypt(line.strip()) if line.strip() else {}
+                except InvalidToken:
+                    batch = {}
+                for bd in batch.get("blocks", []):
+                    self._archive_index.setdefault((bd.get("start") or "")[:7], set()).add(offset)
+                offset += len(line)
+        self._archive_indexed = offset
+
+    def iter_unloaded(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        batches of every stored block dictionary that load_data left on disk,
+        read one batch at a time and not kept; for this manager, the archive
+        """
+        yield from self._archive_batches()
  
+    # revisions
+    @staticmethod
+    def _revision(obj) -> tuple:
+        """identity and revision counter of a saved object (None if it has no counter)"""
+        return (id(obj), getattr(obj, "revision", None))
+
+    def _is_clean(self, component: str, obj) -> bool:
+        """true if obj is unchanged since it was last written as component"""
+        revision = self._revision(obj)
+        return revision[1] is not None and self._saved_revisions.get(component) == revision
+
+    def mark_saved(self, schedule=None, settings=None, custom_blocks=None) -> None:
+        """record objects just loaded from disk as matching what is stored"""
+        for component, obj in (("data", schedule), ("settings", settings), ("custom_blocks", custom_blocks)):
+            if obj is not None:
+                self._saved_revisions[component] = self._revision(obj)
+
     # Convenience Method 
     def save_all(self, schedule, settings, custom_blocks) -> None:
         """
         save schedule, settings, and custom blocks all at once
+        components unchanged since they were last saved are skipped
         """
-        self.save_custom_blocks(custom_blocks)
-        self.save_data(schedule)
-        self.save_settings(settings)
+        self.write_snapshot(self.snapshot_all(schedule, settings, custom_blocks))
+
+    def snapshot_all(self, schedule, settings, custom_blocks) -> dict:
+        """
+        capture everything save_all would write as plain data, None for clean parts
+        cheap, and must run on the thread that edits the objects (the GUI thread)
+        """
+        def dirty(component, obj):
+            return obj is not None and not self._is_clean(component, obj)
+
+        return {
+            "custom_blocks": {"Templates": custom_blocks.to_dict()} if dirty("custom_blocks", custom_blocks) else None,
+            "data": self._snapshot_data(schedule) if dirty("data", schedule) else None,
+            "settings": {'settings': settings.to_dict()} if dirty("settings", settings) else None,
+            "revisions": {
+                "custom_blocks": self._revision(custom_blocks),
+                "data": self._revision(schedule),
+                "settings": self._revision(settings)
+            }
+        }
+
+    def write_snapshot(self, snapshot: dict) -> None:
+        """
+        encrypt and atomically write a snapshot_all() result
+        safe to call from a worker thread
+        """
+        revisions = snapshot.get("revisions", {})
+        if snapshot["custom_blocks"] is not None:
+            self._write_custom_blocks(snapshot["custom_blocks"])
+            self._saved_revisions["custom_blocks"] = revisions.get("custom_blocks")
+        if snapshot["data"] is not None:
+            self._commit_data(snapshot["data"])
+            self._saved_revisions["data"] = revisions.get("data")
+        if snapshot["settings"] is not None:
+            self._write_settings(snapshot["settings"])
+            self._saved_revisions["settings"] = revisions.get("settings")
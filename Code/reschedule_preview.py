@@ -0,0 +1,142 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import List, Optional
+from PyQt5.QtCore import QObject, pyqtSignal
+from schedule import Schedule, ScheduleInfeasibleError
+
+
+class PreviewResult:
+    """what dropping the dragged block at `start` would do to the rest of the schedule"""
+
+    def __init__(self, block_id: str, start: datetime, displaced: List, infeasible: Optional[str] = None) -> None:
+        self.block_id = block_id
+        self.start = start
+        self.displaced = displaced  # copies of the blocks that would move, at their new times
+        self.infeasible = infeasible  # the scheduler's message if the drop cannot be scheduled
+
+
+def speculate(settings, stored: List[dict], block_id: str, start: datetime,
+              pointer: Optional[datetime] = None) -> PreviewResult:
+    """
+    run the scheduler on a throwaway schedule built from `stored` with one block
+    moved to `start`, the same way a drop would. nothing is shared with the real
+    schedule as long as `settings` is a snapshot too (see snapshot_settings), so
+    this is safe to call off the GUI thread
+    """
+    shadow = Schedule(settings)
+    shadow.from_dict({"blocks": stored})
+    placed = {b.id: (b.start, b.duration) for b in shadow.blocks}
+    moved = next((b for b in shadow.blocks if b.id == block_id), None)
+    if moved is None:
+        return PreviewResult(block_id, start, [])
+
+    moved.start = start
+    try:
+        shadow.global_edf_scheduler(pointer=pointer, ignore_blocks=[moved])
+    except ScheduleInfeasibleError as e:
+        return PreviewResult(block_id, start, [], infeasible=str(e))
+
+    displaced = [
+        b for b in shadow.blocks
+        if b is not moved and b.id in placed and (b.start, b.duration) != placed[b.id]
+    ]
+    return PreviewResult(block_id, start, displaced)
+
+
+def snapshot_settings(settings):
+    """
+    a private copy of `settings` for the worker: the live object's day-bounds
+    cache is filled and evicted by GUI paints, and its listeners are widgets
+    """
+    if not hasattr(settings, "to_dict"):
+        return copy.deepcopy(settings)
+    snapshot = type(settings)()
+    snapshot.from_dict(settings.to_dict())
+    return snapshot
+
+
+class ReschedulePreview(QObject):
+    """
+    works out what a drag would do to the schedule while it is still a drag
+
+    begin() snapshots the schedule and its settings once per drag; each request() for a new drop
+    target runs speculate() on a single worker thread. a newer request cancels
+    the one still queued, a job that is overtaken before it starts returns
+    straight away, and results for anything but the latest request are dropped,
+    so `ready` only ever reports the current target (on the GUI thread)
+    """
+
+    ready = pyqtSignal(object)
+    _finished = pyqtSignal(int, object)
+
+    def __init__(self, schedule, parent=None) -> None:
+        super().__init__(parent)
+        self.schedule = schedule
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.generation = 0  # bumped by every request and cancel
+        self.pending = None  # future of the latest request
+        self.stored = None  # blocks as dictionaries, taken when the drag began
+        self.settings = None  # copy of the settings, taken when the drag began
+        self.block_id = None
+        self.result: Optional[PreviewResult] = None
+
+        self._finished.connect(self._on_finished)
+
+    def begin(self, block) -> None:
+        """start previewing drags of `block`"""
+        self.cancel()
+        self.stored = self.schedule.to_dict()["blocks"]
+        self.settings = snapshot_settings(self.schedule.settings)
+        self.block_id = block.id
+
+    def request(self, start: datetime) -> None:
+        """preview dropping the block at `start`, superseding any earlier request"""
+        if self.stored is None:
+            return
+        self.generation += 1
+        if self.pending is not None:
+            self.pending.cancel()  # only succeeds if it has not started yet
+        self.pending = self.executor.submit(
+            self._run, self.generation, self.settings, self.stored, self.block_id, start
+        )
+        self.pending.add_done_callback(partial(self._job_done, self.generation))
+
+    def cancel(self) -> None:
+        """stop previewing; anything still running is ignored when it finishes"""
+        self.generation += 1
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        self.stored = None
+        self.settings = None
+        self.block_id = None
+        self.result = None
+
+    def stop(self) -> None:
+        """cancel and let the worker thread exit; called when the owning view goes away"""
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    # worker thread
+    def _run(self, generation: int, settings, stored: List[dict], block_id: str, start: datetime):
+        if generation != self.generation:
+            return None  # overtaken while queued
+        return speculate(settings, stored, block_id, start)
+
+    def _job_done(self, generation: int, future) -> None:
+        """the signal is queued back to the GUI thread"""
+        if future.cancelled() or generation != self.generation:
+            return  # cancelled, overtaken or stopped, possibly with the owner already gone
+        # a job that raised reports as None: the stale ghosts are cleared and nothing is shown
+        result = None if future.exception() is not None else future.result()
+        self._finished.emit(generation, result)
+
+    # GUI thread
+    def _on_finished(self, generation: int, result: Optional[PreviewResult]) -> None:
+        if generation != self.generation:
+            return  # a newer request or a cancel came in while this one ran
+        self.result = result
+        if result is not None:
+            self.ready.emit(result)
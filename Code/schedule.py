@@ -1,6 +1,8 @@
+from bisect import bisect_left
 from datetime import datetime, timedelta, date, time
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Union
 from blocks import Task, EventBlock
+from optimizer import ScheduleOptimizer
 from PyQt5.QtGui import QColor
 
 class ScheduleInfeasibleError(Exception):
@@ -19,88 +21,162 @@ class Schedule:
     schedule data
     """
 
+    # generated meal/break blocks, never persisted
+    SPECIAL_NAMES = {"breakfast", "lunch", "dinner", "break"}
+
     def __init__(self, settings):
         self.date = datetime.now().date()
         self.blocks = []
         self.settings = settings
 
+        # history archive: aged blocks waiting to be appended to the archive file,
+        # and the archive itself which is only read when something asks for it
+        self.pending_archive = []
+        self.archive_loader = None
+        self._archived = None
+
+        # optional lazy loading of stored blocks: called with (start, end) dates by
+        # day/week/month, returns block dictionaries in that range not loaded yet
+        self.period_loader = None
+
+        # optional read-only access to stored blocks for iter_range: called with
+        # (start, end) dates, returns block dictionaries in that range still on
+        # disk (unloaded months, the archive); nothing it returns is kept.
+        # range_bounds returns the (first, last) dates it could cover, or None
+        self.range_reader = None
+        self.range_bounds = None
+
+        # callbacks told about every change to the persisted blocks, as (op, blocks)
+        # ops are "add", "remove", "update" (any field), "move" (start/duration only)
+        # and "archive" (aged out by clear_history)
+        self._listeners = []
+
+        # bumped by every change listeners are told about; persistence compares
+        # it with the revision it last saved to skip writing a clean schedule
+        self.revision = 0
+
+        # bumped by any change to the block list, including generated meals and
+        # breaks; day_revision() uses it to work out which dates actually changed
+        self.layout_revision = 0
+        self._day_signatures = {}  # date -> what was on it when last indexed
+        self._day_revisions = {}   # date -> bumped whenever its signature changes
+        self._indexed_at = None
+
+        # every block in memory in (start, id) order, and their ids, for iter_range()
+        self._range_keys = []
+        self._range_blocks = []
+        self._range_ids = set()
+        self._range_at = None
+
     @property
     def ToDoList(self) -> List:
         """return all tasks that are not meals/breaks"""
         return [b for b in self.blocks if b.type == "task" and b.name.lower() not in {"breakfast", "lunch", "dinner", "break"}]
     
     # serialization
+    @staticmethod
+    def block_to_dict(b) -> dict:
+        """convert a single block to a dictionary for JSON serialization"""
+        block_dict = {
+            "id": b.id,
+            "type": b.type,
+            "name": b.name,
+            "start": b.start.isoformat(),
+            "duration": b.duration.total_seconds() // 60,  # store in minutes
+            "location": b.location,
+            "notes": b.notes,
+            "is_fixed": b.is_fixed,
+            "colour": b.colour.name() if b.colour else None
+
+        }
+        if b.type == "event":
+            block_dict.update({
+                "priority": b.priority,
+                "repeatable": b.repeatable,
+                "interval": b.interval if b.repeatable else 0
+            })
+        elif b.type == "task":
+            block_dict.update({
+                "deadline": b.deadline.isoformat() if b.deadline else None,
+                "is_completed": b.is_completed,
+                "completed_at": b.completed_at.isoformat() if b.completed_at else None
+            })
+        return block_dict
+
+    @staticmethod
+    def block_from_dict(bd: dict) -> Union[Task, EventBlock]:
+        """build a single block from a dictionary (inverse of block_to_dict)"""
+        colour = QColor(bd["colour"]) if bd.get("colour") else None
+        if bd["type"] == "event":
+            b = EventBlock(
+                name=bd["name"],
+                start=datetime.fromisoformat(bd["start"]),
+                duration=timedelta(minutes=bd["duration"]),
+                location=bd.get("location"),
+                notes=bd.get("notes"),
+                is_fixed=bool(bd.get("is_fixed", False)),
+                colour=colour,
+                priority=int(bd.get("priority", 0)),
+                repeatable=bool(bd.get("repeatable", False)),
+                interval=int(bd.get("interval", 0))
+            )
+        else:
+            b = Task(
+                name=bd["name"],
+                start=datetime.fromisoformat(bd["start"]),
+                duration=timedelta(minutes=bd["duration"]),
+                deadline=datetime.fromisoformat(bd["deadline"]) if bd.get("deadline") else None,
+                location=bd.get("location"),
+                notes=bd.get("notes"),
+                is_fixed=bool(bd.get("is_fixed", False)),
+                colour=colour
+            )
+            b.is_completed = bd.get("is_completed", False)
+            if b.is_completed and bd.get("completed_at"):
+                b.completed_at = datetime.fromisoformat(bd["completed_at"])
+        if bd.get("id"):
+            b.id = bd["id"]
+        return b
+
     def to_dict(self) -> dict:
         """convert schedule and blocks to dictionary for JSON serialization"""
         schedule_dict = {"name": "Schedule", "blocks": []}
         for b in self.blocks:
             if b.name.lower() in {"breakfast", "lunch", "dinner", "break"}:
                 continue
-            block_dict = {
-                "type": b.type,
-                "name": b.name,
-                "start": b.start.isoformat(),
-                "duration": b.duration.total_seconds() // 60,  # store in minutes
-                "location": b.location,
-                "notes": b.notes,
-                "is_fixed": b.is_fixed,
-                "colour": b.colour.name() if b.colour else None
-
-            }
-            if b.type == "event":
-                block_dict.update({
-                    "priority": b.priority,
-                    "repeatable": b.repeatable,
-                    "interval": b.interval if b.repeatable else 0
-                })
-            elif b.type == "task":
-                block_dict.update({
-                    "deadline": b.deadline.isoformat() if b.deadline else None,
-                    "is_completed": b.is_completed,
-                    "completed_at": b.completed_at.isoformat() if b.completed_at else None
-                })
-            schedule_dict["blocks"].append(block_dict)
+            schedule_dict["blocks"].append(self.block_to_dict(b))
         return schedule_dict
 
     def from_dict(self, data: dict) -> None:
         """load blocks from dictionary (inverse of to_dict)"""
-        self.blocks = []
-        for bd in data.get("blocks", []):
-            colour = QColor(bd["colour"]) if bd.get("colour") else None
-            if bd["type"] == "event":
-                b = EventBlock(
-                    name=bd["name"],
-                    start=datetime.fromisoformat(bd["start"]),
-                    duration=timedelta(minutes=bd["duration"]),
-                    location=bd.get("location"),
-                    notes=bd.get("notes"),
-                    is_fixed=bool(bd.get("is_fixed", False)),
-                    colour=colour,
-                    priority=int(bd.get("priority", 0)),
-                    repeatable=bool(bd.get("repeatable", False)),
-                    interval=int(bd.get("interval", 0))
-                )
-            else:
-                b = Task(
-                    name=bd["name"],
-                    start=datetime.fromisoformat(bd["start"]),
-                    duration=timedelta(minutes=bd["duration"]),
-                    deadline=datetime.fromisoformat(bd["deadline"]) if bd.get("deadline") else None,
-                    location=bd.get("location"),
-                    notes=bd.get("notes"),
-                    is_fixed=bool(bd.get("is_fixed", False)),
-                    colour=colour
-                )
-                b.is_completed = bd.get("is_completed", False)
-                if b.is_completed and bd.get("completed_at"):
-                    b.completed_at = datetime.fromisoformat(bd["completed_at"])
-            self.blocks.append(b)
+        self.blocks = [self.block_from_dict(bd) for bd in data.get("blocks", [])]
+        self.layout_revision += 1
+
+    def add_stored(self, stored: List[dict]) -> None:
+        """
+        add blocks read back from storage after startup
+        they are not changes, so listeners are not told and nothing is rescheduled
+        """
+        known = {b.id for b in self.blocks}
+        self.blocks.extend(
+            self.block_from_dict(bd) for bd in stored if bd.get("id") not in known
+        )
+        self.layout_revision += 1
+
+    def _load_period(self, start: date, end: date) -> None:
+        """make sure blocks between start and end (inclusive) are in memory"""
+        if self.period_loader is None:
+            return
+        stored = self.period_loader(start, end)
+        if stored:
+            self.add_stored(stored)
 
     # retrieval
     def day(self, day_date: datetime) -> List:
         """return all blocks on a specific day"""
         if isinstance(day_date, datetime):
             day_date = day_date.date()
+        self._load_period(day_date, day_date)
         return [b for b in self.blocks if b.start.date() == day_date]
 
     def week(self, week_start: datetime) -> List:
@@ -111,10 +187,7 @@ class Schedule:
         while week_start.strftime("%A") != "Monday":
             week_start -= timedelta(days=1)
 
-        return [
-            b for b in self.blocks
-            if week_start <= b.start.date() < week_start + timedelta(days=7)
-        ]
+        return self.between(week_start, week_start + timedelta(days=6))
 
     def month(self, month_start: datetime) -> List:
         """return all blocks for the 5-week period starting from the Monday of the first week"""
@@ -124,20 +197,222 @@ class Schedule:
         while month_start.strftime("%A") != "Monday":
             month_start -= timedelta(days=1)
 
-        return [
-            b for b in self.blocks
-            if month_start <= b.start.date() < month_start + timedelta(days=35)
+        return self.between(month_start, month_start + timedelta(days=34))
+
+    def between(self, first: date, last: date) -> List:
+        """return all blocks starting from first to last (inclusive), in one pass"""
+        if isinstance(first, datetime):
+            first = first.date()
+        if isinstance(last, datetime):
+            last = last.date()
+
+        self._load_period(first, last)
+        return [b for b in self.blocks if first <= b.start.date() <= last]
+
+    def iter_range(self, start: datetime, forward: bool = True, page_size: int = 50,
+                   after_id: str = "", horizon: timedelta = timedelta(days=366)) -> Iterator[List]:
+        """
+        yield pages of up to page_size blocks (no meals or breaks, archived blocks
+        included) walking through time from start: forwards from start, or
+        backwards from just before it. each page is in start order; walking
+        backwards, each page is further in the past than the last
+        after_id carries on a walk from the block with that id starting at start
+
+        the walk goes a calendar month at a time. blocks in memory come from a
+        sorted index; blocks still on disk are read through range_reader for that
+        month only and are never added to the schedule, so a walk holds at most
+        a month and a page. it ends once a horizon past the last block turns up
+        nothing more and nothing in memory or on disk (range_bounds) lies further on
+        """
+        cursor = (start, after_id)
+        day = start.date()
+        quiet = timedelta(0)  # walked since the last month with blocks
+        buffered = []
+        while True:
+            if forward:
+                first, last = day, self._month_end(day)
+            else:
+                first, last = day.replace(day=1), day
+            found = self._range_month(first, last, cursor, forward)
+
+            quiet = timedelta(0) if found else quiet + (last - first + timedelta(days=1))
+            if forward:
+                buffered += found
+                while len(buffered) >= page_size:
+                    yield buffered[:page_size]
+                    buffered = buffered[page_size:]
+                day = last + timedelta(days=1)
+            else:
+                buffered[:0] = found
+                while len(buffered) >= page_size:
+                    yield buffered[-page_size:]
+                    buffered = buffered[:-page_size]
+                day = first - timedelta(days=1)
+
+            if quiet >= horizon and not self._range_beyond(day, forward):
+                break
+        if buffered:
+            yield buffered
+
+    @staticmethod
+    def _month_end(day: date) -> date:
+        return (day.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+    def _range_month(self, first: date, last: date, cursor: tuple, forward: bool) -> List:
+        """blocks starting from first to last (inclusive) past cursor, in (start, id) order"""
+        keys, blocks = self._range_index()
+        lo = bisect_left(keys, (datetime.combine(first, time.min), ""))
+        hi = bisect_left(keys, (datetime.combine(last + timedelta(days=1), time.min), ""))
+        found = blocks[lo:hi]
+
+        if self.range_reader is not None:
+            stored = [
+                self.block_from_dict(bd) for bd in self.range_reader(first, last)
+                if bd.get("id") not in self._range_ids
+                and bd.get("start") and bd.get("name", "").lower() not in self.SPECIAL_NAMES
+            ]
+            if stored:
+                found = sorted(found + stored, key=lambda b: (b.start, b.id or ""))
+
+        if forward:
+            return [b for b in found if (b.start, b.id or "") > cursor]
+        return [b for b in found if (b.start, b.id or "") < cursor]
+
+    def _range_beyond(self, day: date, forward: bool) -> bool:
+        """whether a block in memory, or a stored period, starts on or past day in the direction of the walk"""
+        keys, _ = self._range_index()
+        bounds = [(keys[0][0].date(), keys[-1][0].date())] if keys else []
+        stored = self.range_bounds() if self.range_bounds is not None else None
+        if stored is not None:
+            bounds.append(stored)
+        if forward:
+            return any(last >= day for _, last in bounds)
+        return any(first <= day for first, _ in bounds)
+
+    def _range_index(self) -> tuple:
+        """
+        (sort keys, blocks) in (start, id) order for every block in memory,
+        re-sorted only after the blocks change
+        without a range_reader the archive is read into memory and indexed too;
+        with one, only blocks not yet written to it (pending_archive) are
+        """
+        archived = self.archived() if self.range_reader is None else (self._archived or self.pending_archive)
+        state = (self.layout_revision, id(self.blocks), len(self.blocks), id(archived), len(archived))
+        if state != self._range_at:
+            ordered = sorted(
+                (b for b in self.blocks + list(archived)
+                 if b.start is not None and b.name.lower() not in self.SPECIAL_NAMES),
+                key=lambda b: (b.start, b.id or "")
+            )
+            self._range_keys = [(b.start, b.id or "") for b in ordered]
+            self._range_blocks = ordered
+            self._range_ids = {b.id for b in ordered}
+            self._range_at = state
+        return self._range_keys, self._range_blocks
+
+    def day_revision(self, day_date) -> int:
+        """
+        a counter that changes whenever the blocks on day_date change (added,
+        removed, moved, edited or re-decorated), so views can cache a day's blocks
+        """
+        if isinstance(day_date, datetime):
+            day_date = day_date.date()
+        self._refresh_day_revisions()
+        return self._day_revisions.get(day_date, 0)
+
+    def _refresh_day_revisions(self) -> None:
+        """re-index after a change, bumping the revision of every date that differs"""
+        state = (self.layout_revision, id(self.blocks), len(self.blocks))
+        if state == self._indexed_at:
+            return
+        signatures = {}
+        for b in self.blocks:
+            if b.start is None:
+                continue
+            # meals and breaks are rebuilt as new objects on every run, so only
+            # their placement counts
+            identity = None if b.name.lower() in self.SPECIAL_NAMES else id(b)
+            signatures.setdefault(b.start.date(), []).append(
+                (identity, b.start, b.duration, b.name, b.location, b.notes,
+                 getattr(b, "is_completed", False), getattr(b, "colour", None))
+            )
+        for day in set(signatures) | set(self._day_signatures):
+            signature = signatures.get(day)
+            if signature != self._day_signatures.get(day):
+                self._day_revisions[day] = self._day_revisions.get(day, 0) + 1
+        self._day_signatures = signatures
+        self._indexed_at = state
+
+    # change notification
+    def add_listener(self, callback) -> None:
+        """register callback(op, blocks) to be called after each change"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        """unregister a callback added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, op: str, blocks: List) -> None:
+        """tell listeners about a change to persisted (non meal/break) blocks"""
+        self.layout_revision += 1
+        blocks = [b for b in blocks if b.name.lower() not in self.SPECIAL_NAMES]
+        if not blocks:
+            return
+        self.revision += 1
+        for callback in list(self._listeners):
+            callback(op, blocks)
+
+    def _placements(self) -> dict:
+        """snapshot of where every persisted block currently sits"""
+        return {
+            b: (b.start, b.duration) for b in self.blocks
+            if b.name.lower() not in self.SPECIAL_NAMES
+        }
+
+    def _notify_changes(self, before: dict, edited: Optional[List] = None) -> None:
+        """compare against a _placements() snapshot and notify what was added, removed or moved"""
+        edited = edited or []
+        self.layout_revision += 1  # meals and breaks may have moved even if nothing else did
+        after = self._placements()
+        added = [b for b in after if b not in before]
+        removed = [b for b in before if b not in after]
+        moved = [
+            b for b, placement in after.items()
+            if b in before and before[b] != placement and b not in edited
         ]
+        if added:
+            self._notify("add", added)
+        if removed:
+            self._notify("remove", removed)
+        if moved:
+            self._notify("move", moved)
+        edited = [b for b in edited if b in after]
+        if edited:
+            self._notify("update", edited)
 
     # modifications
     def add_block(self, b) -> None:
         """add block and update schedule"""
         self.blocks.append(b)
+        self._notify("add", [b])
         if b.start is not None and b.type == "task":
             self.global_edf_scheduler(ignore_blocks=[b])
         else:
             self.global_edf_scheduler()
 
+    def add_blocks(self, blocks: List, reschedule: bool = True) -> None:
+        """
+        add many blocks at once (e.g. an import) with a single notification
+        and at most one scheduler pass
+        """
+        if not blocks:
+            return
+        self.blocks.extend(blocks)
+        self._notify("add", list(blocks))
+        if reschedule:
+            self.global_edf_scheduler()
+
     def remove_block(self, b) -> None:
         """remove the real block from schedule"""
         real_block = next(
@@ -147,6 +422,7 @@ class Schedule:
         )
         if real_block:
             self.blocks.remove(real_block)
+            self._notify("remove", [real_block])
             print(f"[DEBUG] Deleted block: {real_block.name}")
             self.global_edf_scheduler()
         else:
@@ -156,12 +432,20 @@ class Schedule:
         """mark task as complete"""
         if t in self.blocks:
             t.mark_complete()
+            self._notify("update", [t])
         self.global_edf_scheduler()
 
     def mark_incomplete(self, t) -> None:
         """mark task as incomplete"""
         if t in self.blocks:
             t.mark_incomplete()
+            self._notify("update", [t])
+        self.global_edf_scheduler()
+
+    def update_block(self, b) -> None:
+        """record that a block's fields were edited in place and update schedule"""
+        if b in self.blocks:
+            self._notify("update", [b])
         self.global_edf_scheduler()
 
     def clear_for_time(self, duration: Union[timedelta, str]) -> None:
@@ -180,122 +464,183 @@ class Schedule:
 
     def clear_history(self) -> None:
         """
-        removes blocks from schedule.blocks that are older than
-        settings.history_duration (in days)
+        moves blocks older than settings.history_duration (in days) out of
+        schedule.blocks and into the history archive in a single pass
         """
 
         history_days = self.settings.history_duration
         cutoff = datetime.now() - history_days
 
-        for b in self.blocks[:]:
+        keep, aged = [], []
+        for b in self.blocks:
             if (b.type == 'event' or b.type == 'task' and b.is_completed) and b.start < cutoff:
-                self.blocks.remove(b)
+                aged.append(b)
+            else:
+                keep.append(b)
+
+        if not aged:
+            return
+
+        self.blocks = keep
+        self.pending_archive.extend(aged)
+        if self._archived is not None:
+            self._archived.extend(aged)
+        self._notify("archive", aged)
+
+    def archived(self) -> List:
+        """return all archived blocks, loading the archive on first use"""
+        if self._archived is None:
+            stored = self.archive_loader() if self.archive_loader else []
+            self._archived = [self.block_from_dict(bd) for bd in stored] + self.pending_archive
+        return self._archived
+
+
+    # scheduler helpers
+    def _find_next_available(self, start_time: datetime, duration: timedelta, current_schedule: list) -> datetime:
+        """Earliest start >= start_time that fits duration within day bounds and avoids overlaps."""
+        current = start_time
+        while True:
+            day_start, day_end = self.settings.get_day_bounds(current)
+            if current < day_start:
+                current = day_start
+
+            if current + duration > day_end:
+                # move to next day start
+                next_day = current + timedelta(days=1)
+                next_day_start, _ = self.settings.get_day_bounds(next_day)
+                current = datetime.combine(next_day.date(), next_day_start.time())
+                continue
 
+            # overlap check with all scheduled blocks
+            conflict_found = False
+            for b in current_schedule:
+                b_start = b.start
+                b_end = b.start + b.duration
+                if current < b_end and current + duration > b_start:
+                    current = b_end
+                    conflict_found = True
+                    break
 
-    # scheduler
-    def global_edf_scheduler(self, pointer: Optional[datetime] = None, ignore_blocks: Optional[List] = None) -> None:
-        """Schedule tasks globally using EDF. If infeasible, raise ScheduleInfeasibleError.
-        Meals and breaks are added only after a feasible task schedule exists.
-        """
-        SPECIAL_NAMES = {"breakfast", "lunch", "dinner", "break"}
-        BREAK_INTERVAL = self.settings.break_interval
-        BREAK_DURATION = self.settings.break_duration
+            if not conflict_found:
+                return current
+
+    def _ensure_meals_for_date(self, day: date, current_schedule: list) -> None:
+        """Ensure breakfast/lunch/dinner exist for the given date (best-effort)."""
         MEAL_DURATION = self.settings.meal_duration
+        for meal_name in ["breakfast", "lunch", "dinner"]:
+            exists = any(
+                b.name.lower() == meal_name and b.start.date() == day
+                for b in current_schedule
+                if b.start is not None
+            )
+            if exists:
+                continue
 
-        # --------------------------
-        # helper functions
-        # --------------------------
-        def find_next_available(start_time: datetime, duration: timedelta, current_schedule: list) -> datetime:
-            """Earliest start >= start_time that fits duration within day bounds and avoids overlaps."""
-            current = start_time
-            while True:
-                day_start, day_end = self.settings.get_day_bounds(current)
-                if current < day_start:
-                    current = day_start
-
-                if current + duration > day_end:
-                    # move to next day start
-                    next_day = current + timedelta(days=1)
-                    next_day_start, _ = self.settings.get_day_bounds(next_day)
-                    current = datetime.combine(next_day.date(), next_day_start.time())
+            day_blocks = sorted(
+                [b for b in current_schedule if b.start is not None and b.start.date() == day],
+                key=lambda b: b.start
+            )
+
+            meal_start_time, meal_end_time = self.settings.meal_windows[meal_name]
+            probe = datetime.combine(day, meal_start_time)
+            latest_start = datetime.combine(day, meal_end_time) - MEAL_DURATION
+
+            while probe <= latest_start:
+                # if overlaps any block, jump probe to end of that block and retry
+                moved = False
+                for b in day_blocks:
+                    if probe < b.start + b.duration and probe + MEAL_DURATION > b.start:
+                        probe = b.start + b.duration
+                        moved = True
+                        break
+                if moved:
                     continue
 
-                # overlap check with all scheduled blocks
-                conflict_found = False
-                for b in current_schedule:
-                    b_start = b.start
-                    b_end = b.start + b.duration
-                    if current < b_end and current + duration > b_start:
-                        current = b_end
-                        conflict_found = True
-                        break
+                # place meal
+                current_schedule.append(Task(name=meal_name, start=probe, duration=MEAL_DURATION))
+                break
 
-                if not conflict_found:
-                    return current
-
-        def ensure_meals_for_date(day: date, current_schedule: list) -> None:
-            """Ensure breakfast/lunch/dinner exist for the given date (best-effort)."""
-            for meal_name in ["breakfast", "lunch", "dinner"]:
-                exists = any(
-                    b.name.lower() == meal_name and b.start.date() == day
-                    for b in current_schedule
-                    if b.start is not None
-                )
-                if exists:
-                    continue
+    def _break_valid(self, at_time: datetime, scheduled_blocks: list) -> bool:
+        """Whether a break can be scheduled at at_time on that day (best-effort)."""
+        BREAK_INTERVAL = self.settings.break_interval
+        BREAK_DURATION = self.settings.break_duration
 
-                day_blocks = sorted(
-                    [b for b in current_schedule if b.start is not None and b.start.date() == day],
-                    key=lambda b: b.start
-                )
-
-                meal_start_time, meal_end_time = self.settings.meal_windows[meal_name]
-                probe = datetime.combine(day, meal_start_time)
-                latest_start = datetime.combine(day, meal_end_time) - MEAL_DURATION
-
-                while probe <= latest_start:
-                    # if overlaps any block, jump probe to end of that block and retry
-                    moved = False
-                    for b in day_blocks:
-                        if probe < b.start + b.duration and probe + MEAL_DURATION > b.start:
-                            probe = b.start + b.duration
-                            moved = True
-                            break
-                    if moved:
-                        continue
-
-                    # place meal
-                    current_schedule.append(Task(name=meal_name, start=probe, duration=MEAL_DURATION))
-                    break
+        day_start, day_end = self.settings.get_day_bounds(at_time)
+        if at_time + BREAK_DURATION > day_end:
+            return False
+
+        day_blocks = [b for b in scheduled_blocks if b.start is not None and b.start.date() == at_time.date()]
+        day_blocks.sort(key=lambda b: b.start)
 
-        def break_valid(at_time: datetime, scheduled_blocks: list) -> bool:
-            """Whether a break can be scheduled at at_time on that day (best-effort)."""
-            day_start, day_end = self.settings.get_day_bounds(at_time)
-            if at_time + BREAK_DURATION > day_end:
+        # backward check: ensure BREAK_INTERVAL since last break/meal
+        duration_since_last_break = timedelta(0)
+        for b in reversed(day_blocks):
+            if b.start >= at_time:
+                continue
+            if b.name.lower() in {"break", "breakfast", "lunch", "dinner"}:
+                return False
+            duration_since_last_break += b.duration
+            if duration_since_last_break >= BREAK_INTERVAL:
+                break
+
+        # forward check: no overlap
+        for b in day_blocks:
+            if b.start >= at_time + BREAK_DURATION:
+                break
+            if at_time < b.start + b.duration and at_time + BREAK_DURATION > b.start:
                 return False
 
-            day_blocks = [b for b in scheduled_blocks if b.start is not None and b.start.date() == at_time.date()]
-            day_blocks.sort(key=lambda b: b.start)
+        return True
 
-            # backward check: ensure BREAK_INTERVAL since last break/meal
-            duration_since_last_break = timedelta(0)
-            for b in reversed(day_blocks):
-                if b.start >= at_time:
-                    continue
-                if b.name.lower() in {"break", "breakfast", "lunch", "dinner"}:
-                    return False
-                duration_since_last_break += b.duration
-                if duration_since_last_break >= BREAK_INTERVAL:
-                    break
+    def _expand_repeats(self, current_schedule: list) -> None:
+        """add the repeats of repeatable events over the next 6 weeks, skipping holidays"""
+        for b in list(current_schedule):
+            if getattr(b, "repeatable", False):
+                repeat_interval = timedelta(days=b.interval)
+                next_start = b.start + repeat_interval
+                while next_start <= datetime.now() + timedelta(days=42):
+                    if not self.settings.is_holiday(next_start):
+                        exists = any(existing.name == b.name and existing.start == next_start for existing in current_schedule)
+                        if not exists:
+                            repeated_event = EventBlock(
+                                name=b.name,
+                                start=next_start,
+                                duration=b.duration,
+                                location=getattr(b, "location", None),
+                                notes=getattr(b, "notes", None),
+                                colour=getattr(b, "colour", None),  # NOTE: your original used b.colour() which may be wrong
+                                is_fixed=b.is_fixed,
+                                priority=getattr(b, "priority", 0),
+                                repeatable=True,
+                                interval=b.interval
+                            )
+                            current_schedule.append(repeated_event)
+                    next_start += repeat_interval
 
-            # forward check: no overlap
-            for b in day_blocks:
-                if b.start >= at_time + BREAK_DURATION:
-                    break
-                if at_time < b.start + b.duration and at_time + BREAK_DURATION > b.start:
-                    return False
+    def _decorate(self, current_schedule: list) -> None:
+        """add meals and breaks around the placed blocks (best-effort, never breaks feasibility)"""
+        # meals
+        all_dates = {b.start.date() for b in current_schedule if b.start is not None}
+        for d in all_dates:
+            self._ensure_meals_for_date(d, current_schedule)
 
-            return True
+        # breaks: try a break after each block end
+        current_schedule.sort(key=lambda b: b.start)
+        for b in list(current_schedule):
+            candidate = b.start + b.duration
+            if self._break_valid(candidate, current_schedule):
+                current_schedule.append(Task(name="break", start=candidate, duration=self.settings.break_duration))
+                current_schedule.sort(key=lambda x: x.start)
+
+    # scheduler
+    def global_edf_scheduler(self, pointer: Optional[datetime] = None, ignore_blocks: Optional[List] = None,
+                             optimize: bool = False) -> None:
+        """Schedule tasks globally using EDF. If infeasible, raise ScheduleInfeasibleError.
+        Meals and breaks are added only after a feasible task schedule exists.
+        With optimize=True and the optimizer engine selected, the EDF placement is
+        then improved within the optimizer budget.
+        """
+        SPECIAL_NAMES = self.SPECIAL_NAMES
 
         # --------------------------
         # Feasibility check (tasks + fixed events only)
@@ -351,6 +696,7 @@ class Schedule:
         # --------------------------
         # Start of main logic
         # --------------------------
+        before = self._placements()
         scheduled_blocks = self.blocks[:]  # shallow copy
 
         ignore_blocks = ignore_blocks if ignore_blocks else []
@@ -379,28 +725,7 @@ class Schedule:
         ]
 
         # expand repeatable events (kept close to your original)
-        for b in list(current_schedule):
-            if getattr(b, "repeatable", False):
-                repeat_interval = timedelta(days=b.interval)
-                next_start = b.start + repeat_interval
-                while next_start <= datetime.now() + timedelta(days=42):
-                    if not self.settings.is_holiday(next_start):
-                        exists = any(existing.name == b.name and existing.start == next_start for existing in current_schedule)
-                        if not exists:
-                            repeated_event = EventBlock(
-                                name=b.name,
-                                start=next_start,
-                                duration=b.duration,
-                                location=getattr(b, "location", None),
-                                notes=getattr(b, "notes", None),
-                                colour=getattr(b, "colour", None),  # NOTE: your original used b.colour() which may be wrong
-                                is_fixed=b.is_fixed,
-                                priority=getattr(b, "priority", 0),
-                                repeatable=True,
-                                interval=b.interval
-                            )
-                            current_schedule.append(repeated_event)
-                    next_start += repeat_interval
+        self._expand_repeats(current_schedule)
 
         # include ignore blocks (they should be treated as fixed for this run)
         current_schedule = current_schedule + ignore_blocks
@@ -416,11 +741,7 @@ class Schedule:
             # Kept as the structure you want: second pass could relax other constraints if you add them later.
             feasible2, failing_task2, missing2 = check_feasible(tasks, current_schedule, start_pointer)
             if not feasible2:
-                raise ScheduleInfeasibleError(
-                    f"Schedule infeasible: '{failing_task2.name}' misses its deadline by ~{missing2} minutes.",
-                    failing_task=failing_task2,
-                    missing_minutes=missing2
-                )
+                raise ScheduleInfeasibleError(failing_task2, missing2)
 
         # --------------------------
         # Place tasks with EDF (still no meals/breaks)
@@ -429,31 +750,133 @@ class Schedule:
         pointer_time = start_pointer
 
         for t in tasks:
-            t.start = find_next_available(pointer_time, t.duration, current_schedule)
+            t.start = self._find_next_available(pointer_time, t.duration, current_schedule)
             current_schedule.append(t)
             pointer_time = t.start + t.duration  # pointer moves only because of tasks
             current_schedule.sort(key=lambda b: b.start)  # keep overlap checks simple
 
         # --------------------------
-        # Decorate: meals (best-effort)
+        # Optional: improve the EDF placement with a time-budgeted local search
         # --------------------------
-        all_dates = {b.start.date() for b in current_schedule if b.start is not None}
-        for d in all_dates:
-            ensure_meals_for_date(d, current_schedule)
+        if optimize and getattr(self.settings, "scheduler_engine", "edf") == "optimizer" and tasks:
+            task_set = set(tasks)
+            fixed_blocks = [b for b in current_schedule if b not in task_set]
+            optimizer = ScheduleOptimizer(
+                self.settings,
+                budget_ms=getattr(self.settings, "optimizer_budget_ms", 50)
+            )
+            if optimizer.improve(tasks, fixed_blocks, start_pointer):
+                current_schedule.sort(key=lambda b: b.start)
 
         # --------------------------
-        # Decorate: breaks (best-effort, never break feasibility)
+        # Decorate: meals and breaks (best-effort)
         # --------------------------
-        current_schedule.sort(key=lambda b: b.start)
-        # try a break after each block end
-        for b in list(current_schedule):
-            candidate = b.start + b.duration
-            if break_valid(candidate, current_schedule):
-                current_schedule.append(Task(name="break", start=candidate, duration=BREAK_DURATION))
-                current_schedule.sort(key=lambda x: x.start)
+        self._decorate(current_schedule)
 
         # final assignment (keep completed tasks)
         self.blocks = current_schedule + completed_tasks
+        self._notify_changes(before, edited=ignore_blocks)
+
+    def optimize(self) -> None:
+        """
+        explicit or idle reschedule: the only passes that spend the optimizer budget,
+        edits reschedule with plain EDF
+        """
+        self.global_edf_scheduler(optimize=True)
+
+    # partial recomputation after a settings change
+    def apply_settings_change(self, before: dict) -> None:
+        """
+        reschedule only as much as a settings change requires
+        `before` is settings.to_dict() taken before the change was applied
+        - decoration changes (meals/breaks) only rebuild meals and breaks
+        - working hours/holiday changes re-place only tasks on affected days
+        - anything else (theme, notifications, ...) needs no rescheduling
+        """
+        impact = self.settings.change_impact(self.settings.changed_fields(before))
+
+        if impact == "none":
+            return
+        if impact == "full":
+            self.optimize()
+            return
+        placements = self._placements()
+        if impact == "placement":
+            if not self._replace_affected_days(before):
+                self.global_edf_scheduler()
+                return
+        else:
+            self._redecorate()
+        self._notify_changes(placements)
+
+    def _strip_decorations(self) -> tuple:
+        """split blocks into (undecorated schedule, completed tasks)"""
+        current_schedule, completed_tasks = [], []
+        for b in self.blocks:
+            if b.name.lower() in self.SPECIAL_NAMES:
+                continue
+            if b.type == "task" and b.is_completed:
+                completed_tasks.append(b)
+            else:
+                current_schedule.append(b)
+        return current_schedule, completed_tasks
+
+    def _redecorate(self) -> None:
+        """rebuild meals and breaks without moving any task"""
+        current_schedule, completed_tasks = self._strip_decorations()
+        current_schedule.sort(key=lambda b: b.start)
+        self._decorate(current_schedule)
+        self.blocks = current_schedule + completed_tasks
+
+    def _replace_affected_days(self, before: dict) -> bool:
+        """
+        re-place only the tasks on days whose working bounds changed
+        returns False if that would make a task miss a deadline it used to meet,
+        in which case the caller should fall back to a full run
+        """
+        old_settings = type(self.settings)()
+        old_settings.from_dict(before)
+
+        current_schedule, completed_tasks = self._strip_decorations()
+        affected = {
+            b.start.date() for b in current_schedule
+            if old_settings.get_day_bounds(b.start) != self.settings.get_day_bounds(b.start)
+        }
+
+        # repeats that now land on a holiday are dropped, ones freed from a holiday come back
+        current_schedule = [
+            b for b in current_schedule
+            if not (b.type == "event" and getattr(b, "repeatable", False) and self.settings.is_holiday(b.start))
+        ]
+        self._expand_repeats(current_schedule)
+
+        movable = [
+            b for b in current_schedule
+            if b.type == "task" and b.start.date() in affected
+        ]
+        movable_set = set(movable)
+        current_schedule = [b for b in current_schedule if b not in movable_set]
+        current_schedule.sort(key=lambda b: b.start)
+
+        was_on_time = {t: t.deadline is None or t.end <= t.deadline for t in movable}
+        old_starts = {t: t.start for t in movable}
+        now = datetime.now()
+
+        movable.sort(key=lambda t: (t.deadline or datetime.max))
+        for t in movable:
+            day_start, _ = self.settings.get_day_bounds(t.start)
+            t.start = self._find_next_available(max(day_start, now), t.duration, current_schedule)
+            current_schedule.append(t)
+            current_schedule.sort(key=lambda b: b.start)
+
+        if any(was_on_time[t] and t.deadline is not None and t.end > t.deadline for t in movable):
+            for t, start in old_starts.items():
+                t.start = start
+            return False
+
+        self._decorate(current_schedule)
+        self.blocks = current_schedule + completed_tasks
+        return True
 
     def run_scheduler_with_feedback(schedule): #put in eveywhere
         try:
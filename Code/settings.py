@@ -1,5 +1,6 @@
 from datetime import time, timedelta, date, datetime
 from typing import List, Tuple, Dict, Optional
+from bisect import bisect_right
 
 class Settings:
     """
@@ -8,11 +9,22 @@ class Settings:
     - notification frequency
     - meal windows and break durations
     - holiday ranges
+    - which scheduling engine to use
     provides methods to serialize/deserialize settings for JSON storage
     """
-    
+
+    # fields that change the result of get_day_bounds
+    DAY_BOUNDS_FIELDS = {"start_time", "end_time", "weekend_start", "weekend_end", "holiday_ranges"}
+    DAY_BOUNDS_CACHE_SIZE = 1024  # oldest days are evicted past this many
+
+    # how much rescheduling a change to each field needs (see change_impact)
+    DECORATION_FIELDS = {"meal_windows", "meal_duration", "break_duration", "break_interval"}
+    PLACEMENT_FIELDS = DAY_BOUNDS_FIELDS
+    FULL_FIELDS = {"scheduler_engine", "optimizer_budget_ms"}
+
     def __init__(self) -> None:
         """initializes default settings values."""
+        self._listeners = []
         self.theme = "light"
         self.start_time = time(7, 0)
         self.end_time = time(22, 0)
@@ -29,6 +41,8 @@ class Settings:
         self.meal_duration = timedelta(minutes=30)
         self.history_duration = timedelta(days=7)
         self.holiday_ranges: List[Tuple[date, date]] = []  # list of tuples (start_date, end_date)
+        self.scheduler_engine = "edf"  # "edf" or "optimizer"
+        self.optimizer_budget_ms = 50
 
     def to_dict(self) -> dict:
         """convert the settings into a dictionary suitable for JSON serialization"""
@@ -50,7 +64,9 @@ class Settings:
             "holiday_ranges": [
                 (start.isoformat(), end.isoformat())
                 for start, end in self.holiday_ranges
-            ]
+            ],
+            "scheduler_engine": self.scheduler_engine,
+            "optimizer_budget_ms": self.optimizer_budget_ms
         }
 
     def from_dict(self, data: dict) -> None:
@@ -81,6 +97,69 @@ class Settings:
             for start, end in holiday_ranges_data
         ]
 
+        self.scheduler_engine = data.get("scheduler_engine", self.scheduler_engine)
+        self.optimizer_budget_ms = int(data.get("optimizer_budget_ms", self.optimizer_budget_ms))
+
+    def __setattr__(self, name, value) -> None:
+        """
+        invalidate the cached day bounds whenever a field they depend on is set,
+        and bump the revision and tell listeners whenever any setting is set
+        """
+        super().__setattr__(name, value)
+        if name in self.DAY_BOUNDS_FIELDS:
+            self._invalidate_day_cache()
+        if not name.startswith("_") and name != "revision":
+            self.revision = getattr(self, "revision", 0) + 1  # compared by persistence to skip clean saves
+            self._notify()
+
+    def add_listener(self, callback) -> None:
+        """register callback() to be called after each change"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        """unregister a callback added with add_listener"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self) -> None:
+        for callback in list(getattr(self, "_listeners", ())):
+            callback()
+
+    def _invalidate_day_cache(self) -> None:
+        """drop the day bounds cache and the holiday index so they are rebuilt on demand"""
+        self._day_bounds_cache = {}
+        self._holiday_index = None
+
+    def _build_holiday_index(self) -> tuple:
+        """sort and merge holiday ranges into parallel start/end lists for bisect"""
+        starts, ends = [], []
+        for start, end in sorted(self.holiday_ranges):
+            if ends and start <= ends[-1] + timedelta(days=1):
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._holiday_index = (starts, ends)
+        return starts, ends
+
+    def changed_fields(self, before: dict) -> set:
+        """names of fields that differ from an earlier to_dict() snapshot"""
+        after = self.to_dict()
+        return {key for key, value in after.items() if before.get(key) != value}
+
+    def change_impact(self, changed: set) -> str:
+        """
+        classify changed fields by how much of the schedule they invalidate
+        returns "full", "placement", "decoration" or "none"
+        """
+        if changed & self.FULL_FIELDS:
+            return "full"
+        if changed & self.PLACEMENT_FIELDS:
+            return "placement"
+        if changed & self.DECORATION_FIELDS:
+            return "decoration"
+        return "none"
+
     def update(self, persistenceManager, **kwargs) -> None:
         """update multiple settings at once and persist changes"""
         for key, value in kwargs.items():
@@ -91,6 +170,9 @@ class Settings:
     def add_holiday(self, start_date: date, end_date: date) -> None:
         """sdd a new holiday range"""
         self.holiday_ranges.append((start_date, end_date))
+        self._invalidate_day_cache()  # appended in place, so __setattr__ doesn't see it
+        self.revision += 1
+        self._notify()
 
     def clean_past_holidays(self) -> None:
         """remove holidays that have already ended"""
@@ -99,10 +181,13 @@ class Settings:
 
     def is_holiday(self, check_date: date) -> bool:
         """check if a given date is a holiday """
-        for start, end in self.holiday_ranges:
-            if start <= check_date <= end:
-                return True
-        return False
+        if isinstance(check_date, datetime):
+            check_date = check_date.date()
+
+        index = self._holiday_index or self._build_holiday_index()
+        starts, ends = index
+        i = bisect_right(starts, check_date) - 1
+        return i >= 0 and check_date <= ends[i]
 
     def get_day_bounds(self, dt: datetime | date) -> tuple:
         """get the start and end times for a given day"""
@@ -111,6 +196,10 @@ class Settings:
         else:
             dt_date = dt
 
+        cached = self._day_bounds_cache.get(dt_date)
+        if cached is not None:
+            return cached
+
         weekday = dt_date.weekday()  # 0=monday, 6=sunday
         if self.is_holiday(dt_date) or weekday >= 5:
             start = datetime.combine(dt_date, self.weekend_start)
@@ -118,4 +207,8 @@ class Settings:
         else:
             start = datetime.combine(dt_date, self.start_time)
             end = datetime.combine(dt_date, self.end_time)
+
+        if len(self._day_bounds_cache) >= self.DAY_BOUNDS_CACHE_SIZE:
+            del self._day_bounds_cache[next(iter(self._day_bounds_cache))]
+        self._day_bounds_cache[dt_date] = (start, end)
         return start, end
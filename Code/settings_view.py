@@ -14,6 +14,9 @@ from utils import FiveMinuteTimeEdit
 class SettingsView(QWidget):
     """setting view allowing for editing of settings"""
     back = pyqtSignal()
+    settings_saved = pyqtSignal(object)  # emits settings.to_dict() from before the save
+    import_calendar = pyqtSignal()
+    export_calendar = pyqtSignal()
 
     def __init__(self, settings, persistence_manager, util) -> None:
         super().__init__()
@@ -44,6 +47,14 @@ class SettingsView(QWidget):
         self.theme_box.setMinimumWidth(100)
         self.general_form.addRow("theme", self.theme_box)
 
+        # scheduling engine
+        self.engine_box = QComboBox()
+        self.engine_box.addItems(["edf", "optimizer"])
+        self.engine_box.setCurrentText(self.settings.scheduler_engine)
+        self.engine_box.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        self.engine_box.setMinimumWidth(100)
+        self.general_form.addRow("scheduler", self.engine_box)
+
         # weekday times
         self.start_time_edit = FiveMinuteTimeEdit(QTime(self.settings.start_time.hour, self.settings.start_time.minute))
         self.end_time_edit = FiveMinuteTimeEdit(QTime(self.settings.end_time.hour, self.settings.end_time.minute))
@@ -135,6 +146,18 @@ class SettingsView(QWidget):
         btn_layout.addWidget(self.remove_holiday_btn)
         self.holiday_layout.addLayout(btn_layout)
 
+        # calendar import/export
+        self.calendar_group = QGroupBox("calendar files")
+        calendar_layout = QHBoxLayout()
+        self.calendar_group.setLayout(calendar_layout)
+        self.import_btn = QPushButton("import .ics")
+        self.export_btn = QPushButton("export .ics")
+        self.import_btn.clicked.connect(self.import_calendar.emit)
+        self.export_btn.clicked.connect(self.export_calendar.emit)
+        calendar_layout.addWidget(self.import_btn)
+        calendar_layout.addWidget(self.export_btn)
+        self.main_layout.addWidget(self.calendar_group)
+
         # state snapshot for dirty checking 
         self._snapshot = self._snapshot_state()
         self._temp_state = copy.deepcopy(self._snapshot)
@@ -149,11 +172,12 @@ class SettingsView(QWidget):
         # header fonts
         self.header_font = QFont()
         self.header_font.setPointSize(16)
-        for group in [self.general_group, self.meal_group, self.holiday_group]:
+        for group in [self.general_group, self.meal_group, self.holiday_group, self.calendar_group]:
             group.setFont(self.header_font)
 
         # connect theme change
         self.theme_box.currentTextChanged.connect(self.on_theme_changed)
+        self.engine_box.currentTextChanged.connect(self.on_engine_changed)
         self.util.apply_theme()
 
     # helpers
@@ -167,6 +191,7 @@ class SettingsView(QWidget):
         """a helper to snapshot the current state"""
         return {
             "theme": self.theme_box.currentText(),
+            "scheduler_engine": self.engine_box.currentText(),
             "weekday_start": self.start_time_edit.time().toString("HH:mm"),
             "weekday_end": self.end_time_edit.time().toString("HH:mm"),
             "weekend_start": self.weekend_start_edit.time().toString("HH:mm"),
@@ -203,7 +228,9 @@ class SettingsView(QWidget):
         if reply != QMessageBox.Yes:
             return
         # save all settings
+        before = self.settings.to_dict()
         self.settings.theme = self._temp_state["theme"]
+        self.settings.scheduler_engine = self._temp_state["scheduler_engine"]
         self.settings.start_time = QTime.fromString(self._temp_state["weekday_start"], "HH:mm").toPyTime()
         self.settings.end_time = QTime.fromString(self._temp_state["weekday_end"], "HH:mm").toPyTime()
         self.settings.weekend_start = QTime.fromString(self._temp_state["weekend_start"], "HH:mm").toPyTime()
@@ -212,17 +239,21 @@ class SettingsView(QWidget):
         self.settings.break_interval = timedelta(minutes=self._temp_state["break_interval"])
         self.settings.notification_frequency = timedelta(minutes=self._temp_state["notification_frequency"])
 
+        # assigned as a whole so the change is seen like any other setting
+        meal_windows = dict(self.settings.meal_windows)
         for meal, (s, e) in self._temp_state["meal_windows"].items():
-            self.settings.meal_windows[meal] = (
+            meal_windows[meal] = (
                 QTime.fromString(s, "HH:mm").toPyTime(),
                 QTime.fromString(e, "HH:mm").toPyTime()
             )
+        self.settings.meal_windows = meal_windows
         self.settings.meal_duration = timedelta(minutes=self._temp_state["meal_duration"])
         self.settings.holiday_ranges = list(self._temp_state["holidays"])
         self.persistence.save_settings(self.settings)
 
         self._snapshot = copy.deepcopy(self._temp_state)
         self._update_save_state()
+        self.settings_saved.emit(before)
 
     # break and notification changes
     def on_break_interval_changed(self, value):
@@ -467,3 +498,8 @@ class SettingsView(QWidget):
         self._temp_state["theme"] = text
         self.util.apply_theme(theme=self._temp_state["theme"])
         self._update_save_state()
+
+    # scheduler engine change
+    def on_engine_changed(self, text):
+        self._temp_state["scheduler_engine"] = text
+        self._update_save_state()
@@ -0,0 +1,329 @@
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+from cryptography.fernet import InvalidToken
+from persistence_manager import PersistenceManager
+
+
+class _Snapshot:
+    """minimal stand-in exposing the to_dict() the save methods expect"""
+
+    def __init__(self, payload: dict) -> None:
+        self.payload = payload
+
+    def to_dict(self) -> dict:
+        return self.payload
+
+
+class SQLitePersistenceManager(PersistenceManager):
+    """
+    alternative storage backend keeping blocks, templates and settings in an
+    indexed sqlite database instead of whole-file JSON blobs
+
+    blocks are indexed by start date, type and completion; the rest of each
+    block is stored as a Fernet-encrypted payload using the existing key.
+    loads can be restricted to a date range so startup does not read all history.
+    archived blocks go to their own table, indexed the same way
+
+    selected with `main.py --sqlite`, which copies the JSON data in with
+    migrate_json_to_sqlite the first time; the JSON files are left as they were
+    """
+
+    CHUNK_ROWS = 500  # rows decrypted per batch when streaming the whole table
+
+    def __init__(self, db_file: str = "data.db") -> None:
+        super().__init__()
+        self.db_file = db_file
+        self.journal_file = "data.sqlite.journal"
+        self._lock = threading.Lock()
+        self._loaded_ids = set()  # block ids handed out by loads or written since, see _write_data
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        """create tables and indexes if they do not exist yet"""
+        with self._lock, self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS blocks (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    start_day INTEGER NOT NULL,
+                    is_completed INTEGER NOT NULL DEFAULT 0,
+                    is_repeatable INTEGER NOT NULL DEFAULT 0,
+                    payload BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_blocks_start_day ON blocks (start_day);
+                CREATE INDEX IF NOT EXISTS idx_blocks_type_day ON blocks (type, start_day);
+                CREATE INDEX IF NOT EXISTS idx_blocks_open ON blocks (is_completed, type);
+                CREATE INDEX IF NOT EXISTS idx_blocks_repeatable ON blocks (is_repeatable);
+
+                CREATE TABLE IF NOT EXISTS archive (
+                    id TEXT PRIMARY KEY,
+                    start_day INTEGER NOT NULL,
+                    payload BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_archive_start_day ON archive (start_day);
+
+                CREATE TABLE IF NOT EXISTS templates (
+                    position INTEGER PRIMARY KEY,
+                    payload BLOB NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS settings (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    # row helpers
+    @staticmethod
+    def _day_number(iso_start: str) -> int:
+        """index key for a block start: the proleptic ordinal of its date"""
+        return datetime.fromisoformat(iso_start).date().toordinal()
+
+    def _block_row(self, bd: dict) -> tuple:
+        """build an indexed, encrypted row from a block dictionary"""
+        return (
+            bd["id"],
+            bd["type"],
+            self._day_number(bd["start"]),
+            int(bool(bd.get("is_completed", False))),
+            int(bool(bd.get("repeatable", False))),
+            self._encrypt(bd)
+        )
+
+    def _rows_to_blocks(self, rows) -> List[dict]:
+        """decrypt the payload (last column) of each row, skipping any that cannot be read"""
+        blocks = []
+        for row in rows:
+            try:
+                blocks.append(self._decrypt(row[-1]))
+            except InvalidToken:
+                continue
+        return blocks
+
+    # schedule data
+    def _write_data(self, data_to_save: dict) -> None:
+        """
+        upsert a prepared snapshot in one transaction
+        a snapshot only covers the blocks that were loaded, so rows are deleted
+        only if they were loaded (or written) before and are now missing;
+        rows outside the loaded range are left alone
+        """
+        rows = [self._block_row(bd) for bd in data_to_save["schedule"].get("blocks", [])]
+        saved_ids = {row[0] for row in rows}
+        with self._lock, self.conn:
+            removed = self._loaded_ids - saved_ids
+            self.conn.executemany("DELETE FROM blocks WHERE id = ?", [(block_id,) for block_id in removed])
+            self.conn.executemany("INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('journal_seq', ?)",
+                (str(data_to_save.get("journal_seq", 0)),)
+            )
+            self._loaded_ids = saved_ids
+
+    def load_data(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[str, Any]:
+        """
+        load blocks, optionally only those starting between start and end (inclusive)
+        returns the same shape as PersistenceManager.load_data
+        """
+        query = "SELECT id, payload FROM blocks"
+        params: list = []
+        if start is not None or end is not None:
+            lo = start.toordinal() if start else date.min.toordinal()
+            hi = end.toordinal() if end else date.max.toordinal()
+            query += " WHERE start_day BETWEEN ? AND ?"
+            params = [lo, hi]
+        query += " ORDER BY start_day"
+        return self._load(query, params)
+
+    def load_working_set(self, since: date) -> Dict[str, Any]:
+        """
+        load what the scheduler needs at startup: blocks from `since` onwards,
+        every open task and every repeatable event, leaving older history on disk
+        """
+        query = """
+            SELECT id, payload FROM blocks WHERE start_day >= ?
+            UNION
+            SELECT id, payload FROM blocks WHERE is_completed = 0 AND type = 'task'
+            UNION
+            SELECT id, payload FROM blocks WHERE is_repeatable = 1
+        """
+        return self._load(query, [since.toordinal()])
+
+    def _load(self, query: str, params: list) -> Dict[str, Any]:
+        """run a block query and wrap the result like a decrypted data.json"""
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+            seq = self.conn.execute("SELECT value FROM meta WHERE key = 'journal_seq'").fetchone()
+            self._loaded_ids.update(row[0] for row in rows)
+        if not rows and seq is None:
+            return {}
+        return {
+            "schedule": {"name": "Schedule", "blocks": self._rows_to_blocks(rows)},
+            "journal_seq": int(seq[0]) if seq else 0
+        }
+
+    def is_empty(self) -> bool:
+        """true if nothing has been saved to the database yet"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM meta UNION ALL SELECT 1 FROM blocks UNION ALL SELECT 1 FROM archive LIMIT 1"
+            ).fetchone() is None
+
+    def load_period(self, start: date, end: date) -> List[dict]:
+        """
+        blocks starting between start and end that are not in memory yet;
+        used as Schedule.period_loader
+        """
+        with self._lock:
+            rows = self._unloaded_rows("WHERE start_day BETWEEN ? AND ?", [start.toordinal(), end.toordinal()])
+            self._loaded_ids.update(row[0] for row in rows)
+        return self._rows_to_blocks(rows)
+
+    def read_period(self, start: date, end: date) -> List[dict]:
+        """
+        like load_period, but the blocks read are not marked as in memory,
+        and archived blocks in the range are included
+        """
+        params = [start.toordinal(), end.toordinal()]
+        with self._lock:
+            rows = self._unloaded_rows("WHERE start_day BETWEEN ? AND ?", params)
+            rows += self.conn.execute(
+                "SELECT id, payload FROM archive WHERE start_day BETWEEN ? AND ? ORDER BY start_day", params
+            ).fetchall()
+        return self._rows_to_blocks(rows)
+
+    def stored_bounds(self) -> Optional[tuple]:
+        """(first, last) start dates of any stored or archived block, None if there are none"""
+        with self._lock:
+            first, last = self.conn.execute("""
+                SELECT MIN(start_day), MAX(start_day) FROM (
+                    SELECT start_day FROM blocks UNION ALL SELECT start_day FROM archive
+                )
+            """).fetchone()
+        if first is None:
+            return None
+        return date.fromordinal(first), date.fromordinal(last)
+
+    def iter_unloaded(self) -> Iterator[List[dict]]:
+        """blocks that are not in memory, then the archive, a chunk of rows at a time"""
+        for batch in self._iter_rows("blocks"):
+            batch = [bd for bd in batch if bd.get("id") not in self._loaded_ids]
+            if batch:
+                yield batch
+        yield from self._archive_batches()
+
+    def _unloaded_rows(self, where: str, params: list) -> list:
+        """id and payload of matching block rows not handed out yet (callers hold _lock)"""
+        rows = self.conn.execute(f"SELECT id, payload FROM blocks {where} ORDER BY start_day", params).fetchall()
+        return [row for row in rows if row[0] not in self._loaded_ids]
+
+    def _iter_rows(self, table: str) -> Iterator[List[dict]]:
+        """decrypted rows of a block table in chunks, taking the lock once per chunk"""
+        last = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT rowid, payload FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, self.CHUNK_ROWS)
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield self._rows_to_blocks(rows)
+
+    # history archive
+    def _write_archive(self) -> None:
+        """
+        insert queued archive batches into the archive table, safe to call from a worker thread
+        batches stay queued if the write fails, so the next save retries them
+        """
+        with self._archive_lock:
+            if not self._archive_queue:
+                return
+            rows = [
+                (bd.get("id") or uuid.uuid4().hex, self._day_number(bd["start"]), self._encrypt(bd))
+                for batch in self._archive_queue for bd in batch["blocks"]
+            ]
+            with self._lock, self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO archive VALUES (?, ?, ?)", rows)
+            self._archive_queue.clear()
+
+    def _archive_batches(self) -> Iterator[List[Dict[str, Any]]]:
+        """archived block dictionaries, a chunk of rows at a time"""
+        yield from self._iter_rows("archive")
+
+    # custom block templates
+    def _write_custom_blocks(self, data_to_save: dict) -> None:
+        """save each template as an encrypted row, keeping their order"""
+        templates = data_to_save["Templates"]["templates"]
+        rows = [(i, self._encrypt(t)) for i, t in enumerate(templates)]
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM templates")
+            self.conn.executemany("INSERT INTO templates VALUES (?, ?)", rows)
+
+    def load_custom_blocks(self) -> dict:
+        """load and decrypt templates in their saved order"""
+        with self._lock:
+            rows = self.conn.execute("SELECT payload FROM templates ORDER BY position").fetchall()
+        return {"templates": self._rows_to_blocks(rows)}
+
+    # settings
+    def _write_settings(self, data_to_save: dict) -> None:
+        """store each setting as its own JSON-encoded row"""
+        rows = [(key, json.dumps(value)) for key, value in data_to_save["settings"].items()]
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM settings")
+            self.conn.executemany("INSERT INTO settings VALUES (?, ?)", rows)
+
+    def load_settings(self) -> Dict[str, Any]:
+        """load settings as a dictionary, empty if none were saved"""
+        with self._lock:
+            rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self) -> None:
+        """close the database connection"""
+        self.conn.close()
+
+
+def migrate_json_to_sqlite(source: PersistenceManager, target: SQLitePersistenceManager) -> int:
+    """
+    one-shot copy of the JSON files (snapshot plus journal, months load_data
+    left on disk, the archive), settings and templates into a sqlite backend
+    sharing the same key
+    returns the number of blocks migrated, archived ones not counted
+    """
+    data = source.replay_journal(source.load_data())
+    blocks = data.get("schedule", {}).get("blocks", [])
+
+    # iter_unloaded ends with the archive, which goes to its own table
+    archived = source.load_archive()
+    archived_ids = {bd.get("id") for bd in archived}
+    for batch in source.iter_unloaded():
+        blocks.extend(bd for bd in batch if bd.get("id") not in archived_ids)
+
+    # blocks written before ids existed get one now so they can be indexed
+    for bd in blocks:
+        if not bd.get("id"):
+            bd["id"] = uuid.uuid4().hex
+
+    templates = source.load_custom_blocks() or {}
+
+    target.journal_seq = 0
+    if archived:
+        with target._archive_lock:
+            target._archive_queue.append({"blocks": archived})
+    target.save_data(_Snapshot({"name": "Schedule", "blocks": blocks}))
+    target.save_settings(_Snapshot(source.load_settings()))
+    target.save_custom_blocks(_Snapshot({"templates": templates.get("templates", [])}))
+    return len(blocks)
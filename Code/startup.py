@@ -0,0 +1,63 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict
+from PyQt5.QtCore import QObject, QEvent, pyqtSignal
+
+
+class StartupLoader(QObject):
+    """
+    runs independent startup loads (decrypting and parsing files) on worker
+    threads while the GUI thread builds the window
+
+    results are reported through `loaded` as (name, result); the signal is
+    queued onto the GUI thread, so handlers can safely touch widgets
+    """
+
+    loaded = pyqtSignal(str, object)
+    failed = pyqtSignal(str, object)
+
+    def __init__(self, jobs: Dict[str, Callable], parent=None) -> None:
+        super().__init__(parent)
+        self.jobs = jobs
+        self.futures = {}
+        self.started_at = time.perf_counter()
+
+    def start(self) -> None:
+        """submit every job; connect to loaded/failed before calling this"""
+        executor = ThreadPoolExecutor(max_workers=len(self.jobs))
+        for name, job in self.jobs.items():
+            self.futures[name] = executor.submit(job)
+            self.futures[name].add_done_callback(partial(self._job_done, name))
+        executor.shutdown(wait=False)
+
+    def result(self, name: str):
+        """wait for one job and return its result (re-raising its error)"""
+        return self.futures[name].result()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def _job_done(self, name: str, future) -> None:
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(name, error)
+        else:
+            self.loaded.emit(name, future.result())
+
+
+class FirstPaintTimer(QObject):
+    """event filter that reports how long after `started_at` a widget first painted"""
+
+    def __init__(self, started_at: float, label: str = "first paint", parent=None) -> None:
+        super().__init__(parent)
+        self.started_at = started_at
+        self.label = label
+        self.elapsed_ms = None
+
+    def eventFilter(self, obj, event) -> bool:
+        if event.type() == QEvent.Paint and self.elapsed_ms is None:
+            self.elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+            print(f"[STARTUP] {self.label} after {self.elapsed_ms:.0f} ms")
+            obj.removeEventFilter(self)
+        return False
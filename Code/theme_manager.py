@@ -12,6 +12,7 @@ class ThemeManager:
         """initialize the ThemeManager with a JSON file path"""
         self.themes_file = themes_file
         self.themes = self._load_themes()
+        self._qss_cache: Dict[str, str] = {}  # theme name -> compiled stylesheet
 
     def _load_themes(self) -> dict:
         """load theme definitions from a JSON file"""
@@ -22,11 +23,17 @@ class ThemeManager:
             return {}
 
     def get_theme(self, theme_name: str) -> str:
-        """get the QSS string for a theme"""
+        """get the QSS string for a theme, compiled once per theme"""
         if not theme_name:
             return ""
-        theme = self.themes.get(theme_name.lower(), {})
-        return self.theme_to_qss(theme)
+        name = theme_name.lower()
+        if name not in self._qss_cache:
+            self._qss_cache[name] = self.theme_to_qss(self.themes.get(name, {}))
+        return self._qss_cache[name]
+
+    def clear_cache(self) -> None:
+        """forget compiled stylesheets, e.g. after editing self.themes"""
+        self._qss_cache.clear()
 
     def get_theme_dict(self, theme_name: str) -> Dict:
         """get the raw theme dictionary"""
@@ -81,7 +88,7 @@ class ThemeManager:
             background: {theme.get('scrollbar_fg', '#C0C0C0')};
             border-radius: 4px;
         }}
-        QTableWidget {{
+        QTableView {{
             background-color: {theme.get('table_bg', '#FFFFFF')};
             color: {theme.get('table_fg', '#000000')};
             gridline-color: {theme.get('calendar_grid_light', '#EAEAEA')};
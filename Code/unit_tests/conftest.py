@@ -1,6 +1,59 @@
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # add the parent directory (Code/) to python path
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR))
+
+# widgets need a platform plugin; use the offscreen one unless told otherwise
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def app():
+    """one QApplication shared by every test that needs timers or widgets"""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def sandbox(pm, tmp_path, monkeypatch):
+    """point every file a persistence manager uses, its key included, into tmp_path"""
+    from cryptography.fernet import Fernet
+
+    monkeypatch.setattr(pm, "data_file", tmp_path / "data.json")
+    monkeypatch.setattr(pm, "settings_file", tmp_path / "settings.json")
+    monkeypatch.setattr(pm, "custom_blocks_file", tmp_path / "custom_blocks.json")
+    monkeypatch.setattr(pm, "archive_file", tmp_path / "archive.jsonl")
+    monkeypatch.setattr(pm, "journal_file", tmp_path / f"{type(pm).__name__}.journal")
+    monkeypatch.setattr(pm, "key_file", tmp_path / "secret.key")
+    if hasattr(pm, "partition_dir"):
+        monkeypatch.setattr(pm, "partition_dir", str(tmp_path / "partitions"))
+
+    # re-initialise encryption using the sandboxed key
+    pm.fernet = Fernet(pm._load_or_create_key())
+    return pm
+
+
+@pytest.fixture
+def make_pm(tmp_path, monkeypatch):
+    """
+    factory for sandboxed persistence managers, make_pm(cls=PersistenceManager, **kwargs)
+    managers made by one test share their files, so a second one sees a reopened store
+    """
+    from persistence_manager import PersistenceManager
+
+    # constructors create their key in the working directory before it can be redirected
+    monkeypatch.chdir(tmp_path)
+
+    def make(cls=PersistenceManager, **kwargs):
+        return sandbox(cls(**kwargs), tmp_path, monkeypatch)
+    return make
+
+
+@pytest.fixture
+def sandboxed_pm(make_pm):
+    """a PersistenceManager that writes ONLY into tmp_path and never touches real user files"""
+    return make_pm()
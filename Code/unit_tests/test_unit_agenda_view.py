@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime, timedelta
+from PyQt5.QtTest import QTest
+
+from agenda_view import AgendaModel, AgendaView
+from blocks import EventBlock
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+@pytest.fixture
+def schedule():
+    schedule = Schedule(Settings())
+    now = datetime.now().replace(second=0, microsecond=0)
+    schedule.blocks = [
+        EventBlock(f"b{i}", now + timedelta(hours=6 * i), timedelta(hours=1)) for i in range(-500, 500)
+    ]
+    schedule.layout_revision += 1
+    return schedule
+
+
+@pytest.fixture
+def agenda(app, schedule):
+    view = AgendaView(schedule, GUIUtils(ThemeManager(), schedule.settings))
+    view.resize(800, 600)
+    view.show()
+    view.refresh()
+    QTest.qWait(10)
+    return view
+
+
+def top_name(view):
+    return view.model.blocks[view.table.rowAt(0)].name
+
+
+def test_model_holds_a_bounded_window_of_pages(schedule):
+    model = AgendaModel(schedule, page_size=50, max_pages=3)
+    model.reset_to(datetime.now())
+    assert model.rowCount() == 100
+
+    while model.fetch_later():
+        assert model.rowCount() <= 150
+    assert model.blocks[-1].name == "b499"
+
+    while model.fetch_earlier():
+        assert model.rowCount() <= 150
+    assert model.blocks[0].name == "b-500"
+    assert [b.start for b in model.blocks] == sorted(b.start for b in model.blocks)
+
+
+def test_opens_at_the_current_time(agenda):
+    assert top_name(agenda) == "b1"
+
+
+def test_scrolling_to_the_top_reads_earlier_rows_in_place(agenda):
+    first = agenda.model.blocks[0].name
+    rows = agenda.model.rowCount()
+
+    agenda.table.verticalScrollBar().setValue(0)  # reaching the first row held reads the page before it
+    assert agenda.model.rowCount() > rows
+    assert top_name(agenda) == first
+
+
+def test_scrolling_down_far_keeps_memory_bounded(agenda):
+    scroll_bar = agenda.table.verticalScrollBar()
+    for _ in range(20):
+        scroll_bar.setValue(scroll_bar.maximum())
+        QTest.qWait(1)
+
+    model = agenda.model
+    assert model.rowCount() <= model.page_size * model.max_pages
+    assert model.blocks[-1].name == "b499"
+
+
+def test_double_click_opens_the_blocks_day(agenda):
+    opened = []
+    agenda.open_day.connect(opened.append)
+    index = agenda.model.index(agenda.table.rowAt(0), 2)
+
+    agenda.on_row_double_clicked(index)
+    assert opened == [agenda.model.blocks[index.row()].start.date()]
+
+
+def test_destroyed_view_stops_listening(app, schedule):
+    from PyQt5 import sip
+
+    view = AgendaView(schedule, GUIUtils(ThemeManager(), schedule.settings))
+    assert len(schedule._listeners) == 1
+
+    sip.delete(view)
+
+    assert schedule._listeners == []
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from autosave import AutosaveService
+from schedule import Schedule
+from settings import Settings
+from blocks import Task, CustomBlocks
+
+
+def test_change_starts_debounce_and_flush_writes(app, sandboxed_pm):
+    schedule = Schedule(Settings())
+    autosave = AutosaveService(sandboxed_pm, schedule, Settings(), CustomBlocks(), delay_ms=60000)
+
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+
+    assert autosave.dirty is True
+    assert autosave.debounce_timer.isActive()
+    assert autosave.max_timer.isActive()
+
+    autosave.flush_now()
+
+    assert autosave.dirty is False
+    names = [bd["name"] for bd in sandboxed_pm.load_data()["schedule"]["blocks"]]
+    assert names == ["Maths"]
+    autosave.stop()
+
+
+def test_stop_ignores_later_changes(app, sandboxed_pm):
+    schedule = Schedule(Settings())
+    autosave = AutosaveService(sandboxed_pm, schedule, Settings(), CustomBlocks())
+    autosave.stop()
+
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+
+    assert autosave.dirty is False
+    assert not autosave.debounce_timer.isActive()
+
+
+def test_settings_and_template_edits_mark_dirty(app, sandboxed_pm):
+    settings, customs = Settings(), CustomBlocks()
+    autosave = AutosaveService(sandboxed_pm, Schedule(settings), settings, customs, delay_ms=60000)
+
+    settings.add_holiday(datetime(2026, 1, 5).date(), datetime(2026, 1, 6).date())
+    assert autosave.dirty is True
+    autosave.flush_now()
+
+    customs.add_template({"name": "Gym", "type": "event", "duration": 60})
+    assert autosave.dirty is True
+    autosave.flush_now()
+
+    assert sandboxed_pm.load_custom_blocks()["templates"][0]["name"] == "Gym"
+    autosave.stop()
+    customs.add_template({"name": "Run", "type": "event", "duration": 30})
+    assert autosave.dirty is False
+
+
+def test_failed_write_is_retried_from_the_gui_thread(app, sandboxed_pm, monkeypatch):
+    from PyQt5.QtTest import QTest
+
+    schedule = Schedule(Settings())
+    autosave = AutosaveService(sandboxed_pm, schedule, Settings(), CustomBlocks(), delay_ms=60000)
+    errors = []
+    autosave.save_failed.connect(errors.append)
+
+    def fail(snapshot):
+        raise OSError("disk full")
+    monkeypatch.setattr(sandboxed_pm, "write_snapshot", fail)
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+    autosave.flush_now()
+
+    QTest.qWait(50)
+    assert len(errors) == 1
+    assert autosave.dirty is True
+    assert autosave.debounce_timer.isActive()
+    autosave.stop()
+
+
+def test_archive_is_written_with_the_snapshot_not_when_taken(app, sandboxed_pm):
+    schedule = Schedule(Settings())
+    task = Task("Maths", datetime(2025, 1, 1, 9, 0), timedelta(minutes=30))
+    task.is_completed = True
+    schedule.pending_archive.append(task)
+    schedule.revision += 1
+
+    snapshot = sandboxed_pm.snapshot_all(schedule, None, None)
+
+    assert schedule.pending_archive == []
+    assert not sandboxed_pm.archive_file.exists()
+    sandboxed_pm.write_snapshot(snapshot)
+    assert [bd["name"] for bd in sandboxed_pm.load_archive()] == ["Maths"]
@@ -0,0 +1,76 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from PyQt5.QtGui import QColor
+
+import codec
+from codec import JSONCodec, BinaryCodec
+from schedule import Schedule
+from blocks import Task, EventBlock
+
+
+def sample_data():
+    done = Task("Essay", datetime(2026, 3, 2, 9, 0), timedelta(minutes=45),
+                deadline=datetime(2026, 3, 4, 17, 30), notes="draft ✓", colour=QColor("#12ab34"))
+    done.is_completed = True
+    done.completed_at = datetime(2026, 3, 2, 9, 47, 13, 52)
+    blocks = [
+        done,
+        Task("Essay", datetime(2026, 3, 3, 9, 0), timedelta(minutes=30)),
+        EventBlock("Club", datetime(1969, 12, 31, 18, 0), timedelta(hours=1),
+                   location="Hall", priority=2, repeatable=True, interval=7)
+    ]
+    schedule_dict = {"name": "Schedule", "blocks": [Schedule.block_to_dict(b) for b in blocks]}
+    return {"schedule": schedule_dict, "journal_seq": 12}
+
+
+@pytest.mark.parametrize("chosen", [JSONCodec(), BinaryCodec()])
+def test_round_trip(chosen):
+    data = sample_data()
+    assert codec.decode(chosen.encode(data)) == data
+
+
+def test_binary_is_smaller_than_json():
+    data = sample_data()
+    data["schedule"]["blocks"] *= 200
+    assert len(BinaryCodec().encode(data)) < len(JSONCodec().encode(data)) / 2
+
+
+def test_unknown_fields_survive_binary_round_trip():
+    data = sample_data()
+    data["schedule"]["blocks"][1]["source"] = "ical"
+    assert codec.decode(BinaryCodec().encode(data)) == data
+
+
+def test_unpackable_data_falls_back_to_json():
+    data = sample_data()
+    data["schedule"]["blocks"][0]["start"] = "2026-03-02T09:00:00+01:00"
+
+    payload = BinaryCodec().encode(data)
+
+    assert payload[4] == JSONCodec.codec_id
+    assert codec.decode(payload) == data
+
+
+def test_headerless_payload_is_read_as_legacy_json():
+    data = sample_data()
+    assert codec.decode(json.dumps(data).encode("utf-8")) == data
+
+
+def test_newer_version_is_refused():
+    payload = codec.HEADER.pack(codec.MAGIC, BinaryCodec.codec_id, BinaryCodec.version + 1)
+    with pytest.raises(ValueError):
+        codec.decode(payload)
+
+
+def test_switching_codec_still_loads_existing_file(sandboxed_pm):
+    pm = sandboxed_pm
+    data = sample_data()
+
+    pm._write_data(data)
+    pm.codec = BinaryCodec()
+    assert pm.load_data() == data
+
+    pm._write_data(data)
+    pm.codec = JSONCodec()
+    assert pm.load_data() == data
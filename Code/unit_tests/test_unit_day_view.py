@@ -0,0 +1,147 @@
+import pytest
+from datetime import date, datetime, time, timedelta
+from PyQt5.QtTest import QTest
+
+from blocks import Task
+from day_view import DayView
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+@pytest.fixture
+def view(app):
+    settings = Settings()
+    schedule = Schedule(settings)
+    tomorrow = date.today() + timedelta(days=1)
+    task = Task("Essay", datetime.combine(tomorrow, time(10, 0)), timedelta(hours=1))
+    schedule.add_blocks([task], reschedule=False)
+
+    day_view = DayView(schedule, GUIUtils(ThemeManager(), settings), custom_blocks=None)
+    day_view.resize(600, day_view.minimumHeight())
+    day_view.set_current_day(tomorrow)
+    day_view.task = task
+    return day_view
+
+
+def count_ghost_updates(view, monkeypatch):
+    calls = []
+    original = view.find_nearest_non_colliding
+
+    def counting(start, duration):
+        calls.append(start)
+        return original(start, duration)
+    monkeypatch.setattr(view, "find_nearest_non_colliding", counting)
+    return calls
+
+
+def test_day_items_follow_the_shown_day(view):
+    assert view.day_items() == [view.task]
+    view.set_current_day(date.today() + timedelta(days=2))
+    assert view.day_items() == []
+
+
+def test_moves_within_a_frame_are_coalesced_to_the_latest(view, monkeypatch):
+    calls = count_ghost_updates(view, monkeypatch)
+    view.dragging_block = view.task
+
+    view.queue_pointer_move(view.time_to_y(datetime.combine(view.current_day, time(12, 0))))
+    for hour in (13, 14, 15):
+        view.queue_pointer_move(view.time_to_y(datetime.combine(view.current_day, time(hour, 0))))
+    assert len(calls) == 1  # only the first move so far, the rest wait for the frame
+
+    view.frame_timer.stop()
+    view.on_frame()
+    assert len(calls) == 2
+    assert view.task.ghost_start.time() == time(15, 0)
+
+
+def test_moves_inside_the_same_slot_do_no_work(view, monkeypatch):
+    calls = count_ghost_updates(view, monkeypatch)
+    view.dragging_block = view.task
+    y = view.time_to_y(datetime.combine(view.current_day, time(12, 0)))
+
+    for offset in (0, 3, -3, 5):
+        view.pending_pointer_y = y + offset
+        view.apply_pointer_move()
+    assert len(calls) == 1
+
+
+def test_release_applies_a_pending_move(view):
+    view.dragging_block = view.task
+    view.queue_pointer_move(view.time_to_y(datetime.combine(view.current_day, time(12, 0))))
+    view.queue_pointer_move(view.time_to_y(datetime.combine(view.current_day, time(16, 0))))
+
+    view.mouseReleaseEvent(None)
+
+    assert view.task.start.time() == time(16, 0)
+    assert view.dragging_block is None
+
+
+def test_drag_previews_displaced_blocks_until_release(view):
+    reading = Task("Reading", datetime.combine(view.current_day, time(11, 0)), timedelta(hours=1),
+                   deadline=datetime.combine(view.current_day + timedelta(days=2), time(20, 0)))
+    view.schedule.add_blocks([reading], reschedule=False)
+    view.dragging_block = view.task
+
+    view.queue_pointer_move(view.time_to_y(datetime.combine(view.current_day, time(15, 0))))
+    view.preview.pending.result(timeout=10)
+    QTest.qWait(50)  # the result is queued back to this thread
+
+    assert view.preview.result.start == view.task.ghost_start
+    assert [b.id for b in view.preview.result.displaced] == [reading.id]
+    assert reading.start.time() == time(11, 0)  # the real schedule is untouched
+    view.grab()
+
+    view.mouseReleaseEvent(None)
+    assert view.preview.result is None
+    assert view.preview_ghosts_shown == []
+
+
+def test_destroying_the_view_stops_the_preview_worker(view):
+    executor = view.preview.executor
+    view.deleteLater()
+    QTest.qWait(50)
+
+    with pytest.raises(RuntimeError):
+        executor.submit(print)  # shut down
+
+
+def count_day_queries(view, monkeypatch):
+    calls = []
+    original = view.schedule.day
+
+    def counting(day):
+        calls.append(day)
+        return original(day)
+    monkeypatch.setattr(view.schedule, "day", counting)
+    return calls
+
+
+def test_prefetched_days_render_from_the_cache(view, monkeypatch):
+    day_after = view.current_day + timedelta(days=1)
+    lecture = Task("Lecture", datetime.combine(day_after, time(9, 0)), timedelta(hours=1))
+    view.schedule.add_blocks([lecture], reschedule=False)
+    view.prefetch(day_after)
+    calls = count_day_queries(view, monkeypatch)
+
+    view.set_current_day(day_after)
+    assert view.day_items() == [lecture]
+    assert [item for _, item in view.layout_index.near(view.time_to_y(lecture.start) + 10)] == [lecture]
+
+    view.set_current_day(day_after - timedelta(days=1))  # the day we left was kept too
+    assert view.day_items() == [view.task]
+    assert calls == []
+
+
+def test_cached_days_are_reread_after_they_change(view, monkeypatch):
+    tomorrow = view.current_day
+    view.set_current_day(tomorrow + timedelta(days=1))
+    view.task.start += timedelta(hours=2)
+    view.schedule.layout_revision += 1
+    calls = count_day_queries(view, monkeypatch)
+
+    view.set_current_day(tomorrow)
+    assert calls == [tomorrow]
+    assert view.day_items() == [view.task]
@@ -0,0 +1,199 @@
+import io
+import tracemalloc
+from datetime import datetime, timedelta
+
+import ical
+from schedule import Schedule
+from settings import Settings
+from blocks import Task, EventBlock
+
+
+SAMPLE = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+UID:club-1\r
+SUMMARY:Chess club\\, weekly\r
+DTSTART:20260105T180000\r
+DTEND:20260105T193000\r
+RRULE:FREQ=WEEKLY;INTERVAL=2\r
+LOCATION:Room 4\r
+DESCRIPTION:bring a board\\nand a clock\r
+BEGIN:VALARM\r
+ACTION:DISPLAY\r
+SUMMARY:not the event name\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VTODO\r
+UID:essay-1\r
+SUMMARY:History essay with a rather long title that has to be folded over mor\r
+ e than one line\r
+DTSTART:20260106T090000\r
+DURATION:PT45M\r
+DUE:20260110T170000\r
+STATUS:COMPLETED\r
+END:VTODO\r
+END:VCALENDAR\r
+"""
+
+
+class RecordingSchedule:
+    """just enough of a schedule to count batches and scheduler runs"""
+
+    def __init__(self):
+        self.blocks = []
+        self.batches = 0
+        self.scheduler_runs = 0
+
+    def add_blocks(self, blocks, reschedule=True):
+        self.blocks.extend(blocks)
+        self.batches += 1
+
+    def global_edf_scheduler(self):
+        self.scheduler_runs += 1
+
+
+def test_import_maps_events_and_todos():
+    schedule = RecordingSchedule()
+
+    assert ical.import_ics(io.StringIO(SAMPLE), schedule) == (2, 0)
+
+    event, task = schedule.blocks
+    assert isinstance(event, EventBlock) and isinstance(task, Task)
+    assert event.name == "Chess club, weekly"
+    assert event.notes == "bring a board\nand a clock"
+    assert event.duration == timedelta(minutes=90)
+    assert event.repeatable and event.interval == 14
+    assert task.name.endswith("more than one line")
+    assert task.deadline == datetime(2026, 1, 10, 17, 0)
+    assert task.is_completed
+    assert task.id == "essay-1"
+
+
+def test_import_batches_and_schedules_once():
+    schedule = RecordingSchedule()
+    events = "".join(
+        f"BEGIN:VEVENT\r\nUID:e{i}\r\nSUMMARY:E{i}\r\nDTSTART:20260105T{i % 10 + 8:02d}0000\r\nEND:VEVENT\r\n"
+        for i in range(25)
+    )
+
+    ical.import_ics(io.StringIO(f"BEGIN:VCALENDAR\r\n{events}END:VCALENDAR\r\n"), schedule, batch_size=10)
+
+    assert schedule.batches == 3
+    assert schedule.scheduler_runs == 1
+
+
+def test_reimport_skips_known_uids():
+    schedule = RecordingSchedule()
+    ical.import_ics(io.StringIO(SAMPLE), schedule)
+
+    assert ical.import_ics(io.StringIO(SAMPLE), schedule) == (0, 0)
+
+
+def calendar(*events):
+    return "BEGIN:VCALENDAR\r\n" + "".join(
+        "BEGIN:VEVENT\r\n" + "".join(f"{line}\r\n" for line in event) + "END:VEVENT\r\n" for event in events
+    ) + "END:VCALENDAR\r\n"
+
+
+def test_all_day_events_are_skipped():
+    schedule = RecordingSchedule()
+    source = calendar(
+        ["UID:holiday", "SUMMARY:Bank holiday", "DTSTART;VALUE=DATE:20260504", "DTEND;VALUE=DATE:20260505"],
+        ["UID:talk", "SUMMARY:Talk", "DTSTART:20260504T100000"],
+    )
+
+    assert ical.import_ics(io.StringIO(source), schedule) == (1, 1)
+    assert [b.name for b in schedule.blocks] == ["Talk"]
+
+
+def test_finite_series_are_expanded():
+    schedule = RecordingSchedule()
+    source = calendar(
+        ["UID:course", "SUMMARY:Course", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=3"],
+        ["UID:camp", "SUMMARY:Camp", "DTSTART:20260105T180000", "RRULE:FREQ=DAILY;INTERVAL=2;UNTIL=20260109"],
+    )
+
+    assert ical.import_ics(io.StringIO(source), schedule) == (6, 0)
+    assert not any(b.repeatable for b in schedule.blocks)
+    course = [b.start for b in schedule.blocks if b.name == "Course"]
+    camp = [b.start.day for b in schedule.blocks if b.name == "Camp"]
+    assert course == [datetime(2026, 1, 5, 9, 0) + timedelta(days=7 * i) for i in range(3)]
+    assert camp == [5, 7, 9]
+    assert ical.import_ics(io.StringIO(source), schedule) == (0, 0)
+
+
+def test_series_too_long_to_expand_are_skipped():
+    schedule = RecordingSchedule()
+    source = calendar(["UID:forever-ish", "SUMMARY:Standup", "DTSTART:20260105T090000",
+                       f"RRULE:FREQ=DAILY;COUNT={ical.MAX_SERIES_OCCURRENCES + 1}"])
+
+    assert ical.import_ics(io.StringIO(source), schedule) == (0, 1)
+
+
+def test_export_round_trips_through_import():
+    schedule = Schedule(Settings())
+    schedule.blocks.append(EventBlock("Lab; group A", datetime(2026, 2, 2, 14, 0), timedelta(hours=2),
+                                      location="Block C", repeatable=True, interval=7))
+    schedule.blocks.append(Task("Revise", datetime(2026, 2, 3, 9, 0), timedelta(minutes=30),
+                                deadline=datetime(2026, 2, 5, 12, 0)))
+    schedule.blocks.append(Task("Lunch", datetime(2026, 2, 3, 12, 0), timedelta(minutes=30)))
+    out = io.StringIO()
+
+    assert ical.export_ics(schedule, out) == 2
+    assert all(len(line.encode()) <= 75 for line in out.getvalue().split("\r\n"))
+
+    imported = RecordingSchedule()
+    ical.import_ics(io.StringIO(out.getvalue()), imported)
+    task, event = imported.blocks  # repeating series are written last
+    assert (event.name, event.start, event.duration, event.interval) == \
+        ("Lab; group A", datetime(2026, 2, 2, 14, 0), timedelta(hours=2), 7)
+    assert (task.name, task.deadline, task.id) == ("Revise", datetime(2026, 2, 5, 12, 0), schedule.blocks[1].id)
+
+
+def test_export_writes_one_rrule_per_series():
+    schedule = Schedule(Settings())
+    start = datetime.now().replace(hour=18, minute=0, second=0, microsecond=0)
+    schedule.blocks.append(EventBlock("Club", start, timedelta(hours=1), repeatable=True, interval=7))
+    schedule._expand_repeats(schedule.blocks)
+    assert len(schedule.blocks) > 1
+    out = io.StringIO()
+
+    assert ical.export_ics(schedule, out) == 1
+    assert out.getvalue().count("RRULE:") == 1
+    assert f"DTSTART:{start:%Y%m%dT%H%M%S}" in out.getvalue()
+
+
+def test_export_includes_stored_blocks():
+    schedule = Schedule(Settings())
+    loaded = Task("Loaded", datetime(2026, 2, 3, 9, 0), timedelta(minutes=30))
+    schedule.blocks.append(loaded)
+    old_club = EventBlock("Club", datetime(2025, 1, 6, 18, 0), timedelta(hours=1), repeatable=True, interval=7)
+    stored = [
+        [schedule.block_to_dict(Task("Old essay", datetime(2025, 3, 1, 9, 0), timedelta(minutes=30)))],
+        [schedule.block_to_dict(old_club), schedule.block_to_dict(loaded)],
+    ]
+    schedule.blocks.append(EventBlock("Club", datetime(2026, 2, 2, 18, 0), timedelta(hours=1), repeatable=True, interval=7))
+    out = io.StringIO()
+
+    assert ical.export_ics(schedule, out, iter(stored)) == 3
+    assert "SUMMARY:Old essay" in out.getvalue()
+    assert "DTSTART:20250106T180000" in out.getvalue()
+
+
+def test_parser_memory_does_not_grow_with_file_size():
+    def components(count):
+        yield "BEGIN:VCALENDAR\r\n"
+        for i in range(count):
+            yield from ("BEGIN:VEVENT\r\n", f"UID:e{i}\r\n", "SUMMARY:E\r\n",
+                        "DTSTART:20260105T090000\r\n", "END:VEVENT\r\n")
+        yield "END:VCALENDAR\r\n"
+
+    def peak(count):
+        tracemalloc.start()
+        parsed = sum(1 for _ in ical.iter_components(components(count)))
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert parsed == count
+        return peak_bytes
+
+    assert peak(20_000) < peak(1_000) * 2
@@ -0,0 +1,63 @@
+import random
+from datetime import datetime, timedelta
+
+from PyQt5.QtCore import QRect
+
+from blocks import EventBlock, Task
+from layout_index import LayoutIndex
+
+
+def make_layout(count, seed=1):
+    """(rect, block) pairs the way DayView paints them: 2px per minute, in schedule order"""
+    rng = random.Random(seed)
+    day = datetime(2026, 3, 2)
+    layout = []
+    for i in range(count):
+        start = day + timedelta(minutes=rng.randrange(0, 23 * 60, 5))
+        duration = timedelta(minutes=rng.choice([15, 30, 60, 90]))
+        if rng.random() < 0.4:
+            block = EventBlock(f"event {i}", start, duration, is_fixed=True)
+        else:
+            block = Task(f"task {i}", start, duration)
+        top = int((start - day).total_seconds() // 60 * 2)
+        layout.append((QRect(60, top + 2, 400, int(duration.total_seconds() // 60 * 2) - 4), block))
+    return layout
+
+
+# ==================================================
+# hit testing
+# ==================================================
+def test_near_matches_a_linear_scan_in_topmost_first_order():
+    layout = make_layout(200)
+    index = LayoutIndex(layout)
+
+    for y in range(0, 2880, 7):
+        expected = [
+            (rect, item) for rect, item in reversed(layout)
+            if rect.top() - 6 <= y <= rect.bottom() + 6
+        ]
+        assert index.near(y, margin=6) == expected
+
+
+def test_near_on_an_empty_layout():
+    assert LayoutIndex([]).near(100) == []
+
+
+# ==================================================
+# fixed block lookups
+# ==================================================
+def test_fixed_from_covers_every_overlapping_fixed_block():
+    layout = make_layout(200, seed=2)
+    index = LayoutIndex(layout)
+    fixed = [item for _, item in layout if item.is_fixed]
+
+    start = datetime(2026, 3, 2, 9, 0)
+    end = start + timedelta(hours=2)
+    overlapping = {id(b) for b in fixed if b.start < end and b.end > start}
+
+    found = set()
+    for b in index.fixed_from(start):
+        if b.start >= end:
+            break
+        found.add(id(b))
+    assert overlapping <= found
@@ -0,0 +1,63 @@
+import pytest
+from datetime import date, datetime, time, timedelta
+
+from PyQt5 import sip
+from PyQt5.QtWidgets import QMessageBox
+
+from blocks import CustomBlocks, Task
+from main_window import MainWindow
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+@pytest.fixture
+def window(app, make_pm):
+    settings = Settings()
+    schedule = Schedule(settings)
+    win = MainWindow(schedule, settings, make_pm(), GUIUtils(ThemeManager(), settings), CustomBlocks())
+    yield win
+    win.optimize_timer.stop()
+    win.autosave.stop()
+    # destroy the views while the schedule they unregister from still exists
+    sip.delete(win)
+
+
+def test_optimizer_waits_for_edits_to_settle(window, monkeypatch):
+    runs = []
+    monkeypatch.setattr(window.schedule, "optimize", lambda: runs.append(True))
+    window.settings.scheduler_engine = "optimizer"
+
+    window.schedule.add_block(Task("Essay", None, timedelta(hours=1), deadline=datetime.now() + timedelta(days=7)))
+
+    assert runs == []
+    assert window.optimize_timer.isActive()
+    window.optimize_timer.timeout.emit()
+    assert runs == [True]
+
+
+def test_edf_engine_never_starts_the_optimizer(window):
+    window.schedule.add_block(Task("Essay", None, timedelta(hours=1), deadline=datetime.now() + timedelta(days=7)))
+
+    assert not window.optimize_timer.isActive()
+
+
+def test_settings_that_make_the_schedule_infeasible_warn(window, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(QMessageBox, "warning", lambda parent, title, text: warnings.append(text))
+    tomorrow = date.today() + timedelta(days=1)
+    due = datetime.combine(tomorrow, time(14, 0))
+    window.schedule.blocks = [
+        Task(f"Essay {hour}", datetime.combine(tomorrow, time(hour, 0)), timedelta(hours=2), deadline=due)
+        for hour in (8, 10, 12)
+    ]
+
+    # two working hours a day cannot fit six hours of work before tomorrow afternoon
+    before = window.settings.to_dict()
+    window.settings.start_time = window.settings.weekend_start = time(9, 0)
+    window.settings.end_time = window.settings.weekend_end = time(11, 0)
+    window.settings_view.settings_saved.emit(before)
+
+    assert len(warnings) == 1
+    assert "Essay" in warnings[0]
@@ -0,0 +1,84 @@
+from datetime import date, datetime, time, timedelta
+from PyQt5.QtCore import Qt
+
+from blocks import Task, EventBlock
+from other_views import MonthModel, MonthView
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+def test_model_grid_starts_on_the_monday_before_the_first():
+    model = MonthModel()
+    model.set_month(2026, 4, [])  # 1 April 2026 is a Wednesday
+
+    assert model.data(model.index(0, 0), MonthModel.DATE_ROLE) == date(2026, 3, 30)
+    assert model.data(model.index(0, 3), MonthModel.DATE_ROLE) == date(2026, 4, 1)
+    assert model.data(model.index(0, 1), MonthModel.IN_MONTH_ROLE) is False
+    assert model.data(model.index(0, 3), MonthModel.IN_MONTH_ROLE) is True
+    assert model.data(model.index(0, 0)) == "WC 30/03"
+
+
+def test_model_keeps_the_three_longest_tasks_without_meals():
+    day = date(2026, 4, 8)
+    blocks = [
+        Task(name, datetime.combine(day, time(9 + i)), timedelta(minutes=minutes))
+        for i, (name, minutes) in enumerate([("a", 15), ("b", 90), ("c", 30), ("d", 60)])
+    ]
+    blocks.append(EventBlock("lunch", datetime.combine(day, time(12)), timedelta(hours=3)))
+    model = MonthModel()
+    model.set_month(2026, 4, blocks)
+
+    index = model.index(1, 3)  # wednesday of the second week
+    assert model.data(index, MonthModel.DATE_ROLE) == day
+    assert model.data(index, MonthModel.TASKS_ROLE) == ["b", "d", "c"]
+
+
+def test_changing_month_swaps_data_not_the_model(app):
+    settings = Settings()
+    schedule = Schedule(settings)
+    view = MonthView(schedule, GUIUtils(ThemeManager(), settings))
+    model = view.month_model
+    opened = []
+    view.open_day.connect(opened.append)
+
+    view.change_to_month(4, 2026)
+    view.change_month(1)
+
+    assert view.month_model is model
+    assert view.month_label.text() == "May 2026"
+    view.on_cell_clicked(0, 5)  # friday of the first week: 1 May 2026
+    assert opened == [date(2026, 5, 1)]
+
+
+def test_refresh_fetches_all_six_weeks_in_one_query(app, monkeypatch):
+    settings = Settings()
+    schedule = Schedule(settings)
+    view = MonthView(schedule, GUIUtils(ThemeManager(), settings))
+    last_cell = date(2026, 5, 10)  # sunday of the sixth week shown for April 2026
+    schedule.blocks.append(Task("late", datetime.combine(last_cell, time(9)), timedelta(minutes=30)))
+    calls = []
+    monkeypatch.setattr(schedule, "period_loader", lambda start, end: calls.append((start, end)) or [])
+
+    view.change_to_month(4, 2026)
+
+    assert calls == [(date(2026, 3, 30), last_cell)]
+    assert view.month_model.data(view.month_model.index(5, 7), MonthModel.TASKS_ROLE) == ["late"]
+
+
+def test_set_month_updates_week_headers_and_marks_today():
+    model = MonthModel()
+    headers = []
+    model.headerDataChanged.connect(lambda *args: headers.append(args))
+    today = date.today()
+
+    model.set_month(today.year, today.month, [])
+
+    assert headers == [(Qt.Vertical, 0, 5)]
+    assert model.headerData(0, Qt.Vertical) == model.data(model.index(0, 0))
+    flags = [
+        model.data(model.index(row, col), MonthModel.IS_TODAY_ROLE)
+        for row in range(6) for col in range(1, 8)
+    ]
+    assert flags.count(True) == 1
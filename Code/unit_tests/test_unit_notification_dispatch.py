@@ -0,0 +1,82 @@
+import time
+
+from notification_dispatch import NotificationDispatcher, RecordingBackend
+
+
+def test_submit_does_not_wait_for_a_slow_backend():
+    slow = RecordingBackend(delay=0.3)
+    dispatcher = NotificationDispatcher([slow], coalesce_ms=0, timeout=1)
+
+    started = time.perf_counter()
+    dispatcher.submit("title", "message")
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.05
+    assert dispatcher.wait_idle()
+    assert slow.sent == [("title", "message")]
+    dispatcher.stop()
+
+
+def test_burst_is_coalesced_into_one_summary():
+    backend = RecordingBackend()
+    dispatcher = NotificationDispatcher([backend], coalesce_ms=200)
+
+    for name in ["Maths", "Physics", "Chemistry"]:
+        dispatcher.submit("yoo hoo", f"09:00 – {name}")
+    dispatcher.wait_idle()
+    dispatcher.stop()
+
+    assert backend.sent == [("3 blocks starting soon", "09:00 – Maths\n09:00 – Physics\n09:00 – Chemistry")]
+
+
+def test_timed_out_backend_falls_back_and_backs_off():
+    hung, fallback = RecordingBackend(delay=1.0), RecordingBackend()
+    hung.name = "hung"
+    dispatcher = NotificationDispatcher([hung, fallback], coalesce_ms=0, timeout=0.05, backoff=60)
+
+    dispatcher.submit("a", "first")
+    dispatcher.wait_idle()
+    started = time.perf_counter()
+    dispatcher.submit("b", "second")
+    dispatcher.wait_idle()
+
+    assert [m for _, m in fallback.sent] == ["first", "second"]
+    assert time.perf_counter() - started < 0.05  # the hung backend was skipped, not waited on
+    assert dispatcher.failures["hung"] == 1
+    assert isinstance(dispatcher.errors["hung"], TimeoutError)
+    dispatcher.stop()
+
+
+def test_failing_backend_backoff_doubles():
+    broken, fallback = RecordingBackend(fail=True), RecordingBackend()
+    broken.name = "broken"
+    dispatcher = NotificationDispatcher([broken, fallback], coalesce_ms=0, backoff=0.01, max_backoff=0.02)
+
+    for i in range(3):
+        dispatcher.submit("t", str(i))
+        dispatcher.wait_idle()
+        time.sleep(0.03)
+    dispatcher.stop()
+
+    assert len(fallback.sent) == 3
+    assert dispatcher.failures["broken"] == 3
+    assert str(dispatcher.errors["broken"]) == "recording backend set to fail"
+    assert dispatcher.errors[fallback.name] is None
+
+
+def test_sends_reuse_one_helper_thread():
+    backend = RecordingBackend()
+    dispatcher = NotificationDispatcher([backend], coalesce_ms=0)
+
+    dispatcher.submit("t", "first")
+    dispatcher.wait_idle()
+    helper = dispatcher.sender
+    for i in range(5):
+        dispatcher.submit("t", str(i))
+        dispatcher.wait_idle()
+
+    assert len(backend.sent) == 6
+    assert dispatcher.sender is helper and helper.is_alive()
+    dispatcher.stop()
+    helper.join(1)
+    assert not helper.is_alive()
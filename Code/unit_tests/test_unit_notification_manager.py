@@ -0,0 +1,103 @@
+import pytest
+from datetime import datetime, timedelta
+
+import notification_manager
+from notification_manager import NotificationManager
+from notification_dispatch import NotificationDispatcher, RecordingBackend
+from schedule import Schedule
+from settings import Settings
+from blocks import EventBlock
+
+
+@pytest.fixture
+def manager(app, monkeypatch):
+    schedule = Schedule(Settings())
+    dispatcher = NotificationDispatcher([RecordingBackend()], coalesce_ms=0)
+    nm = NotificationManager(schedule, schedule.settings, None, None, dispatcher=dispatcher)
+    shown = []
+    monkeypatch.setattr(nm, "show_notification", shown.append)
+    nm.shown = shown
+    yield nm
+    dispatcher.stop()
+
+
+def event_in(minutes, name="Lecture"):
+    start = datetime.now() + timedelta(minutes=minutes)
+    return EventBlock(name, start, timedelta(minutes=30))
+
+
+def test_due_block_notified_once(manager):
+    block = event_in(10)
+    manager.schedule.add_block(block)
+
+    assert manager.timer.isActive()
+    manager.check_notifications()
+    manager.check_notifications()
+
+    assert manager.shown == [block]
+
+
+def test_timer_waits_for_next_due_time(manager):
+    manager.schedule.add_block(event_in(150))
+
+    manager.check_notifications()
+
+    assert manager.shown == []
+    assert manager.timer.interval() == NotificationManager.MAX_WAIT_MS
+
+
+def test_moved_and_removed_blocks_use_latest_state(manager):
+    moved, removed = event_in(10, "Moved"), event_in(10, "Removed")
+    manager.schedule.add_block(moved)
+    manager.schedule.add_block(removed)
+
+    moved.start += timedelta(hours=3)
+    manager.schedule.update_block(moved)
+    manager.schedule.remove_block(removed)
+    manager.check_notifications()
+
+    assert manager.shown == []
+    assert len(manager.pending) == 1
+
+
+def test_heap_stays_bounded_across_reschedules(manager):
+    blocks = [event_in(60 * (i + 2), f"Lecture {i}") for i in range(10)]
+    manager.schedule.blocks.extend(blocks)
+    manager.rebuild()
+
+    # every scheduler run moves every block to a new, still future start
+    for run in range(200):
+        for block in blocks:
+            block.start += timedelta(minutes=5)
+        manager.schedule._notify("move", blocks)
+
+    assert len(manager.pending) == 10
+    assert len(manager.heap) <= 2 * len(manager.pending)
+
+
+def test_notified_entries_pruned_once_started(manager, monkeypatch):
+    manager.schedule.add_block(event_in(10))
+    manager.check_notifications()
+    assert len(manager.notified) == 1
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(minutes=15)
+
+    monkeypatch.setattr(notification_manager, "datetime", Later)
+    manager.check_notifications()
+
+    assert manager.notified == {}
+
+
+def test_show_notification_goes_through_dispatcher(app):
+    backend = RecordingBackend()
+    dispatcher = NotificationDispatcher([backend], coalesce_ms=0)
+    nm = NotificationManager(Schedule(Settings()), Settings(), None, None, dispatcher=dispatcher)
+
+    nm.show_notification(EventBlock("Lecture", datetime(2026, 1, 5, 9, 0), timedelta(hours=1)))
+    dispatcher.wait_idle()
+    dispatcher.stop()
+
+    assert backend.sent == [("yoo hoo", "09:00 – Lecture")]
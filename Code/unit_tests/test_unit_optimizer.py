@@ -0,0 +1,98 @@
+import time as _time
+from datetime import datetime, timedelta, time
+
+from optimizer import ScheduleOptimizer
+from blocks import Task, EventBlock
+
+
+class DummySettings:
+    def get_day_bounds(self, dt):
+        start = datetime.combine(dt.date(), time(7, 0))
+        end = datetime.combine(dt.date(), time(22, 0))
+        return start, end
+
+
+BASE = datetime(2026, 1, 5, 9, 0)
+
+
+def make_tasks(names):
+    """tasks laid out back to back from BASE, as EDF would place them"""
+    tasks = []
+    for i, name in enumerate(names):
+        tasks.append(Task(
+            name,
+            BASE + timedelta(hours=i),
+            timedelta(hours=1),
+            deadline=BASE + timedelta(days=2)
+        ))
+    return tasks
+
+
+def test_optimizer_groups_tasks_to_reduce_context_switches():
+    tasks = make_tasks(["Maths", "Physics", "Maths"])
+    optimizer = ScheduleOptimizer(DummySettings(), budget_ms=50, seed=1)
+    before = optimizer_cost(optimizer, tasks)
+
+    improved = optimizer.improve(tasks, [], BASE)
+
+    assert improved is True
+    assert optimizer_cost(optimizer, tasks) < before
+    names = [t.name for t in sorted(tasks, key=lambda t: t.start)]
+    assert names in (["Maths", "Maths", "Physics"], ["Physics", "Maths", "Maths"])
+
+
+def test_optimizer_never_worse_than_edf():
+    tasks = make_tasks(["A", "B", "C", "D"])
+    original = {t: t.start for t in tasks}
+    optimizer = ScheduleOptimizer(DummySettings(), budget_ms=20, seed=3)
+
+    # already compact with distinct names, nothing strictly better exists
+    assert optimizer.improve(tasks, [], BASE) is False
+    assert {t: t.start for t in tasks} == original
+
+
+def test_optimizer_respects_fixed_blocks():
+    tasks = make_tasks(["Maths", "Physics", "Maths", "Physics"])
+    lecture = EventBlock("Lecture", BASE + timedelta(hours=4), timedelta(hours=1), priority=2)
+    optimizer = ScheduleOptimizer(DummySettings(), budget_ms=50, seed=7)
+
+    optimizer.improve(tasks, [lecture], BASE)
+
+    for t in tasks:
+        assert t.start >= BASE
+        assert not (t.start < lecture.end and t.end > lecture.start)
+
+
+def test_optimizer_stays_within_budget():
+    names = [f"T{i % 7}" for i in range(300)]
+    tasks = make_tasks(names)
+    optimizer = ScheduleOptimizer(DummySettings(), budget_ms=20, seed=5)
+
+    started = _time.perf_counter()
+    optimizer.improve(tasks, [], BASE)
+    elapsed_ms = (_time.perf_counter() - started) * 1000
+
+    assert elapsed_ms < 20 + 30  # budget plus slack for one in-flight step
+
+
+def test_lateness_outweighs_any_saving_in_switches():
+    tasks = make_tasks(["Maths", "Physics"] * 60)
+    for t in tasks:
+        t.deadline = None
+    tasks[-2].deadline = BASE + timedelta(hours=120)
+    optimizer = ScheduleOptimizer(DummySettings(), seed=1)
+    on_time = optimizer_cost(optimizer, tasks)
+
+    # grouped by name, one task ends a second past its deadline
+    grouped = [t for t in tasks if t.name == "Physics"] + [t for t in tasks if t.name == "Maths"]
+    late = optimizer.cost({t: BASE + timedelta(hours=i, seconds=1) for i, t in enumerate(grouped)})
+
+    assert late[1] < on_time[1]
+    assert late > on_time
+
+
+def optimizer_cost(optimizer, tasks):
+    optimizer.fixed = []
+    optimizer.start_pointer = BASE
+    optimizer.deadline = _time.perf_counter() + 1
+    return optimizer.cost({t: t.start for t in tasks})
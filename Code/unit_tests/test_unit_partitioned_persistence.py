@@ -0,0 +1,126 @@
+import pytest
+from datetime import date, datetime, timedelta
+
+from partitioned_persistence_manager import PartitionedPersistenceManager
+from schedule import Schedule
+from settings import Settings
+from blocks import Task, EventBlock
+
+
+@pytest.fixture
+def make_partitioned(make_pm):
+    return lambda: make_pm(PartitionedPersistenceManager)
+
+
+OLD = datetime.combine(date.today().replace(day=1), datetime.min.time()) - timedelta(days=200)
+NOW = datetime.now().replace(second=0, microsecond=0)
+
+
+def completed(name, start):
+    task = Task(name, start, timedelta(minutes=30))
+    task.is_completed = True
+    return task
+
+
+def make_schedule():
+    schedule = Schedule(Settings())
+    schedule.blocks.append(completed("Old essay", OLD))
+    schedule.blocks.append(Task("Open essay", OLD + timedelta(days=35), timedelta(minutes=30)))
+    schedule.blocks.append(completed("Recent essay", NOW))
+    return schedule
+
+
+def loaded_names(pm):
+    return {bd["name"] for bd in pm.load_data()["schedule"]["blocks"]}
+
+
+def test_startup_loads_recent_and_open_months_only(make_partitioned):
+    make_partitioned().save_data(make_schedule())
+
+    assert loaded_names(make_partitioned()) == {"Open essay", "Recent essay"}
+
+
+def test_views_pull_older_months_on_demand(make_partitioned):
+    make_partitioned().save_data(make_schedule())
+    pm = make_partitioned()
+    schedule = Schedule(Settings())
+    schedule.from_dict(pm.load_data()["schedule"])
+    schedule.period_loader = pm.load_period
+
+    assert [b.name for b in schedule.day(OLD)] == ["Old essay"]
+    assert pm.load_period(OLD.date(), OLD.date()) == []
+    assert len(schedule.blocks) == 3
+
+
+def test_unloaded_months_and_archive_are_streamed_without_loading(make_partitioned):
+    schedule = make_schedule()
+    archived = completed("Archived essay", OLD - timedelta(days=60))
+    schedule.pending_archive.append(archived)
+    make_partitioned().save_data(schedule)
+    pm = make_partitioned()
+    pm.load_data()
+
+    batches = [[bd["name"] for bd in batch] for batch in pm.iter_unloaded()]
+
+    assert batches == [["Old essay"], ["Archived essay"]]
+    assert pm.load_period(OLD.date(), OLD.date())[0]["name"] == "Old essay"
+
+
+def test_agenda_pages_stored_months_and_archive_without_loading(make_partitioned):
+    schedule = make_schedule()
+    schedule.pending_archive.append(completed("Archived essay", OLD - timedelta(days=60)))
+    make_partitioned().save_data(schedule)
+    pm = make_partitioned()
+    schedule = Schedule(Settings())
+    schedule.from_dict(pm.load_data()["schedule"])
+    schedule.range_reader = pm.read_period
+    schedule.range_bounds = pm.stored_bounds
+    loaded = set(pm._loaded)
+
+    names = [b.name for page in schedule.iter_range(NOW + timedelta(hours=1), forward=False, page_size=1)
+             for b in page]
+
+    assert names == ["Recent essay", "Open essay", "Old essay", "Archived essay"]
+    assert len(schedule.blocks) == 2
+    assert pm._loaded == loaded
+
+
+def test_only_changed_months_are_rewritten(make_partitioned, tmp_path):
+    pm = make_partitioned()
+    schedule = make_schedule()
+    pm.save_data(schedule)
+    files = {p.name: p.read_bytes() for p in (tmp_path / "partitions").glob("*.part")}
+
+    schedule.blocks[2].name = "Renamed essay"
+    pm.save_data(schedule)
+
+    changed = {p.name for p in (tmp_path / "partitions").glob("*.part") if p.read_bytes() != files[p.name]}
+    assert changed == {f"{NOW:%Y-%m}.part"}
+
+
+def test_block_added_to_unread_month_keeps_its_neighbours(make_partitioned):
+    make_partitioned().save_data(make_schedule())
+    pm = make_partitioned()
+    schedule = Schedule(Settings())
+    schedule.from_dict(pm.load_data()["schedule"])
+
+    schedule.blocks.append(EventBlock("Old club", OLD + timedelta(hours=2), timedelta(hours=1)))
+    pm.save_data(schedule)
+
+    pm = make_partitioned()
+    pm.load_data()
+    names = {bd["name"] for bd in pm.load_period(OLD.date(), OLD.date())}
+    assert names == {"Old essay", "Old club"}
+
+
+def test_legacy_data_file_is_split_on_first_save(make_pm, make_partitioned, tmp_path):
+    make_pm().save_data(make_schedule())
+    pm = make_partitioned()
+    schedule = Schedule(Settings())
+    schedule.from_dict(pm.load_data()["schedule"])
+    assert len(schedule.blocks) == 3
+
+    pm.save_data(schedule)
+
+    assert (tmp_path / "partitions" / "manifest.json").exists()
+    assert loaded_names(make_partitioned()) == {"Open essay", "Recent essay"}
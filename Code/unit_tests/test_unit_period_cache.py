@@ -0,0 +1,22 @@
+from period_cache import PeriodCache
+
+
+def test_entries_built_at_an_older_key_are_dropped():
+    cache = PeriodCache()
+    cache.put("mon", ("mon", 1), "blocks")
+
+    assert cache.get("mon", ("mon", 1)) == "blocks"
+    assert cache.get("mon", ("mon", 2)) is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PeriodCache(capacity=2)
+    cache.put("mon", 1, "a")
+    cache.put("tue", 1, "b")
+    cache.get("mon", 1)
+    cache.put("wed", 1, "c")
+
+    assert cache.get("tue", 1) is None
+    assert cache.get("mon", 1) == "a"
+    assert cache.get("wed", 1) == "c"
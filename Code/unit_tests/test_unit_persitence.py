@@ -1,8 +1,11 @@
-import pytest
+import threading
 from pathlib import Path
 from cryptography.fernet import InvalidToken
 
-from persistence_manager import PersistenceManager
+from schedule import Schedule
+from settings import Settings
+from blocks import Task
+from datetime import datetime, timedelta
 
 
 class DummySchedule:
@@ -15,26 +18,6 @@ class DummySettings:
         return {"theme": "dark", "autosave": True}
 
 
-@pytest.fixture
-def sandboxed_pm(tmp_path, monkeypatch):
-    """
-    Creates a PersistenceManager that writes ONLY into tmp_path
-    and never touches real user files.
-    """
-    pm = PersistenceManager()
-
-    monkeypatch.setattr(pm, "data_file", tmp_path / "data.json")
-    monkeypatch.setattr(pm, "settings_file", tmp_path / "settings.json")
-    monkeypatch.setattr(pm, "custom_blocks_file", tmp_path / "custom_blocks.json")
-    monkeypatch.setattr(pm, "key_file", tmp_path / "secret.key")
-
-    # re-initialise encryption using sandboxed key
-    from cryptography.fernet import Fernet
-    pm.fernet = Fernet(pm._load_or_create_key())
-
-    return pm
-
-
 # =========================
 # TESTS
 # =========================
@@ -69,3 +52,145 @@ def test_corrupt_encrypted_file(sandboxed_pm):
 
     data = sandboxed_pm.load_data()
     assert data == {}
+
+
+def test_archive_is_appended_and_loaded(sandboxed_pm):
+    schedule = Schedule(settings=None)
+
+    for name in ["Maths", "Physics"]:
+        task = Task(name, datetime(2025, 1, 1, 9, 0), timedelta(minutes=30))
+        task.is_completed = True
+        schedule.pending_archive.append(task)
+        sandboxed_pm.save_data(schedule)
+
+    # a torn final write must not hide earlier batches
+    with open(sandboxed_pm.archive_file, "ab") as f:
+        f.write(b"garbage")
+
+    assert schedule.pending_archive == []
+    assert [bd["name"] for bd in sandboxed_pm.load_archive()] == ["Maths", "Physics"]
+
+
+def test_archive_keeps_distinct_blocks_sharing_name_and_start(sandboxed_pm):
+    schedule = Schedule(settings=None)
+    first = Task("Maths", datetime(2025, 1, 1, 9, 0), timedelta(minutes=30))
+    second = Task("Maths", datetime(2025, 1, 1, 9, 0), timedelta(minutes=30))
+    schedule.pending_archive.extend([first, second])
+    sandboxed_pm.save_data(schedule)
+
+    # the same block archived twice is still loaded once
+    schedule.pending_archive.append(first)
+    sandboxed_pm.save_data(schedule)
+
+    assert sorted(bd["id"] for bd in sandboxed_pm.load_archive()) == sorted([first.id, second.id])
+
+
+def test_journal_replays_changes_since_snapshot(sandboxed_pm):
+    schedule = Schedule(Settings())
+    sandboxed_pm.save_data(schedule)
+    sandboxed_pm.attach_journal(schedule)
+
+    kept = Task("Maths", datetime.now(), timedelta(minutes=30))
+    dropped = Task("Physics", datetime.now(), timedelta(minutes=30))
+    schedule.add_block(kept)
+    schedule.add_block(dropped)
+    schedule.mark_complete(kept)
+    schedule.remove_block(dropped)
+
+    # simulate a crash: nothing but the journal was written since the snapshot
+    sandboxed_pm.flush_journal()
+    with open(sandboxed_pm.journal_file, "ab") as f:
+        f.write(b"torn")
+
+    data = sandboxed_pm.replay_journal(sandboxed_pm.load_data())
+    blocks = data["schedule"]["blocks"]
+
+    assert [bd["name"] for bd in blocks] == ["Maths"]
+    assert blocks[0]["is_completed"] is True
+    assert blocks[0]["start"] == kept.start.isoformat()
+
+
+def test_compaction_empties_journal(sandboxed_pm):
+    schedule = Schedule(Settings())
+    sandboxed_pm.attach_journal(schedule)
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+
+    sandboxed_pm.compact_journal(schedule)
+
+    assert sandboxed_pm.journal_file.read_bytes() == b""
+    data = sandboxed_pm.replay_journal(sandboxed_pm.load_data())
+    assert [bd["name"] for bd in data["schedule"]["blocks"]] == ["Maths"]
+
+
+def test_burst_of_changes_is_one_journal_record_synced_off_the_gui_thread(sandboxed_pm, monkeypatch):
+    import persistence_manager
+    schedule = Schedule(Settings())
+    sandboxed_pm.attach_journal(schedule)
+    synced = []
+    real_fsync = persistence_manager.os.fsync
+    monkeypatch.setattr(persistence_manager.os, "fsync",
+                        lambda fd: (synced.append(threading.get_ident()), real_fsync(fd)))
+
+    # the writer is busy (a slow disk) while a burst of edits and scheduler runs lands
+    with sandboxed_pm._journal_lock:
+        for i in range(20):
+            schedule.add_block(Task(f"Task {i}", datetime.now(), timedelta(minutes=30),
+                                    deadline=datetime.now() + timedelta(days=7)))
+    sandboxed_pm.flush_journal()
+
+    assert len(synced) == 1
+    assert threading.get_ident() not in synced
+    data = sandboxed_pm.replay_journal(sandboxed_pm.load_data())
+    assert len(data["schedule"]["blocks"]) == 20
+
+
+def test_save_leaves_no_temporary_file(sandboxed_pm, tmp_path):
+    sandboxed_pm.save_data(DummySchedule())
+    sandboxed_pm.save_data(DummySchedule())
+
+    assert list(tmp_path.glob("*.tmp")) == []
+    assert sandboxed_pm.load_data()["schedule"]["blocks"] == ["Maths", "Physics"]
+
+
+def test_snapshot_written_later_keeps_newer_journal_entries(sandboxed_pm):
+    schedule = Schedule(Settings())
+    sandboxed_pm.attach_journal(schedule)
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+
+    # snapshot taken, then another edit lands before the background write finishes
+    snapshot = sandboxed_pm.snapshot_all(schedule, Settings(), None)
+    schedule.add_block(Task("Physics", datetime.now(), timedelta(minutes=30)))
+    sandboxed_pm.write_snapshot(snapshot)
+
+    data = sandboxed_pm.replay_journal(sandboxed_pm.load_data())
+    assert sorted(bd["name"] for bd in data["schedule"]["blocks"]) == ["Maths", "Physics"]
+    assert sandboxed_pm.load_settings()["theme"] == "light"
+
+
+def test_save_all_skips_unchanged_components(sandboxed_pm, monkeypatch):
+    from blocks import CustomBlocks
+    schedule, settings, customs = Schedule(Settings()), Settings(), CustomBlocks()
+    sandboxed_pm.save_all(schedule, settings, customs)
+
+    writes = []
+    for name in ("_write_data", "_write_settings", "_write_custom_blocks"):
+        monkeypatch.setattr(sandboxed_pm, name, lambda data, name=name: writes.append(name))
+
+    sandboxed_pm.save_all(schedule, settings, customs)
+    assert writes == []
+
+    schedule.add_block(Task("Maths", datetime.now(), timedelta(minutes=30)))
+    customs.add_template({"name": "Gym", "type": "event"})
+    sandboxed_pm.save_all(schedule, settings, customs)
+    assert sorted(writes) == ["_write_custom_blocks", "_write_data"]
+
+
+def test_loaded_objects_can_be_marked_clean(sandboxed_pm, monkeypatch):
+    settings = Settings()
+    settings.from_dict(sandboxed_pm.load_settings())
+    sandboxed_pm.mark_saved(settings=settings)
+    writes = []
+    monkeypatch.setattr(sandboxed_pm, "_write_settings", writes.append)
+
+    sandboxed_pm.save_all(None, settings, None)
+    assert writes == []
@@ -0,0 +1,159 @@
+import threading
+import pytest
+from concurrent.futures import CancelledError
+from datetime import datetime, timedelta, time
+
+from PyQt5.QtTest import QTest
+
+from blocks import Task
+from reschedule_preview import ReschedulePreview, speculate
+from schedule import Schedule
+from settings import Settings
+
+
+class DummySettings:
+    break_interval = timedelta(minutes=90)
+    break_duration = timedelta(minutes=15)
+    meal_duration = timedelta(minutes=30)
+    meal_windows = {
+        "breakfast": (time(7, 0), time(9, 0)),
+        "lunch": (time(12, 0), time(14, 0)),
+        "dinner": (time(18, 0), time(20, 0)),
+    }
+    history_duration = timedelta(days=7)
+
+    def get_day_bounds(self, dt):
+        return datetime.combine(dt.date(), time(7, 0)), datetime.combine(dt.date(), time(22, 0))
+
+    def is_holiday(self, dt):
+        return False
+
+
+def tomorrow_at(hour, minute=0):
+    return datetime.combine(datetime.now().date() + timedelta(days=1), time(hour, minute))
+
+
+@pytest.fixture
+def schedule():
+    schedule = Schedule(DummySettings())
+    schedule.blocks = [
+        Task("Essay", tomorrow_at(10), timedelta(hours=1), deadline=tomorrow_at(21)),
+        Task("Reading", tomorrow_at(11), timedelta(hours=1), deadline=tomorrow_at(21)),
+    ]
+    return schedule
+
+
+def wait_for(app, future):
+    """let a preview job finish and deliver its queued result"""
+    try:
+        future.result(timeout=10)
+    except CancelledError:
+        pass
+    QTest.qWait(50)  # the done callback runs just after result() returns
+
+
+def test_speculate_reports_displaced_blocks_without_touching_the_schedule(schedule):
+    essay, reading = schedule.blocks
+    stored = schedule.to_dict()["blocks"]
+
+    result = speculate(schedule.settings, stored, essay.id, tomorrow_at(15), pointer=tomorrow_at(7))
+
+    assert result.infeasible is None
+    assert [b.id for b in result.displaced] == [reading.id]
+    assert result.displaced[0].start != reading.start
+    assert result.displaced[0] is not reading
+    assert (essay.start, reading.start) == (tomorrow_at(10), tomorrow_at(11))
+
+
+def test_speculate_flags_an_infeasible_drop(schedule):
+    essay, reading = schedule.blocks
+    reading.deadline = tomorrow_at(8)
+    stored = schedule.to_dict()["blocks"]
+
+    blocked = speculate(schedule.settings, stored, essay.id, tomorrow_at(7), pointer=tomorrow_at(7))
+    clear = speculate(schedule.settings, stored, essay.id, tomorrow_at(12), pointer=tomorrow_at(7))
+
+    assert "Reading" in blocked.infeasible
+    assert blocked.displaced == []
+    assert clear.infeasible is None
+
+
+def test_only_the_latest_request_is_reported(app, schedule):
+    preview = ReschedulePreview(schedule)
+    reported = []
+    preview.ready.connect(reported.append)
+    essay = schedule.blocks[0]
+
+    preview.begin(essay)
+    gate = threading.Event()
+    preview.executor.submit(gate.wait)  # hold the worker so the requests queue up
+    preview.request(tomorrow_at(13))
+    first = preview.pending
+    preview.request(tomorrow_at(14))
+    preview.request(tomorrow_at(15))
+    gate.set()
+    wait_for(app, preview.pending)
+
+    assert first.cancelled()
+    assert [r.start for r in reported] == [tomorrow_at(15)]
+    assert preview.result.start == tomorrow_at(15)
+    preview.stop()
+
+
+def test_cancel_drops_a_queued_preview(app, schedule):
+    preview = ReschedulePreview(schedule)
+    reported = []
+    preview.ready.connect(reported.append)
+
+    preview.begin(schedule.blocks[0])
+    gate = threading.Event()
+    running = preview.executor.submit(gate.wait)
+    preview.request(tomorrow_at(15))
+    future = preview.pending
+    preview.cancel()
+    gate.set()
+    wait_for(app, running)
+
+    assert future.cancelled()
+    assert reported == []
+    assert preview.result is None
+    preview.request(tomorrow_at(16))  # nothing to preview once cancelled
+    assert preview.pending is None
+    preview.stop()
+
+
+def test_the_worker_reads_settings_as_they_were_when_the_drag_began(app, schedule):
+    settings = Settings()
+    schedule.settings = settings
+    preview = ReschedulePreview(schedule)
+
+    preview.begin(schedule.blocks[0])
+    settings.end_time = time(8, 0)  # edited while the drag is in flight
+    snapshot = preview.settings
+
+    assert snapshot is not settings
+    assert snapshot.end_time == time(22, 0)
+    assert snapshot._listeners == []
+    preview.stop()
+
+
+def test_a_failed_preview_clears_the_result_and_reports_nothing(app, schedule, monkeypatch):
+    preview = ReschedulePreview(schedule)
+    reported = []
+    preview.ready.connect(reported.append)
+    preview.begin(schedule.blocks[0])
+    preview.request(tomorrow_at(15))
+    wait_for(app, preview.pending)
+    assert len(reported) == 1
+
+    def broken(*args):
+        raise ValueError("bad block")
+    monkeypatch.setattr("reschedule_preview.speculate", broken)
+    preview.request(tomorrow_at(16))
+    with pytest.raises(ValueError):
+        preview.pending.result(timeout=10)
+    QTest.qWait(50)
+
+    assert len(reported) == 1
+    assert preview.result is None
+    preview.stop()
@@ -1,7 +1,8 @@
 import pytest
-from datetime import datetime, timedelta, time
+from datetime import date, datetime, timedelta, time
 
 from schedule import Schedule
+from settings import Settings
 from blocks import Task, EventBlock
 
 
@@ -68,6 +69,25 @@ def test_remove_block(schedule):
     assert task not in schedule.blocks
 
 
+def test_clear_history_moves_old_blocks_to_archive(schedule):
+    old_date = datetime.now() - timedelta(days=10)
+
+    old_task = Task("Old task", old_date, timedelta(minutes=30))
+    old_task.is_completed = True
+    recent_task = Task("Recent task", datetime.now(), timedelta(minutes=30))
+
+    schedule.blocks.extend([old_task, recent_task])
+    schedule.archive_loader = lambda: [{
+        "type": "task", "name": "Ancient", "start": "2020-01-01T09:00:00",
+        "duration": 30, "is_completed": True
+    }]
+    schedule.clear_history()
+
+    assert schedule.blocks == [recent_task]
+    assert schedule.pending_archive == [old_task]
+    assert {b.name for b in schedule.archived()} == {"Ancient", "Old task"}
+
+
 def test_day_retrieval(schedule):
     today = datetime.now()
 
@@ -231,3 +251,136 @@ def test_clear_for_time_within_same_day(schedule):
     # allow tiny execution delay
     assert captured["pointer"] >= before + delta
 
+
+
+# ==========================
+# Partial recomputation after settings changes
+# ==========================
+
+def next_weekday(offset_days):
+    day = datetime.now().date() + timedelta(days=offset_days)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def test_meal_change_only_redecorates():
+    settings = Settings()
+    schedule = Schedule(settings)
+    day = next_weekday(3)
+    task = Task("Essay", datetime.combine(day, time(10, 0)), timedelta(hours=1))
+    schedule.blocks = [task]
+
+    before = settings.to_dict()
+    settings.meal_duration = timedelta(minutes=45)
+    schedule.apply_settings_change(before)
+
+    meals = [b for b in schedule.blocks if b.name == "lunch"]
+    assert task.start == datetime.combine(day, time(10, 0))
+    assert meals and all(m.duration == timedelta(minutes=45) for m in meals)
+
+
+def test_holiday_change_only_moves_tasks_on_affected_days():
+    settings = Settings()
+    schedule = Schedule(settings)
+    holiday = next_weekday(3)
+    other_day = next_weekday((holiday - datetime.now().date()).days + 1)
+    on_holiday = Task("Essay", datetime.combine(holiday, time(7, 30)), timedelta(hours=1))
+    elsewhere = Task("Revision", datetime.combine(other_day, time(7, 30)), timedelta(hours=1))
+    schedule.blocks = [on_holiday, elsewhere]
+
+    before = settings.to_dict()
+    settings.add_holiday(holiday, holiday)
+    schedule.apply_settings_change(before)
+
+    assert on_holiday.start >= datetime.combine(holiday, settings.weekend_start)
+    assert elsewhere.start == datetime.combine(other_day, time(7, 30))
+
+
+def test_theme_change_does_not_reschedule():
+    settings = Settings()
+    schedule = Schedule(settings)
+    called = []
+    schedule.global_edf_scheduler = lambda *args, **kwargs: called.append(True)
+
+    before = settings.to_dict()
+    settings.theme = "dark"
+    schedule.apply_settings_change(before)
+
+    assert called == []
+
+
+def test_optimizer_runs_only_on_explicit_reschedules(monkeypatch):
+    import optimizer
+    settings = Settings()
+    settings.scheduler_engine = "optimizer"
+    schedule = Schedule(settings)
+    runs = []
+    monkeypatch.setattr(optimizer.ScheduleOptimizer, "improve", lambda self, tasks, *args: runs.append(len(tasks)))
+    for name in ("Essay", "Revision"):
+        schedule.add_block(Task(name, None, timedelta(hours=1), deadline=datetime.now() + timedelta(days=7)))
+
+    assert runs == []
+    schedule.optimize()
+    assert runs == [2]
+
+
+def test_day_revision_changes_only_for_touched_days(schedule):
+    day = datetime.now().date() + timedelta(days=30)
+    other_day = day + timedelta(days=1)
+    event = EventBlock("Lecture", datetime.combine(day, time(10, 0)), timedelta(hours=1))
+    elsewhere = EventBlock("Club", datetime.combine(other_day, time(10, 0)), timedelta(hours=1))
+    schedule.add_blocks([event, elsewhere])  # first run adds meals to both days
+
+    day_rev = schedule.day_revision(day)
+    other_rev = schedule.day_revision(other_day)
+    assert schedule.day_revision(day) == day_rev  # nothing changed, nothing bumped
+
+    event.name = "Seminar"
+    schedule.update_block(event)
+    assert schedule.day_revision(day) != day_rev
+    assert schedule.day_revision(other_day) == other_rev
+
+    day_rev = schedule.day_revision(day)
+    schedule.remove_block(elsewhere)
+    assert schedule.day_revision(other_day) != other_rev
+    assert schedule.day_revision(day) == day_rev
+
+
+def test_iter_range_walks_both_ways_in_pages(schedule):
+    anchor = datetime(2030, 1, 1, 12, 0)
+    events = [EventBlock(f"e{i}", anchor + timedelta(hours=i), timedelta(minutes=30)) for i in range(-5, 5)]
+    lunch = Task("lunch", anchor, timedelta(minutes=30))  # generated meals are left out
+    schedule.blocks = events[::-1] + [lunch]
+    schedule.layout_revision += 1
+
+    later = list(schedule.iter_range(anchor, page_size=3))
+    earlier = list(schedule.iter_range(anchor, forward=False, page_size=3))
+
+    assert [[b.name for b in page] for page in later] == [["e0", "e1", "e2"], ["e3", "e4"]]
+    assert [[b.name for b in page] for page in earlier] == [["e-3", "e-2", "e-1"], ["e-5", "e-4"]]
+    resumed = next(schedule.iter_range(events[6].start, page_size=2, after_id=events[6].id))
+    assert [b.name for b in resumed] == ["e2", "e3"]
+
+
+def test_iter_range_reads_stored_months_without_keeping_them(schedule):
+    anchor = datetime(2030, 6, 15, 9, 0)
+    stored = [Schedule.block_to_dict(b) for b in [
+        EventBlock("April", datetime(2030, 4, 2, 9, 0), timedelta(hours=1)),
+        EventBlock("Long ago", datetime(2029, 1, 10, 9, 0), timedelta(hours=1)),
+        EventBlock("Archived", datetime(2028, 3, 1, 9, 0), timedelta(hours=1)),
+    ]]
+    requested = []
+
+    def range_reader(start, end):
+        requested.append((start, end))
+        return [bd for bd in stored if start.isoformat() <= bd["start"][:10] <= end.isoformat()]
+    schedule.range_reader = range_reader
+    schedule.range_bounds = lambda: (date(2028, 3, 1), date(2030, 4, 30))
+    in_memory = list(schedule.blocks)
+
+    pages = schedule.iter_range(anchor, forward=False, page_size=1)
+    assert [b.name for b in next(pages)] == ["April"]
+    assert requested[-1] == (date(2030, 4, 1), date(2030, 4, 30))  # nothing further back was read yet
+    assert [b.name for page in pages for b in page] == ["Long ago", "Archived"]
+    assert schedule.blocks == in_memory
@@ -104,3 +104,68 @@ def test_get_day_bounds_weekend():
 
     assert start.time() == s.weekend_start
     assert end.time() == s.weekend_end
+
+
+def test_overlapping_holidays_are_merged_for_lookup():
+    s = Settings()
+    s.add_holiday(date(2026, 3, 1), date(2026, 3, 5))
+    s.add_holiday(date(2026, 3, 4), date(2026, 3, 10))
+    s.add_holiday(date(2026, 1, 1), date(2026, 1, 1))
+
+    assert s.is_holiday(date(2026, 3, 8)) is True
+    assert s.is_holiday(datetime(2026, 1, 1, 12, 0)) is True
+    assert s.is_holiday(date(2026, 3, 11)) is False
+    assert s.is_holiday(date(2025, 12, 31)) is False
+
+
+def test_day_bounds_cache_invalidated_by_changes():
+    s = Settings()
+    tuesday = date(2026, 1, 6)
+
+    assert s.get_day_bounds(tuesday)[0].time() == time(7, 0)
+
+    s.start_time = time(8, 0)
+    assert s.get_day_bounds(tuesday)[0].time() == time(8, 0)
+
+    s.add_holiday(tuesday, tuesday)
+    assert s.get_day_bounds(tuesday)[0].time() == s.weekend_start
+
+    s.from_dict({"holiday_ranges": []})
+    assert s.get_day_bounds(tuesday)[0].time() == time(8, 0)
+
+
+def test_day_bounds_cache_is_bounded():
+    s = Settings()
+    first = date(2026, 1, 5)
+    for offset in range(s.DAY_BOUNDS_CACHE_SIZE + 10):
+        s.get_day_bounds(first + timedelta(days=offset))
+
+    assert len(s._day_bounds_cache) == s.DAY_BOUNDS_CACHE_SIZE
+    assert first not in s._day_bounds_cache
+    assert s.get_day_bounds(first)[0].time() == time(7, 0)
+
+
+def test_change_impact_classification():
+    s = Settings()
+    before = s.to_dict()
+
+    s.theme = "dark"
+    s.notification_frequency = timedelta(minutes=10)
+    assert s.change_impact(s.changed_fields(before)) == "none"
+
+    s.break_interval = timedelta(minutes=60)
+    assert s.change_impact(s.changed_fields(before)) == "decoration"
+
+    s.add_holiday(date(2026, 5, 1), date(2026, 5, 2))
+    assert s.change_impact(s.changed_fields(before)) == "placement"
+
+
+def test_revision_bumped_by_changes():
+    s = Settings()
+    start = s.revision
+
+    s.theme = "dark"
+    s.add_holiday(date(2026, 1, 1), date(2026, 1, 2))
+    s.get_day_bounds(datetime(2026, 1, 5))  # reading (and caching) is not a change
+
+    assert s.revision == start + 2
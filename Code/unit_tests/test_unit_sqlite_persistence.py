@@ -0,0 +1,126 @@
+import pytest
+import sqlite3
+from datetime import date, datetime, timedelta
+
+from sqlite_persistence_manager import SQLitePersistenceManager, migrate_json_to_sqlite
+from schedule import Schedule
+from settings import Settings
+from blocks import Task, EventBlock
+
+
+@pytest.fixture
+def sqlite_pm(make_pm, tmp_path):
+    pm = make_pm(SQLitePersistenceManager, db_file=str(tmp_path / "data.db"))
+    yield pm
+    pm.close()
+
+
+def make_schedule():
+    schedule = Schedule(Settings())
+    for offset in [0, 40, 400]:
+        task = Task(f"Task {offset}", datetime(2026, 1, 1, 9, 0) + timedelta(days=offset), timedelta(minutes=30))
+        task.is_completed = offset != 400
+        schedule.blocks.append(task)
+    schedule.blocks.append(EventBlock("Club", datetime(2025, 1, 1, 18, 0), timedelta(hours=1), repeatable=True, interval=7))
+    return schedule
+
+
+def test_range_load_only_returns_blocks_in_range(sqlite_pm):
+    sqlite_pm.save_data(make_schedule())
+
+    data = sqlite_pm.load_data(start=date(2026, 1, 1), end=date(2026, 2, 28))
+
+    assert [bd["name"] for bd in data["schedule"]["blocks"]] == ["Task 0", "Task 40"]
+
+
+def test_working_set_keeps_open_tasks_and_repeatables(sqlite_pm):
+    sqlite_pm.save_data(make_schedule())
+
+    data = sqlite_pm.load_working_set(since=date(2026, 2, 1))
+
+    assert {bd["name"] for bd in data["schedule"]["blocks"]} == {"Task 40", "Task 400", "Club"}
+
+
+def test_saving_a_partial_load_keeps_unloaded_rows(sqlite_pm, make_pm, tmp_path):
+    sqlite_pm.save_data(make_schedule())
+
+    reopened = make_pm(SQLitePersistenceManager, db_file=str(tmp_path / "data.db"))
+    schedule = Schedule(Settings())
+    schedule.from_dict(reopened.load_data(start=date(2026, 1, 1), end=date(2026, 2, 28))["schedule"])
+    schedule.blocks = [b for b in schedule.blocks if b.name != "Task 0"]
+    schedule.blocks.append(Task("New", datetime(2026, 1, 20, 9, 0), timedelta(minutes=30)))
+    reopened.save_data(schedule)
+
+    names = {bd["name"] for bd in reopened.load_data()["schedule"]["blocks"]}
+    reopened.close()
+    assert names == {"Task 40", "Task 400", "Club", "New"}
+
+
+def test_payloads_are_encrypted(sqlite_pm):
+    sqlite_pm.save_data(make_schedule())
+
+    raw = sqlite3.connect(sqlite_pm.db_file).execute("SELECT payload FROM blocks").fetchall()
+
+    assert all(b"Task" not in payload for (payload,) in raw)
+
+
+def test_migrate_from_json(make_pm, sqlite_pm):
+    json_pm = make_pm()
+    json_pm.save_data(make_schedule())
+    json_pm.save_settings(Settings())
+
+    migrated = migrate_json_to_sqlite(json_pm, sqlite_pm)
+
+    assert migrated == 4
+    assert len(sqlite_pm.load_data()["schedule"]["blocks"]) == 4
+    assert sqlite_pm.load_settings()["theme"] == "light"
+
+
+def test_archived_blocks_go_to_their_own_table(sqlite_pm):
+    schedule = make_schedule()
+    old = schedule.blocks.pop(0)
+    schedule.pending_archive.append(old)
+    sqlite_pm.save_data(schedule)
+
+    assert [bd["name"] for bd in sqlite_pm.load_archive()] == ["Task 0"]
+    assert "Task 0" not in {bd["name"] for bd in sqlite_pm.load_data()["schedule"]["blocks"]}
+    assert [bd["name"] for bd in sqlite_pm.read_period(date(2026, 1, 1), date(2026, 1, 31))] == ["Task 0"]
+    assert sqlite_pm.stored_bounds() == (date(2025, 1, 1), date(2027, 2, 5))
+
+
+def test_period_loads_hand_out_each_block_once(sqlite_pm, make_pm, tmp_path):
+    sqlite_pm.save_data(make_schedule())
+    reopened = make_pm(SQLitePersistenceManager, db_file=str(tmp_path / "data.db"))
+    reopened.load_data(start=date(2026, 1, 1), end=date(2026, 1, 31))
+
+    peeked = [bd["name"] for bd in reopened.read_period(date(2026, 1, 1), date(2026, 2, 28))]
+    loaded = [bd["name"] for bd in reopened.load_period(date(2026, 1, 1), date(2026, 2, 28))]
+    again = reopened.load_period(date(2026, 1, 1), date(2026, 2, 28))
+    unloaded = [[bd["name"] for bd in batch] for batch in reopened.iter_unloaded()]
+    reopened.close()
+
+    assert peeked == loaded == ["Task 40"]
+    assert again == []
+    assert unloaded == [["Task 400", "Club"]]
+
+
+def test_sqlite_switch_copies_partitions_and_archive_in_once(make_pm):
+    from partitioned_persistence_manager import PartitionedPersistenceManager
+    from main import make_persistence_manager
+
+    now = datetime.now().replace(microsecond=0)
+    schedule = Schedule(Settings())
+    old = Task("Old essay", now - timedelta(days=200), timedelta(minutes=30))
+    old.is_completed = True
+    schedule.blocks += [old, Task("Essay", now + timedelta(days=1), timedelta(minutes=30))]
+    schedule.pending_archive.append(Task("Archived essay", now - timedelta(days=400), timedelta(minutes=30)))
+    make_pm(PartitionedPersistenceManager).save_data(schedule)
+
+    pm = make_persistence_manager(["main.py", "--sqlite"])
+    blocks = {bd["name"] for bd in pm.load_data()["schedule"]["blocks"]}
+    archived = [bd["name"] for bd in pm.load_archive()]
+    pm.close()
+
+    assert isinstance(pm, SQLitePersistenceManager)
+    assert blocks == {"Old essay", "Essay"}
+    assert archived == ["Archived essay"]
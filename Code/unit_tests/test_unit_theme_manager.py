@@ -19,3 +19,39 @@ def test_get_theme_dict_unknown_theme():
 def test_get_font_fallback():
     tm = ThemeManager()
     assert tm.get_font("nonexistent", fallback="Arial") == "Arial"
+
+
+def test_get_theme_compiles_each_theme_once():
+    tm = ThemeManager()
+    calls = []
+    original = tm.theme_to_qss
+    tm.theme_to_qss = lambda theme: calls.append(theme) or original(theme)
+
+    first = tm.get_theme("Dark")
+    assert tm.get_theme("dark") is first
+    assert len(calls) == 1
+
+    tm.clear_cache()
+    tm.get_theme("dark")
+    assert len(calls) == 2
+
+
+def test_apply_theme_skips_restyling_when_unchanged(app, monkeypatch):
+    from settings import Settings
+    from utils import GUIUtils
+
+    tm = ThemeManager()
+    tm.themes = {"dark": {"background": "#111111"}, "light": {"background": "#FAFAFA"}}
+    util = GUIUtils(tm, Settings())
+    app.setStyleSheet("")
+    applied = []
+    set_style_sheet = app.setStyleSheet
+    monkeypatch.setattr(app, "setStyleSheet", lambda sheet: (applied.append(sheet), set_style_sheet(sheet)))
+
+    util.apply_theme("dark")
+    util.apply_theme("dark")
+    assert applied == [tm.get_theme("dark")]
+
+    util.apply_theme("light")
+    assert applied == [tm.get_theme("dark"), tm.get_theme("light")]
+    set_style_sheet("")
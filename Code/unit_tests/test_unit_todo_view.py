@@ -0,0 +1,97 @@
+import pytest
+from datetime import datetime, timedelta
+from PyQt5.QtCore import Qt
+
+from blocks import Task
+from other_views import ToDoListView, ToDoModel
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+
+
+@pytest.fixture
+def todo(app):
+    settings = Settings()
+    schedule = Schedule(settings)
+    base = datetime.now() + timedelta(days=3)
+    schedule.add_blocks([
+        Task("Essay", base, timedelta(minutes=90), deadline=base + timedelta(days=2)),
+        Task("maths", base + timedelta(hours=2), timedelta(minutes=30), deadline=base + timedelta(days=1)),
+        Task("Reading", base + timedelta(hours=4), timedelta(minutes=45)),
+    ], reschedule=False)
+    return ToDoListView(schedule, GUIUtils(ThemeManager(), settings))
+
+
+def names(view):
+    return [view.proxy.index(row, 1).data() for row in range(view.proxy.rowCount())]
+
+
+def test_rows_come_from_the_model(todo):
+    assert isinstance(todo.model, ToDoModel)
+    assert sorted(names(todo)) == ["Essay", "Reading", "maths"]
+
+
+def test_search_filters_case_insensitively(todo):
+    todo.filter_tasks("ESS")
+    assert names(todo) == ["Essay"]
+    todo.filter_tasks("")
+    assert len(names(todo)) == 3
+
+
+def test_header_clicks_cycle_ascending_descending_original(todo):
+    original = names(todo)
+
+    todo.handle_header_click(2)  # deadline, missing deadlines last
+    assert names(todo) == ["maths", "Essay", "Reading"]
+    todo.handle_header_click(2)
+    assert names(todo) == ["Reading", "Essay", "maths"]
+    todo.handle_header_click(2)
+    assert names(todo) == original
+
+    todo.handle_header_click(3)  # duration, compared as durations not text
+    assert names(todo) == ["maths", "Reading", "Essay"]
+
+
+def test_checking_a_task_completes_it_and_removes_only_its_row(todo):
+    resets = []
+    todo.model.modelReset.connect(lambda: resets.append(True))
+    essay = next(t for t in todo.model.tasks if t.name == "Essay")
+    row = todo.model.row_of(essay)
+
+    todo.model.setData(todo.model.index(row, 0), Qt.Checked, Qt.CheckStateRole)
+
+    assert essay.is_completed
+    assert "Essay" not in names(todo)
+    assert resets == []
+
+
+def test_row_lookup_follows_inserts_and_removals(todo):
+    model = todo.model
+    first = model.tasks[0]
+    todo.schedule.add_blocks([Task("Lab report", datetime.now() + timedelta(days=5), timedelta(hours=1))],
+                             reschedule=False)
+
+    model.remove_task(first)
+
+    assert model.row_of(first) == -1
+    assert [model.row_of(t) for t in model.tasks] == list(range(len(model.tasks)))
+    assert model.rows == {t.id: row for row, t in enumerate(model.tasks)}
+
+
+def test_new_tasks_appear_without_a_refresh(todo):
+    todo.schedule.add_blocks([Task("Lab report", datetime.now() + timedelta(days=5), timedelta(hours=1))],
+                             reschedule=False)
+    assert "Lab report" in names(todo)
+
+
+def test_destroyed_view_stops_listening(todo):
+    from PyQt5 import sip
+
+    schedule = todo.schedule
+    assert todo._on_schedule_change in schedule._listeners
+
+    sip.delete(todo)
+
+    assert schedule._listeners == []
+    schedule.add_block(Task("After", datetime.now() + timedelta(days=5), timedelta(minutes=30)))
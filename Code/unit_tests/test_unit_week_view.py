@@ -0,0 +1,129 @@
+import pytest
+from datetime import date, datetime, time, timedelta
+from PyQt5.QtGui import QColor
+from PyQt5.QtTest import QTest
+
+from blocks import Task, EventBlock
+from schedule import Schedule
+from settings import Settings
+from theme_manager import ThemeManager
+from utils import GUIUtils
+from week_view import WeekViewContainer
+
+
+def next_monday():
+    today = date.today()
+    return today + timedelta(days=7 - today.weekday())
+
+
+@pytest.fixture
+def week(app):
+    settings = Settings()
+    schedule = Schedule(settings)
+    container = WeekViewContainer(schedule, GUIUtils(ThemeManager(), settings))
+    container.resize(900, 700)
+    container.set_current_week(next_monday())
+    return container
+
+
+def test_switching_weeks_keeps_the_same_canvas(week):
+    canvas = week.canvas
+
+    week.go_to_next_week()
+
+    assert week.canvas is canvas
+    assert canvas.week_start == next_monday() + timedelta(days=7)
+    assert week.day_labels[0].text().startswith("Monday")
+
+
+def test_theme_switch_recolours_the_canvas(week, monkeypatch):
+    canvas = week.canvas
+    palette = {"light": QColor("#eeeeee"), "dark": QColor("#222222")}
+    monkeypatch.setattr(canvas.util.tm, "get_colour", lambda theme, key: palette[theme])
+    week.refresh_week_view()
+    light_grid = canvas.grid_pixmap()
+
+    canvas.util.settings.theme = "dark"
+    week.refresh_week_view()
+
+    assert canvas.col_grid_dark == palette["dark"]
+    assert canvas.col_block_default == palette["dark"]
+    assert canvas.grid_pixmap() is not light_grid
+
+
+def test_week_items_come_from_one_query_and_follow_changes(week):
+    schedule = week.canvas.schedule
+    monday = next_monday()
+    lecture = EventBlock("Lecture", datetime.combine(monday + timedelta(days=2), time(10, 0)), timedelta(hours=1))
+    schedule.add_blocks([lecture], reschedule=False)
+
+    items = week.canvas.week_items()
+    assert lecture in items[monday + timedelta(days=2)]
+
+    schedule.remove_block(lecture)
+    assert lecture not in week.canvas.week_items().get(monday + timedelta(days=2), [])
+
+
+def test_drag_moves_a_task_across_columns(week):
+    canvas = week.canvas
+    monday = next_monday()
+    task = Task("Essay", datetime.combine(monday, time(10, 0)), timedelta(hours=1),
+                deadline=datetime.combine(monday + timedelta(days=6), time(20, 0)))
+    canvas.schedule.add_blocks([task], reschedule=False)
+    canvas.repaint()
+
+    week.start_drag(task, monday)
+    target = datetime.combine(monday + timedelta(days=3), time(14, 0))
+    week.update_ghost(target.date(), target)
+    week.commit_drop(target.date())
+
+    assert week.current_dragging_block is None
+    assert task.start.date() == target.date()
+
+
+def test_drop_outside_the_week_cancels(week):
+    monday = next_monday()
+    task = Task("Essay", datetime.combine(monday, time(10, 0)), timedelta(hours=1))
+    week.canvas.schedule.add_blocks([task], reschedule=False)
+
+    week.start_drag(task, monday)
+    week.update_ghost(None, None)
+    week.commit_drop(None)
+
+    assert task.start == datetime.combine(monday, time(10, 0))
+    assert week.current_dragging_block is None
+
+
+def test_drag_previews_the_drop_until_it_is_committed(week):
+    monday = next_monday()
+    task = Task("Essay", datetime.combine(monday, time(10, 0)), timedelta(hours=1))
+    week.canvas.schedule.add_blocks([task], reschedule=False)
+
+    week.start_drag(task, monday)
+    target = datetime.combine(monday + timedelta(days=1), time(14, 0))
+    week.update_ghost(target.date(), target)
+    week.preview.pending.result(timeout=10)
+    QTest.qWait(50)  # the result is queued back to this thread
+
+    assert week.preview.result.start == target
+    assert week.preview.result.infeasible is None
+    week.canvas.grab()
+
+    week.commit_drop(target.date())
+    assert week.preview.result is None
+
+
+def test_neighbouring_weeks_are_prefetched(week, monkeypatch):
+    following = next_monday() + timedelta(days=7)
+    lecture = EventBlock("Lecture", datetime.combine(following, time(10, 0)), timedelta(hours=1))
+    week.canvas.schedule.add_blocks([lecture], reschedule=False)
+    week.prefetch_neighbours()
+
+    calls = []
+    original = week.canvas.schedule.week
+    monkeypatch.setattr(week.canvas.schedule, "week", lambda start: calls.append(start) or original(start))
+    week.go_to_next_week()
+
+    assert calls == []
+    assert week.canvas.week_items()[following] == [lecture]
+    assert [item for _, item in week.canvas.layout_index.near(week.canvas.time_to_y(lecture.start) + 10)] == [lecture]
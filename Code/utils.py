@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QDateTime
 from datetime import timedelta, datetime
+from functools import partial
+import weakref
 from typing import Any, Dict, Tuple, Optional
 
 
@@ -92,20 +94,42 @@ class GUIUtils:
 
         t = self.tm.get_theme(theme_name) or self.tm.get_theme("light")
         app = QApplication.instance()
-        if app:
-            app.setStyleSheet(t)
+        if not app or app.styleSheet() == t:
+            return  # restyling re-polishes every widget, so skip it when nothing changed
+
+        app.setStyleSheet(t)
 
     def get_day_bounds(self, date_obj: datetime) -> tuple:
         """get the start and end bounds of a day using settings """
         return self.settings.get_day_bounds(date_obj)
 
+    @staticmethod
+    def listen_while_alive(widget: QWidget, source, callback) -> None:
+        """
+        register callback as a listener on source until widget is destroyed,
+        so a closed view is not kept alive (or called) by the schedule
+        """
+        if not hasattr(source, "add_listener"):
+            return
+        source.add_listener(callback)
+        # a partial, not a slot on widget, so it still runs while widget is being destroyed;
+        # source is held weakly, it may be torn down first when both go at exit
+        widget.destroyed.connect(partial(GUIUtils._drop_listener, weakref.ref(source), callback))
+
+    @staticmethod
+    def _drop_listener(source_ref, callback, *_) -> None:
+        source = source_ref()
+        if source is not None:
+            source.remove_listener(callback)
+
     @staticmethod
     def create_top_bar(*,
                        show_back: bool = False,
                        show_settings: bool = False,
                        show_todo: bool = False,
                        show_month: bool = False,
-                       show_week: bool = False
+                       show_week: bool = False,
+                       show_agenda: bool = False
                        ) -> tuple:
         """create a top navigation bar with optional buttons"""
         bar = QWidget()
@@ -128,6 +152,10 @@ class GUIUtils:
             buttons["week"] = QPushButton("week view")
             layout.addWidget(buttons["week"])
 
+        if show_agenda:
+            buttons["agenda"] = QPushButton("agenda")
+            layout.addWidget(buttons["agenda"])
+
         if show_todo:
             buttons["todo"] = QPushButton("to-do")
             layout.addWidget(buttons["todo"])
@@ -2,12 +2,14 @@ from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QScrollArea,
     QLabel, QSizePolicy, QPushButton
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QRect, QMimeData
-from PyQt5.QtGui import QDrag, QPainter
-from datetime import datetime, timedelta, time
-from day_view import DayView
+from PyQt5.QtCore import Qt, pyqtSignal, QRect, QTimer
+from PyQt5.QtGui import QPainter
+from datetime import datetime, timedelta, time, date
+from day_view_paint_mixin import DayViewPaintMixin
+from layout_index import LayoutIndex
+from period_cache import PeriodCache
+from reschedule_preview import ReschedulePreview
 from functools import partial
-import pickle
 
 class ClickableLabel(QLabel):
     """
@@ -21,110 +23,209 @@ class ClickableLabel(QLabel):
         super().mousePressEvent(event)
 
 
-class WeekDayView(DayView):
+class WeekCanvas(QWidget, DayViewPaintMixin):
     """
-    subclass of DayView for use in a week view container
-    handles painting, ghost blocks, and mouse interactions
+    a single widget painting all seven days of a week from one week query
+    handles hit-testing and dragging tasks between days itself; a drag only
+    repaints the columns it touches
     """
-    def __init__(self, schedule, util, parent: QWidget | None = None):
-        # initialize WeekDayView with schedule and utility reference
-        super().__init__(schedule, util, parent)
-        self.show_timeline: bool = False
-        self.show_current_time: bool = False
-        self.week_view: "WeekViewContainer" | None = None
+    def __init__(self, schedule, util, week_view: "WeekViewContainer", parent: QWidget | None = None):
+        # initialize canvas with schedule, utility reference and owning container
+        super().__init__(parent)
+        self.schedule = schedule
+        self.util = util
+        self.week_view = week_view
+        self.update_theme_colours()
+
+        # constants (match DayView so blocks line up the same way)
+        self.hour_height = 120
+        self.main_line_height = 2
+        self.faint_line_height = 1
+        self.num_faint_lines = 3
+        self.segment_spacing = (
+            self.hour_height
+            - self.main_line_height
+            - (self.faint_line_height * self.num_faint_lines)
+        ) / (self.num_faint_lines + 1)
+        self.gutter = 50  # hour labels, matches the header's spacer
+
+        # state
+        self.week_start: date | None = None
+        self.items: dict = {}  # date -> blocks on that day
+        self._items_key = None
+        self.block_rects = []
+        self.layout_index = LayoutIndex([])
+        self._layout_key = None
+        self._grid_cache = None
+        self._grid_key = None
+        self.week_cache = PeriodCache(capacity=5)  # week start -> (items, layout key, layout index)
+
+        self.setMinimumHeight(24 * self.hour_height)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    # data
+    def set_week(self, week_start: date) -> None:
+        # show another week; widgets stay, only the data changes (from the cache if still current)
+        # the canvas outlives theme switches, so its colours are re-read here too
+        self.update_theme_colours()
+        self.remember_week()
+        self.week_start = week_start
+        if not self.restore_week(week_start):
+            self.load_week()
+        self.update()
+
+    def load_week(self) -> None:
+        # group one week query by day
+        self.items = {}
+        for b in self.schedule.week(self.week_start):
+            self.items.setdefault(b.start.date(), []).append(b)
+        self._items_key = self._week_key()
+
+    def _week_key(self, week_start: date | None = None) -> tuple:
+        week_start = week_start or self.week_start
+        return (week_start,) + tuple(
+            self.schedule.day_revision(week_start + timedelta(days=i)) for i in range(7)
+        )
+
+    def remember_week(self) -> None:
+        # keep the shown week's blocks and layout so coming back to it needs no work
+        if self._items_key is not None:
+            self.week_cache.put(self._items_key[0], self._items_key,
+                                (self.items, self._layout_key, self.layout_index))
+
+    def restore_week(self, week_start: date) -> bool:
+        # show week_start from the cache; False if it is not cached or has changed since
+        key = self._week_key(week_start)
+        cached = self.week_cache.get(week_start, key)
+        if cached is None:
+            return False
+        self.block_rects.clear()
+        self.items, self._layout_key, self.layout_index = cached
+        self._items_key = key
+        return True
+
+    def prefetch(self, week_start: date) -> None:
+        # read a week's blocks and lay them out ahead of time, unless the cache already has them
+        if week_start == self.week_start or self.week_cache.get(week_start, self._week_key(week_start)) is not None:
+            return
+        items = {}
+        for b in self.schedule.week(week_start):
+            items.setdefault(b.start.date(), []).append(b)
+        key = self._week_key(week_start)  # reading may have loaded stored blocks
+        rects = [
+            (self.block_rect(item.start, item.duration, week_start), item)
+            for day, blocks in sorted(items.items()) for item in blocks
+            if not getattr(item, "is_completed", False)
+        ]
+        layout_key = (key, self.width(), len(rects))
+        self.week_cache.put(week_start, key, (items, layout_key, LayoutIndex(rects)))
+
+    def week_items(self) -> dict:
+        # blocks by day, re-read only if one of the week's days changed
+        if self._items_key != self._week_key():
+            self.load_week()
+        return self.items
+
+    # geometry
+    def column_width(self) -> float:
+        return (self.width() - self.gutter) / 7
+
+    def day_at(self, x: int) -> date | None:
+        # the day whose column contains x, None over the hour labels or past the edge
+        if x < self.gutter:
+            return None
+        index = int((x - self.gutter) // self.column_width())
+        return self.week_start + timedelta(days=index) if 0 <= index < 7 else None
+
+    def column_rect(self, day: date) -> QRect:
+        index = (day - self.week_start).days
+        x = self.gutter + index * self.column_width()
+        return QRect(int(x), 0, int(self.column_width()) + 2, self.height())
+
+    def block_rect(self, start: datetime, duration: timedelta, week_start: date | None = None) -> QRect:
+        x = self.gutter + (start.date() - (week_start or self.week_start)).days * self.column_width()
+        y_start = self.time_to_y(start)
+        y_end = self.time_to_y(start + duration)
+        height = max(4, y_end - y_start)
+        return QRect(int(x + 2), int(y_start + 2), int(self.column_width() - 4), int(height - 4))
+
+    def in_week(self, moment: datetime | None) -> bool:
+        return moment is not None and 0 <= (moment.date() - self.week_start).days < 7
 
     # painting / drawing
     def paintEvent(self, event) -> None:
-        # paint grid lines, blocks, and ghost block if dragging
+        # paint cached grid, blocks, and ghost block if dragging, inside the dirty rect
         self.block_rects.clear()
-        self.ghost_rects.clear()
+        dirty = event.rect()
 
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self.grid_pixmap())
         painter.setFont(self.font())
 
-        # draw hour grid lines
-        for hour in range(24):
-            y_start = int(hour * self.hour_height)
-            painter.fillRect(0, y_start, self.width(), self.main_line_height, self.col_grid_dark)
-            current_y = y_start + self.main_line_height
-            for _ in range(self.num_faint_lines):
-                current_y += self.segment_spacing
-                painter.fillRect(0, int(current_y), self.width(), self.faint_line_height, self.col_grid_light)
-                current_y += self.faint_line_height
-
         # draw blocks
-        for item in self.items:
-            if getattr(item, "is_completed", False):
-                continue
-            if self.week_view and self.week_view.current_dragging_block is item:
-                continue
-
-            y_start = self.time_to_y(item.start)
-            y_end = self.time_to_y(item.start + item.duration)
-            height = max(4, y_end - y_start)
-            rect = QRect(2, int(y_start + 2), int(self.width() - 4), int(height - 4))
-            self.draw_block(item, rect, painter)
-            self.block_rects.append((rect, item))
+        dragging = self.week_view.current_dragging_block
+        for day, blocks in sorted(self.week_items().items()):
+            for item in blocks:
+                if getattr(item, "is_completed", False) or item is dragging:
+                    continue
+                rect = self.block_rect(item.start, item.duration)
+                if rect.intersects(dirty):
+                    self.draw_block(item, rect, painter)
+                self.block_rects.append((rect, item))
+        self.index_layout()
+
+        # where the blocks the drag displaces would end up
+        for item in self.week_view.preview_ghosts():
+            rect = self.block_rect(item.start, item.duration)
+            if rect.intersects(dirty):
+                self.draw_block(item, rect, painter, alpha=70)
 
         # draw ghost block if dragging
-        if self.week_view:
-            ghost = self.week_view.current_dragging_block
-            ghost_start = self.week_view.ghost_start
-            if ghost and ghost_start and ghost_start.date() == self.current_day:
-                rect = QRect(
-                    2,
-                    int(self.time_to_y(ghost_start) + 2),
-                    int(self.width() - 4),
-                    int(max(4, self.time_to_y(ghost_start + ghost.duration) - self.time_to_y(ghost_start) - 4))
-                )
-                self.draw_block(ghost, rect, painter, alpha=120)
-                self.ghost_rects.append((rect, ghost))
+        ghost_start = self.week_view.ghost_start
+        if dragging and self.in_week(ghost_start):
+            rect = self.block_rect(ghost_start, dragging.duration)
+            self.draw_block(dragging, rect, painter, alpha=120)
+            result = self.week_view.preview.result
+            if result is not None and result.infeasible and result.start == ghost_start:
+                self.draw_infeasible(rect, result.infeasible, painter)
+
+    def index_layout(self) -> None:
+        # rebuild layout_index from block_rects if the painted layout changed
+        key = (self._items_key, self.width(), len(self.block_rects))
+        if key != self._layout_key:
+            self.layout_index = LayoutIndex(self.block_rects)
+            self._layout_key = key
 
     # mouse / drag events
     def mousePressEvent(self, event) -> None:
-        # start drag if clicked on a block
+        # start dragging a movable task
         click_x, click_y = event.x(), event.y()
-        if not self.week_view:
-            return
-        for rect, item in reversed(self.block_rects):
-            if rect.contains(click_x, click_y):
-                if getattr(item, "is_fixed", False) or getattr(item, "type", "task") != "task":
-                    continue
-                self.week_view.start_drag(item, self.current_day)
-                drag = QDrag(self)
-                mime = QMimeData()
-                data = {"block_ref": id(item)}
-                mime.setData("application/x-block", pickle.dumps(data))
-                drag.setMimeData(mime)
-                drag.exec_(Qt.MoveAction)
-                break
-
-    def dragEnterEvent(self, event) -> None:
-        # accept drag if it has block data
-        if event.mimeData().hasFormat("application/x-block"):
-            event.acceptProposedAction()
-
-    def dragMoveEvent(self, event) -> None:
-        # update ghost block position while dragging
-        if not self.week_view:
+        for rect, item in self.layout_index.near(click_y):
+            if not rect.contains(click_x, click_y):
+                continue
+            if getattr(item, "is_fixed", False) or getattr(item, "type", "task") != "task":
+                continue
+            self.week_view.start_drag(item, item.start.date())
+            break
+
+    def mouseMoveEvent(self, event) -> None:
+        # move the ghost block to the day and snapped time under the pointer
+        if not self.week_view.current_dragging_block:
             return
-        y = event.pos().y()
-        snapped_y = self.snap_y(y)
-        total_minutes = int((snapped_y / self.hour_height) * 60)
-        new_time = datetime.combine(self.current_day, time(total_minutes // 60, total_minutes % 60))
-        self.week_view.update_ghost(self.current_day, new_time)
-
-    def dropEvent(self, event) -> None:
-        # commit block drop on this day
-        if self.week_view:
-            self.week_view.commit_drop(self.current_day)
-
-    def dragLeaveEvent(self, event) -> None:
-        # clear ghost when leaving day view
-        if self.week_view:
+        day = self.day_at(event.x())
+        if day is None:
             self.week_view.update_ghost(None, None)
-            self.update()
+            return
+        snapped_y = self.snap_y(event.y())
+        total_minutes = min(max(0, int((snapped_y / self.hour_height) * 60)), 24 * 60 - 15)
+        new_time = datetime.combine(day, time(total_minutes // 60, total_minutes % 60))
+        self.week_view.update_ghost(day, new_time)
+
+    def mouseReleaseEvent(self, event) -> None:
+        # drop the block where the ghost is, or cancel if it left the week
+        if self.week_view.current_dragging_block:
+            self.week_view.commit_drop(self.day_at(event.x()))
 
 
 class WeekViewContainer(QWidget):
@@ -137,6 +238,7 @@ class WeekViewContainer(QWidget):
     open_day = pyqtSignal(datetime)
     back = pyqtSignal()
     open_month = pyqtSignal(int, int)
+    open_agenda = pyqtSignal()
 
     # initialization
     def __init__(self, schedule, util, parent: QWidget | None = None):
@@ -149,6 +251,13 @@ class WeekViewContainer(QWidget):
         self.ghost_start: datetime | None = None
         self.drag_source_day: datetime | None = None
 
+        # what the dragged block's drop would move, worked out off the GUI thread
+        self.preview = ReschedulePreview(self.schedule, self)
+        self.preview.ready.connect(self.show_preview)
+        # a partial, not a slot on self, so the worker thread is let go while self is destroyed
+        self.destroyed.connect(partial(ReschedulePreview.stop, self.preview))
+        self.preview_days: set = set()  # columns showing displaced ghosts
+
         self.current_week_start: datetime.date = datetime.now().date()
         if self.current_week_start.weekday() != 0:
             self.current_week_start -= timedelta(days=self.current_week_start.weekday())
@@ -160,7 +269,7 @@ class WeekViewContainer(QWidget):
         # top bar
         header_bar, buttons = self.util.create_top_bar(
             show_back=True, show_settings=True, show_todo=True,
-            show_month=True, show_week=True
+            show_month=True, show_week=True, show_agenda=True
         )
         self.main_layout.addWidget(header_bar)
         if "back" in buttons:
@@ -173,6 +282,8 @@ class WeekViewContainer(QWidget):
             buttons["month"].clicked.connect(self.open_month_view)
         if "week" in buttons:
             buttons["week"].clicked.connect(self.open_week_view)
+        if "agenda" in buttons:
+            buttons["agenda"].clicked.connect(self.open_agenda.emit)
 
         # week navigation
         week_header_layout = QHBoxLayout()
@@ -207,52 +318,43 @@ class WeekViewContainer(QWidget):
             self.day_labels.append(day_label)
         self.main_layout.addLayout(self.header_layout)
 
-        # scroll area for day columns
+        # scroll area holding the week canvas
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QHBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        self.scroll_layout.setSpacing(0)
-        self.scroll_area.setWidget(self.scroll_content)
+        self.canvas = WeekCanvas(self.schedule, self.util, self)
+        self.scroll_area.setWidget(self.canvas)
         self.main_layout.addWidget(self.scroll_area)
 
-        # timeline column
-        self.timeline_layout = QVBoxLayout()
-        self.timeline_layout.setContentsMargins(0, 0, 0, 0)
-        self.timeline_layout.setSpacing(0)
-        for h in range(24):
-            label = QLabel(f"{h:02d}:00")
-            label.setAlignment(Qt.AlignTop | Qt.AlignRight)
-            label.setFixedHeight(60)
-            self.timeline_layout.addWidget(label)
-
-        self.day_views: list[WeekDayView] = []
+        # the weeks either side are read and laid out once navigation settles,
+        # and again after the schedule changes
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(150)
+        self.prefetch_timer.timeout.connect(self.prefetch_neighbours)
+        self.util.listen_while_alive(self, self.schedule, self._on_schedule_change)
+
         self.refresh_week_view()
+        QTimer.singleShot(0, self.scroll_to_current_time)
 
     # refresh / populate week view
     def refresh_week_view(self) -> None:
-        # clear previous day views
-        for i in reversed(range(self.scroll_layout.count())):
-            w = self.scroll_layout.itemAt(i).widget()
-            if w:
-                w.setParent(None)
-        self.day_views.clear()
-
-        # add timeline widget
-        timeline_widget = QWidget()
-        timeline_widget.setLayout(self.timeline_layout)
-        self.scroll_layout.addWidget(timeline_widget)
-
-        # add day columns
-        for i in range(7):
-            day_date = self.current_week_start + timedelta(days=i)
-            day_view = WeekDayView(self.schedule, self.util)
-            day_view.week_view = self
-            day_view.set_current_day(day_date)
-            day_view.show_timeline = False
-            self.scroll_layout.addWidget(day_view)
-            self.day_views.append(day_view)
+        # point the canvas at the current week, then warm the weeks either side once things settle
+        self.canvas.set_week(self.current_week_start)
+        self.prefetch_timer.start()
+
+    def prefetch_neighbours(self) -> None:
+        # warm the canvas's cache with the weeks before and after the one shown
+        for offset in (7, -7):
+            self.canvas.prefetch(self.current_week_start + timedelta(days=offset))
+
+    def _on_schedule_change(self, op: str, blocks: list) -> None:
+        self.prefetch_timer.start()
+
+    def scroll_to_current_time(self) -> None:
+        # scroll so the hour before now is at the top
+        now = datetime.now()
+        y = self.canvas.time_to_y(max(now - timedelta(hours=1), datetime.combine(now.date(), time(0, 0))))
+        self.scroll_area.verticalScrollBar().setValue(max(0, y))
 
     # week navigation
     def set_current_week(self, week_start_date: datetime.date) -> None:
@@ -263,6 +365,7 @@ class WeekViewContainer(QWidget):
             day_label.setText(day.strftime("%A\n%d %b"))
             day_label.clicked.disconnect()
             day_label.clicked.connect(partial(self.open_day.emit, day))
+        self.update_week_label()
         self.refresh_week_view()
 
     def open_month_view(self) -> None:
@@ -279,39 +382,76 @@ class WeekViewContainer(QWidget):
 
     def go_to_prev_week(self) -> None:
         # go to previous week
-        self.current_week_start -= timedelta(days=7)
-        self.update_week_label()
-        self.refresh_week_view()
+        self.set_current_week(self.current_week_start - timedelta(days=7))
 
     def go_to_next_week(self) -> None:
         # go to next week
-        self.current_week_start += timedelta(days=7)
-        self.update_week_label()
-        self.refresh_week_view()
+        self.set_current_week(self.current_week_start + timedelta(days=7))
 
     # drag / ghost block
+    def _ghost_column(self) -> QRect | None:
+        # the canvas column the ghost is currently in, if it is in this week
+        if self.canvas.in_week(self.ghost_start):
+            return self.canvas.column_rect(self.ghost_start.date())
+        return None
+
     def start_drag(self, block, source_day: datetime) -> None:
-        # initialize dragging for block
+        # initialize dragging for block; only its column needs repainting
         self.current_dragging_block = block
         self.ghost_start = block.start
         self.drag_source_day = source_day
-        for dv in self.day_views:
-            dv.update()
+        self.canvas.update(self.canvas.column_rect(source_day))
 
     def update_ghost(self, new_day: datetime | None, new_time: datetime | None) -> None:
-        # update ghost block during drag
-        if self.current_dragging_block:
+        # update ghost block during drag, repainting the columns it leaves and enters
+        block = self.current_dragging_block
+        if block and new_time != self.ghost_start:
+            old_column = self._ghost_column()
             self.ghost_start = new_time
-            for dv in self.day_views:
-                dv.update()
-
-    def commit_drop(self, target_day: datetime) -> None:
-        # commit block to new day/time
-        if self.current_dragging_block:
-            self.current_dragging_block.start = self.ghost_start
-            self.current_dragging_block = None
-            self.ghost_start = None
-            self.drag_source_day = None
-            for dv in self.day_views:
-                dv.items = self.schedule.day(dv.current_day)
-                dv.update()
+            for column in (old_column, self._ghost_column()):
+                if column is not None:
+                    self.canvas.update(column)
+
+            # work out what dropping here would displace; the schedule is snapshot on the first move
+            if new_time is None:
+                self.end_preview()
+                return
+            if self.preview.block_id != block.id:
+                self.preview.begin(block)
+            self.preview.request(new_time)
+
+    def preview_ghosts(self) -> list:
+        # displaced blocks from the latest preview that would land in this week
+        result = self.preview.result
+        if result is None or not self.current_dragging_block:
+            return []
+        return [b for b in result.displaced if self.canvas.in_week(b.start)]
+
+    def show_preview(self, result) -> None:
+        # repaint the columns the old and new displaced ghosts are in, and the ghost's own
+        days = {b.start.date() for b in self.preview_ghosts()}
+        for day in self.preview_days | days:
+            self.canvas.update(self.canvas.column_rect(day))
+        self.preview_days = days
+        column = self._ghost_column()
+        if column is not None:
+            self.canvas.update(column)
+
+    def end_preview(self) -> None:
+        # stop previewing and clear any displaced ghosts still on screen
+        for day in self.preview_days:
+            self.canvas.update(self.canvas.column_rect(day))
+        self.preview_days = set()
+        self.preview.cancel()
+
+    def commit_drop(self, target_day: datetime | None) -> None:
+        # commit block to new day/time, or cancel the drag if the ghost left the week
+        block, ghost_start = self.current_dragging_block, self.ghost_start
+        self.current_dragging_block = None
+        self.ghost_start = None
+        self.drag_source_day = None
+        self.end_preview()
+        if block and ghost_start is not None and target_day is not None:
+            block.start = ghost_start
+            self.schedule.global_edf_scheduler(ignore_blocks=[block])
+        self.canvas.update()